@@ -1,15 +1,15 @@
 # album/models.py
 
-import os
-import shutil
 from django.db import models
-from django.db.models import Max
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.utils.text import slugify
-from django.conf import settings
 from users.models import User
 from category.models import Category
+from dashboard import counters
+from gallery import versions
+from gallery.ordering import SequenceOrdering
+from gallery.media import get_media_store
 
 
 class Album(models.Model):
@@ -41,52 +41,31 @@ class Album(models.Model):
         related_name='album_cover'
     )
 
+    sequence_order = SequenceOrdering(version_table='albums')  # Urutan album (lihat gallery.ordering)
+
     def save(self, *args, **kwargs):
         """
         Override method save untuk mengatur sequence_number secara otomatis
-        saat album baru ditambahkan.
+        saat album baru ditambahkan (di akhir urutan).
         """
         if self._state.adding:  # Jika album baru ditambahkan
-            max_sequence_number = Album.objects.aggregate(max_seq=Max('sequence_number'))['max_seq']
-            if max_sequence_number is not None:
-                self.sequence_number = max_sequence_number + 1
-            else:
-                self.sequence_number = 1
+            Album.sequence_order.assign(self)
         super(Album, self).save(*args, **kwargs)
 
-    def delete(self, *args, **kwargs):
-        """
-        Override method delete untuk memastikan sequence_number diubah
-        setelah penghapusan album.
-        """
-        super(Album, self).delete(*args, **kwargs)
-        self.restructure_sequence_numbers()
-
-    @staticmethod
-    def restructure_sequence_numbers():
-        """
-        Metode statis untuk mengatur ulang sequence_number semua album
-        setelah terjadi penghapusan, memastikan urutan yang konsisten.
-        """
-        albums = Album.objects.all().order_by('sequence_number')
-        for index, album in enumerate(albums, start=1):
-            album.sequence_number = index
-            album.save()
-
     def __str__(self):
         """
         Representasi string dari objek Album, yaitu judulnya.
         """
         return self.title
 
-    def get_album_folder_path(self):
+    def get_album_folder_prefix(self):
         """
-        Menghasilkan path folder untuk album berdasarkan judulnya.
+        Menghasilkan prefix folder album di storage media (lihat `gallery.media`).
         
         Returns:
-            str: Path lengkap ke folder album.
+            str: Prefix relatif, misalnya `albums/<slug>/`.
         """
-        return os.path.join(settings.MEDIA_ROOT, 'albums', slugify(self.title))
+        return f'albums/{slugify(self.title)}/'
 
     @property
     def slug(self):
@@ -109,35 +88,7 @@ def create_album_folder(sender, instance, created, **kwargs):
         created (bool): True jika album baru dibuat.
     """
     if created:
-        folder_path = instance.get_album_folder_path()
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)  # Membuat folder baru
-
-
-# Signal untuk rename folder saat album diupdate
-@receiver(pre_save, sender=Album)
-def rename_album_folder(sender, instance, **kwargs):
-    """
-    Signal handler yang dipanggil sebelum album disimpan.
-    Jika judul album berubah, maka folder fisik akan di-rename sesuai judul baru.
-    
-    Args:
-        sender (Model): Model yang mengirim signal.
-        instance (Album): Instance album yang akan disimpan.
-    """
-    if instance.pk:
-        try:
-            old_instance = Album.objects.get(pk=instance.pk)
-            old_folder_path = old_instance.get_album_folder_path()
-            new_folder_path = instance.get_album_folder_path()
-
-            # Jika title album berubah, rename folder
-            if old_instance.title != instance.title:
-                if os.path.exists(old_folder_path):
-                    os.rename(old_folder_path, new_folder_path)
-        except Album.DoesNotExist:
-            # Jika album tidak ditemukan, tidak ada tindakan yang diambil
-            pass
+        get_media_store().ensure_prefix(instance.get_album_folder_prefix())  # Membuat folder baru
 
 
 # Signal untuk hapus folder saat album dihapus
@@ -151,6 +102,31 @@ def delete_album_folder(sender, instance, **kwargs):
         sender (Model): Model yang mengirim signal.
         instance (Album): Instance album yang dihapus.
     """
-    folder_path = instance.get_album_folder_path()
-    if os.path.exists(folder_path):
-        shutil.rmtree(folder_path)  # Menghapus folder dan isinya
+    get_media_store().delete_prefix(instance.get_album_folder_prefix())  # Menghapus folder dan isinya
+
+
+# Signal untuk memperbarui counter dashboard (total dan active/inactive)
+@receiver(pre_save, sender=Album)
+def remember_album_active(sender, instance, update_fields=None, **kwargs):
+    """
+    Menyimpan status is_active album sebelum disimpan untuk mendeteksi perubahan status.
+    """
+    counters.remember_previous(instance, 'is_active', update_fields)
+
+
+@receiver(post_save, sender=Album)
+def count_album_saved(sender, instance, created, **kwargs):
+    """
+    Memperbarui counter dashboard setelah album dibuat atau status aktifnya berubah.
+    """
+    counters.count_saved('albums', instance, created, 'is_active', counters.ACTIVE_BUCKETS)
+    versions.bump('albums')
+
+
+@receiver(post_delete, sender=Album)
+def count_album_deleted(sender, instance, **kwargs):
+    """
+    Memperbarui counter dashboard setelah album dihapus.
+    """
+    counters.count_deleted('albums', instance, 'is_active', counters.ACTIVE_BUCKETS)
+    versions.bump('albums')
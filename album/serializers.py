@@ -2,6 +2,7 @@
 
 from rest_framework import serializers
 from .models import Album
+from photo.renditions import rendition_urls
 import os
 from django.conf import settings
 from django.utils.text import slugify
@@ -22,10 +23,12 @@ class AlbumSerializer(serializers.ModelSerializer):
         is_active (BooleanField): Status aktif/inaktif album.
         sequence_number (PositiveIntegerField): Nomor urut album untuk penataan (read-only).
         cover_photo_url (SerializerMethodField): URL foto sampul album (read-only).
+        cover_renditions (SerializerMethodField): URL varian ukuran foto sampul (read-only).
     """
     created_by = serializers.CharField(source='created_by.username', read_only=True)
     folder_path = serializers.SerializerMethodField()
     cover_photo_url = serializers.SerializerMethodField()
+    cover_renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = Album
@@ -39,7 +42,8 @@ class AlbumSerializer(serializers.ModelSerializer):
             'folder_path', 
             'is_active',
             'sequence_number', 
-            'cover_photo_url'
+            'cover_photo_url',
+            'cover_renditions'
         ]
         read_only_fields = [
             'id', 
@@ -48,6 +52,19 @@ class AlbumSerializer(serializers.ModelSerializer):
             'folder_path', 
             'sequence_number'
         ]
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Menyiapkan queryset untuk daftar album: pembuat dan foto sampul diambil
+        lewat JOIN (tanpa query tambahan per album) dan hanya kolom yang
+        diserialisasi yang dibaca.
+        """
+        return queryset.select_related('created_by', 'cover_photo').only(
+            'id', 'title', 'description', 'created_at', 'category_id', 'is_active',
+            'sequence_number', 'created_by__username', 'cover_photo__photo',
+            'cover_photo__renditions'
+        )
     
     def get_folder_path(self, obj):
         """
@@ -74,3 +91,17 @@ class AlbumSerializer(serializers.ModelSerializer):
         if obj.cover_photo:
             return obj.cover_photo.photo.url
         return None
+
+    def get_cover_renditions(self, obj):
+        """
+        Mendapatkan URL varian ukuran (thumb/medium/large) foto sampul album.
+        
+        Args:
+            obj (Album): Instance album.
+        
+        Returns:
+            dict: Map varian foto sampul, kosong jika album tidak memiliki sampul.
+        """
+        if obj.cover_photo:
+            return rendition_urls(obj.cover_photo)
+        return {}
@@ -1,3 +1,196 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from category.models import Category
+from users.models import User
+from .models import Album
 
 # Create your tests here.
+
+
+class AlbumOrderingTestCase(TestCase):
+    """
+    Test urutan album (`Album.sequence_order`, satu urutan untuk seluruh tabel).
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='petugas', password='secret', role='petugas')
+        self.category = Category.objects.create(name='Kegiatan')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_album(self, title, sequence_number=None):
+        return Album.objects.create(
+            title=title,
+            category=self.category,
+            created_by=self.user,
+            sequence_number=sequence_number,
+        )
+
+    def order(self):
+        return list(Album.sequence_order._ordered(Album.objects.all()).values_list('title', flat=True))
+
+    def test_new_album_is_appended(self):
+        self.create_album('A')
+        self.create_album('B')
+        self.create_album('C', sequence_number=10)
+
+        self.assertEqual(self.order(), ['C', 'A', 'B'])
+        self.assertEqual(Album.objects.get(title='B').sequence_number, 2048)
+        self.assertEqual(self.create_album('D').sequence_number, 3072)
+
+    def test_move_endpoint_after_and_before(self):
+        a, b, c, d = (self.create_album(title) for title in 'ABCD')
+
+        response = self.client.post(reverse('album-move'), {'ids': [d.pk, c.pk], 'after': a.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.order(), ['A', 'D', 'C', 'B'])
+
+        response = self.client.post(reverse('album-move'), {'ids': [b.pk], 'before': a.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.order(), ['B', 'A', 'D', 'C'])
+
+    def test_move_endpoint_to_end(self):
+        a, b, c = (self.create_album(title) for title in 'ABC')
+
+        response = self.client.post(reverse('album-move'), {'ids': [a.pk]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], [{'id': a.pk, 'sequence_number': 4096}])
+        self.assertEqual(self.order(), ['B', 'C', 'A'])
+
+    def test_move_endpoint_renumbers_when_gap_is_exhausted(self):
+        a, b, c = (self.create_album(title, sequence_number=key) for title, key in zip('ABC', [1, 2, 3]))
+
+        response = self.client.post(reverse('album-move'), {'ids': [c.pk], 'after': a.pk}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.order(), ['A', 'C', 'B'])
+        self.assertEqual(
+            list(Album.objects.order_by('sequence_number').values_list('sequence_number', flat=True)),
+            [1024, 2048, 3072],
+        )
+
+    def test_move_endpoint_rejects_after_and_before(self):
+        a, b = (self.create_album(title) for title in 'AB')
+
+        response = self.client.post(
+            reverse('album-move'), {'ids': [a.pk], 'after': b.pk, 'before': b.pk}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.order(), ['A', 'B'])
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    RESPONSE_CACHE={'ENABLED': True, 'CACHE': 'default'},
+)
+class PublicAlbumListCacheTestCase(TestCase):
+    """
+    Test cache respons (`gallery.response_cache`) pada daftar album publik.
+    """
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='secret', role='petugas')
+        self.bob = User.objects.create_user(username='bob', password='secret', role='petugas')
+        category = Category.objects.create(name='Kegiatan')
+        Album.objects.create(title='Album A', category=category, created_by=self.alice)
+
+    def get_as(self, user, **extra):
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user)
+        return client.get(reverse('public-album-list'), **extra)
+
+    def test_json_response_is_cached(self):
+        first = self.get_as(None, HTTP_ACCEPT='application/json')
+        second = self.get_as(self.bob, HTTP_ACCEPT='application/json')
+
+        self.assertEqual(first['X-Response-Cache'], 'miss')
+        self.assertEqual(second['X-Response-Cache'], 'hit')
+        self.assertEqual(first.content, second.content)
+
+    def test_browsable_api_html_is_never_cached(self):
+        first = self.get_as(self.alice, HTTP_ACCEPT='text/html')
+        second = self.get_as(self.bob, HTTP_ACCEPT='text/html')
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertIn('text/html', first['Content-Type'])
+        self.assertNotIn('X-Response-Cache', first)
+        self.assertNotIn('X-Response-Cache', second)
+        # Navbar browsable API menampilkan user yang me-request
+        self.assertContains(first, '<li class="navbar-text">alice</li>', html=False)
+        self.assertNotContains(second, '<li class="navbar-text">alice</li>', html=False)
+        self.assertContains(second, '<li class="navbar-text">bob</li>', html=False)
+
+
+class AlbumCursorPaginationTestCase(TestCase):
+    """
+    Test keyset pagination (`gallery.pagination`) pada daftar album.
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='petugas', password='secret', role='petugas')
+        category = Category.objects.create(name='Kegiatan')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Tiga album dengan sequence_number yang sama dan satu album lama tanpa kunci
+        self.albums = {
+            title: Album.objects.create(title=title, category=category, created_by=self.user, sequence_number=key)
+            for title, key in [('A', 10), ('B', 10), ('C', 10), ('D', 20)]
+        }
+        legacy = Album.objects.create(title='E', category=category, created_by=self.user)
+        Album.objects.filter(pk=legacy.pk).update(sequence_number=None)
+
+    def get_page(self, **params):
+        response = self.client.get(reverse('album-list-create'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def titles(self, page):
+        return [album['title'] for album in page['data']]
+
+    def test_forward_and_back_with_ties(self):
+        first = self.get_page(page_size=2)
+        self.assertEqual(self.titles(first), ['E', 'A'])
+        self.assertIsNone(first['prev'])
+
+        second = self.get_page(page_size=2, cursor=first['next'])
+        self.assertEqual(self.titles(second), ['B', 'C'])
+
+        third = self.get_page(page_size=2, cursor=second['next'])
+        self.assertEqual(self.titles(third), ['D'])
+        self.assertIsNone(third['next'])
+
+        back = self.get_page(page_size=2, cursor=third['prev'])
+        self.assertEqual(self.titles(back), ['B', 'C'])
+        self.assertIsNotNone(back['next'])
+
+        start = self.get_page(page_size=2, cursor=back['prev'])
+        self.assertEqual(self.titles(start), ['E', 'A'])
+        self.assertIsNone(start['prev'])
+        self.assertEqual(start['next'], first['next'])
+
+    def test_pages_cover_every_album_once(self):
+        titles, cursor = [], None
+        while True:
+            page = self.get_page(page_size=1, **({'cursor': cursor} if cursor else {}))
+            titles += self.titles(page)
+            cursor = page['next']
+            if cursor is None:
+                break
+
+        self.assertEqual(titles, ['E', 'A', 'B', 'C', 'D'])
+
+    def test_invalid_cursor(self):
+        for cursor in ['not-a-cursor', 'e30', 'WzEsMl0']:
+            response = self.client.get(reverse('album-list-create'), {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, cursor)
+            self.assertIn('cursor', response.data)
+
+    def test_all_returns_full_list_without_cursors(self):
+        page = self.get_page(page_size=2, all='true')
+
+        self.assertCountEqual(self.titles(page), ['A', 'B', 'C', 'D', 'E'])
+        self.assertNotIn('next', page)
+        self.assertNotIn('prev', page)
@@ -5,7 +5,8 @@ from .views import (
     AlbumListCreateView, 
     AlbumDetailView, 
     PublicAlbumListView, 
-    AlbumByCategoryView
+    AlbumByCategoryView,
+    AlbumMoveView
 )
 
 urlpatterns = [
@@ -20,4 +21,7 @@ urlpatterns = [
     
     # Endpoint untuk mendapatkan daftar album berdasarkan kategori tertentu yang diidentifikasi oleh category_id
     path('albums/category/<int:category_id>/', AlbumByCategoryView.as_view(), name='album-by-category'),
+    
+    # Endpoint untuk memindahkan urutan beberapa album sekaligus
+    path('albums/move/', AlbumMoveView.as_view(), name='album-move'),
 ]
@@ -5,10 +5,14 @@ from rest_framework.response import Response
 from .models import Album
 from .serializers import AlbumSerializer
 from gallery.throttles import PetugasRateThrottle
+from gallery.pagination import CursorPaginatedListMixin
+from gallery.conditional import ConditionalGetMixin
+from gallery.ordering_views import SequenceMoveView
+from gallery.response_cache import CachedResponseMixin
 from users.permissions import AllowAny, IsPetugas
 
 
-class PublicAlbumListView(generics.ListAPIView):
+class PublicAlbumListView(ConditionalGetMixin, CachedResponseMixin, CursorPaginatedListMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar semua album yang aktif dan bersifat publik.
     
@@ -17,9 +21,10 @@ class PublicAlbumListView(generics.ListAPIView):
         serializer_class (Serializer): Serializer yang digunakan adalah AlbumSerializer.
         permission_classes (list): Menentukan bahwa endpoint ini dapat diakses oleh siapa saja (AllowAny).
     """
-    queryset = Album.objects.filter(is_active=True).order_by('sequence_number')
+    queryset = AlbumSerializer.setup_eager_loading(Album.objects.filter(is_active=True)).order_by('sequence_number')
     serializer_class = AlbumSerializer
     permission_classes = [AllowAny]  
+    version_tables = ('albums', 'photos', 'users')
 
     def list(self, request, *args, **kwargs):
         """
@@ -31,17 +36,19 @@ class PublicAlbumListView(generics.ListAPIView):
             **kwargs: Argumen kata kunci tambahan.
         
         Returns:
-            Response: Respon JSON dengan status dan data album.
+            Response: Respon JSON dengan status, data album dan cursor next/prev.
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
         return Response({
             "status": "success",
-            "data": serializer.data
+            "data": serializer.data,
+            **self.page_cursors(page),
         }, status=status.HTTP_200_OK)
 
 
-class AlbumListCreateView(generics.ListCreateAPIView):
+class AlbumListCreateView(CursorPaginatedListMixin, generics.ListCreateAPIView):
     """
     View untuk menampilkan daftar semua album atau membuat album baru.
     
@@ -50,7 +57,7 @@ class AlbumListCreateView(generics.ListCreateAPIView):
         serializer_class (Serializer): Serializer yang digunakan adalah AlbumSerializer.
         permission_classes (list): Menentukan bahwa endpoint ini hanya dapat diakses oleh pengguna yang terautentikasi (IsAuthenticated).
     """
-    queryset = Album.objects.all().order_by('sequence_number')  
+    queryset = AlbumSerializer.setup_eager_loading(Album.objects.all()).order_by('sequence_number')
     serializer_class = AlbumSerializer
     throttle_classes = [PetugasRateThrottle]
     permission_classes = [IsPetugas] 
@@ -65,13 +72,15 @@ class AlbumListCreateView(generics.ListCreateAPIView):
             **kwargs: Argumen kata kunci tambahan.
         
         Returns:
-            Response: Respon JSON dengan status dan data album.
+            Response: Respon JSON dengan status, data album dan cursor next/prev.
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
         return Response({
             "status": "success",
-            "data": serializer.data
+            "data": serializer.data,
+            **self.page_cursors(page),
         }, status=status.HTTP_200_OK)
 
     def perform_create(self, serializer):
@@ -160,14 +169,13 @@ class AlbumDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         instance = self.get_object()
         instance.delete()
-        Album.restructure_sequence_numbers()  
         return Response({
             "status": "deleted",
             "data": f"Album dengan id {kwargs['pk']} telah dihapus."
         }, status=status.HTTP_204_NO_CONTENT)
 
 
-class AlbumByCategoryView(generics.ListAPIView): 
+class AlbumByCategoryView(ConditionalGetMixin, CachedResponseMixin, CursorPaginatedListMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar album berdasarkan kategori tertentu.
     
@@ -179,6 +187,7 @@ class AlbumByCategoryView(generics.ListAPIView):
     queryset = Album.objects.filter(is_active=True)
     serializer_class = AlbumSerializer
     permission_classes = [AllowAny]
+    version_tables = ('albums', 'photos', 'users')
     
     def get_queryset(self):
         """
@@ -188,7 +197,7 @@ class AlbumByCategoryView(generics.ListAPIView):
             QuerySet: Album yang termasuk dalam kategori tertentu.
         """
         category_id = self.kwargs['category_id']
-        return Album.objects.filter(category__id=category_id)
+        return AlbumSerializer.setup_eager_loading(Album.objects.filter(category__id=category_id))
     
     def list(self, request, *args, **kwargs):
         """
@@ -200,15 +209,29 @@ class AlbumByCategoryView(generics.ListAPIView):
             **kwargs: Argumen kata kunci tambahan.
         
         Returns:
-            Response: Respon JSON dengan status, kode status, dan data album.
+            Response: Respon JSON dengan status, kode status, data album dan cursor next/prev.
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
         
         response_data = {
             "status": "success",
             "status_code": status.HTTP_200_OK,
             "data": serializer.data,
+            **self.page_cursors(page),
         }
         
         return Response(response_data)
+
+
+class AlbumMoveView(SequenceMoveView):
+    """
+    View untuk memindahkan urutan beberapa album sekaligus.
+
+    Body: `{"ids": [...], "after": id}` atau `{"ids": [...], "before": id}`
+    (lihat `gallery.ordering_views.SequenceMoveView`).
+    """
+    queryset = Album.objects.all()
+    permission_classes = [IsPetugas]
+    throttle_classes = [PetugasRateThrottle]
@@ -0,0 +1,228 @@
+# analytics/archiver.py - Pengarsipan Analytics secara streaming dan bertahap
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Analytics
+
+try:
+    import zstandard
+except ImportError:  # zstd bersifat opsional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FIELDS = ['path', 'method', 'timestamp', 'ip_address',
+                  'user_agent', 'is_authenticated', 'response_status']
+ARCHIVE_EXTENSIONS = {
+    'none': '.csv',
+    'gzip': '.csv.gz',
+    'zstd': '.csv.zst',
+}
+ARCHIVE_CONTENT_TYPES = {
+    '.csv': 'text/csv',
+    '.csv.gz': 'application/gzip',
+    '.csv.zst': 'application/zstd',
+}
+CHECKPOINT_FILENAME = '.archive_checkpoint.json'
+
+
+def get_archive_dir():
+    return os.path.join(settings.MEDIA_ROOT, 'analytics', 'archives')
+
+
+def archive_extension(filename):
+    """
+    Mengembalikan ekstensi arsip dari nama file, atau None jika bukan file arsip.
+    """
+    for extension in sorted(ARCHIVE_CONTENT_TYPES, key=len, reverse=True):
+        if filename.endswith(extension):
+            return extension
+    return None
+
+
+class AnalyticsArchiver:
+    """
+    Mengekspor record Analytics lama ke file CSV terkompresi secara bertahap.
+
+    Record dibaca per rentang primary key (`chunk_size` baris). Setiap chunk
+    ditulis sebagai satu member gzip/frame zstd yang lengkap, di-fsync, dicatat
+    di checkpoint, lalu dihapus dari database dalam transaksi pendek sendiri.
+    File dirotasi setelah mencapai `max_file_size` byte.
+
+    Jika proses terhenti, pemanggilan berikutnya melanjutkan dari checkpoint:
+    file dipotong kembali ke ukuran terakhir yang tercatat dan chunk yang sudah
+    diekspor tetapi belum terhapus akan dihapus lebih dulu.
+    """
+    def __init__(self, days=30, chunk_size=5000, compression='gzip',
+                 max_file_size=64 * 1024 * 1024, archive_dir=None):
+        if compression not in ARCHIVE_EXTENSIONS:
+            raise ValueError(f"Unsupported compression: {compression}")
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed, falling back to gzip compression")
+            compression = 'gzip'
+
+        self.days = days
+        self.chunk_size = chunk_size
+        self.compression = compression
+        self.max_file_size = max_file_size
+        self.archive_dir = archive_dir or get_archive_dir()
+        self.checkpoint_path = os.path.join(self.archive_dir, CHECKPOINT_FILENAME)
+
+    # Checkpoint
+
+    def _load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return None
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, state):
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _clear_checkpoint(self):
+        if os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
+
+    # File arsip
+
+    def _new_filename(self, part):
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        return f'analytics_archive_{timestamp}_{part:03d}{ARCHIVE_EXTENSIONS[self.compression]}'
+
+    def _compress(self, data):
+        if self.compression == 'gzip':
+            return gzip.compress(data)
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor().compress(data)
+        return data
+
+    def _encode_chunk(self, rows, with_header):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if with_header:
+            writer.writerow(ARCHIVE_FIELDS)
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else value
+                for value in row[1:]
+            ])
+        return self._compress(buffer.getvalue().encode('utf-8'))
+
+    def _append(self, filename, offset, data):
+        filepath = os.path.join(self.archive_dir, filename)
+        with open(filepath, 'ab') as f:
+            # Buang sisa tulisan yang belum tercatat di checkpoint
+            f.truncate(offset)
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        return offset + len(data)
+
+    # Proses arsip
+
+    def _delete_range(self, cutoff, after_id, upto_id):
+        with transaction.atomic():
+            deleted, _ = Analytics.objects.filter(
+                id__gt=after_id,
+                id__lte=upto_id,
+                timestamp__lt=cutoff
+            ).delete()
+        return deleted
+
+    def run(self):
+        """
+        Menjalankan (atau melanjutkan) proses pengarsipan.
+
+        Returns:
+            int: Jumlah record yang diarsipkan dan dihapus pada pemanggilan ini.
+        """
+        os.makedirs(self.archive_dir, exist_ok=True)
+
+        state = self._load_checkpoint()
+        if state is None:
+            cutoff = timezone.now() - timezone.timedelta(days=self.days)
+            state = {
+                'cutoff': cutoff.isoformat(),
+                'compression': self.compression,
+                'last_id': 0,
+                'deleted_id': 0,
+                'part': 0,
+                'filename': None,
+                'file_size': 0,
+            }
+        else:
+            logger.info(f"Resuming analytics archive from id {state['last_id']}")
+            self.compression = state['compression']
+        cutoff = parse_datetime(state['cutoff'])
+
+        archived = 0
+        if state['deleted_id'] < state['last_id']:
+            archived += self._delete_range(cutoff, state['deleted_id'], state['last_id'])
+            state['deleted_id'] = state['last_id']
+            self._save_checkpoint(state)
+
+        while True:
+            rows = list(
+                Analytics.objects
+                .filter(id__gt=state['last_id'], timestamp__lt=cutoff)
+                .order_by('id')
+                .values_list('id', *ARCHIVE_FIELDS)[:self.chunk_size]
+            )
+            if not rows:
+                break
+
+            if state['filename'] is None or state['file_size'] >= self.max_file_size:
+                state['part'] += 1
+                state['filename'] = self._new_filename(state['part'])
+                state['file_size'] = 0
+
+            data = self._encode_chunk(rows, with_header=state['file_size'] == 0)
+            state['file_size'] = self._append(state['filename'], state['file_size'], data)
+            state['last_id'] = rows[-1][0]
+            self._save_checkpoint(state)
+
+            archived += self._delete_range(cutoff, state['deleted_id'], state['last_id'])
+            state['deleted_id'] = state['last_id']
+            self._save_checkpoint(state)
+
+        self._clear_checkpoint()
+        if archived:
+            logger.info(f"Archived {archived} records to {state['filename'] or 'existing archives'}")
+        return archived
+
+
+def list_archives(archive_dir=None):
+    """
+    Mengembalikan daftar file arsip Analytics.
+
+    Returns:
+        list: Dictionary berisi name, size dan created, terbaru lebih dulu.
+    """
+    archive_dir = archive_dir or get_archive_dir()
+    files = []
+    if os.path.exists(archive_dir):
+        for entry in os.scandir(archive_dir):
+            if entry.is_file() and archive_extension(entry.name):
+                stat = entry.stat()
+                files.append({
+                    'name': entry.name,
+                    'size': stat.st_size,
+                    'created': datetime.fromtimestamp(stat.st_ctime)
+                })
+    return sorted(files, key=lambda x: x['created'], reverse=True)
@@ -0,0 +1,79 @@
+# analytics/hll.py - Sketch HyperLogLog untuk estimasi pengunjung unik
+
+import hashlib
+import math
+
+DEFAULT_PRECISION = 12  # 4096 register, error standar ~1.6%
+
+
+class HyperLogLog:
+    """
+    Implementasi HyperLogLog sederhana untuk menghitung estimasi jumlah nilai unik
+    (misalnya IP pengunjung) tanpa menyimpan seluruh nilainya.
+
+    Register disimpan sebagai `bytearray` berukuran 2^precision sehingga sketch
+    dapat disimpan ke `BinaryField` dan digabung (merge) antar bucket waktu.
+    """
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is None:
+            self.registers = bytearray(self.size)
+        else:
+            if len(registers) != self.size:
+                raise ValueError("Register size does not match precision")
+            self.registers = bytearray(registers)
+
+    @classmethod
+    def from_bytes(cls, data, precision=DEFAULT_PRECISION):
+        return cls(precision=precision, registers=bytes(data))
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    def add(self, value):
+        """
+        Menambahkan satu nilai ke sketch.
+
+        Args:
+            value: Nilai yang akan dihitung (dikonversi ke string).
+        """
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        remaining = (hashed << self.precision) & 0xFFFFFFFFFFFFFFFF
+        rank = min(64 - remaining.bit_length(), 64 - self.precision) + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+
+    def merge(self, other):
+        """
+        Menggabungkan sketch lain ke sketch ini (union).
+
+        Args:
+            other (HyperLogLog): Sketch dengan precision yang sama.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def count(self):
+        """
+        Mengembalikan estimasi jumlah nilai unik.
+
+        Returns:
+            int: Estimasi kardinalitas.
+        """
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(1.0 / (1 << register) for register in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Koreksi untuk kardinalitas kecil (linear counting)
+            estimate = size * math.log(size / zeros)
+        return int(round(estimate))
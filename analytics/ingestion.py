@@ -0,0 +1,248 @@
+# analytics/ingestion.py - Backend penulisan record Analytics
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import close_old_connections
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from .models import Analytics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INGESTION_SETTINGS = {
+    'BACKEND': 'analytics.ingestion.BufferedIngestionBackend',
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL_MS': 1000,
+    'MAX_BUFFER_SIZE': 10000,
+}
+
+
+class SyncIngestionBackend:
+    """
+    Backend sinkron yang langsung menyimpan setiap record ke database.
+
+    Dipakai sebagai fallback (misalnya saat testing) agar record Analytics
+    langsung terlihat setelah request selesai.
+    """
+    def __init__(self, **options):
+        self.recorded = 0
+
+    def record(self, entry):
+        """
+        Menyimpan satu instance Analytics (belum tersimpan) ke database.
+        """
+        entry.save()
+        self.recorded += 1
+
+    def flush(self):
+        return 0
+
+    def shutdown(self):
+        pass
+
+    def stats(self):
+        return {
+            'backend': type(self).__name__,
+            'recorded': self.recorded,
+            'written': self.recorded,
+            'dropped': 0,
+            'failed': 0,
+            'buffered': 0,
+        }
+
+
+class BufferedIngestionBackend:
+    """
+    Backend yang menampung record di ring buffer dalam proses dan menuliskannya
+    dengan `bulk_create` dari thread flusher di background.
+
+    Buffer di-flush setiap `BATCH_SIZE` record atau setiap `FLUSH_INTERVAL_MS`
+    milidetik, mana yang lebih dulu. Jika buffer penuh (`MAX_BUFFER_SIZE`),
+    record tertua dibuang dan dihitung pada counter `dropped`. Sisa buffer
+    di-flush saat proses worker berhenti.
+    """
+    def __init__(self, batch_size=200, flush_interval_ms=1000, max_buffer_size=10000):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(1, int(flush_interval_ms)) / 1000.0
+        self.max_buffer_size = max(self.batch_size, int(max_buffer_size))
+
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._reported_dropped = 0
+
+        self._reset_process_state()
+        atexit.register(self.shutdown)
+
+    def _reset_process_state(self):
+        """
+        Menyiapkan state per proses. Dipanggil ulang setelah fork karena thread
+        dan lock dari proses induk tidak ikut berjalan di proses anak.
+        """
+        self._pid = os.getpid()
+        self._buffer = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._pid != os.getpid():
+            self._reset_process_state()
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._stopping.clear()
+                    self._worker = threading.Thread(
+                        target=self._run,
+                        name='analytics-flusher',
+                        daemon=True,
+                    )
+                    self._worker.start()
+
+    def record(self, entry):
+        """
+        Memasukkan satu instance Analytics ke buffer tanpa menyentuh database.
+
+        Args:
+            entry (Analytics): Instance Analytics yang belum disimpan.
+        """
+        self._ensure_worker()
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer_size:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(entry)
+            self.recorded += 1
+            batch_ready = len(self._buffer) >= self.batch_size
+        if batch_ready:
+            self._wakeup.set()
+
+    def _take_batch(self):
+        with self._lock:
+            size = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(size)]
+
+    def flush(self):
+        """
+        Menuliskan seluruh isi buffer ke database dalam batch `bulk_create`.
+
+        Returns:
+            int: Jumlah record yang berhasil ditulis.
+        """
+        written = 0
+        with self._flush_lock:
+            close_old_connections()
+            try:
+                while True:
+                    batch = self._take_batch()
+                    if not batch:
+                        break
+                    try:
+                        Analytics.objects.bulk_create(batch, batch_size=self.batch_size)
+                    except Exception as e:
+                        with self._lock:
+                            self.failed += len(batch)
+                        logger.error(
+                            f"Error flushing {len(batch)} analytics records: {str(e)}",
+                            exc_info=True
+                        )
+                    else:
+                        written += len(batch)
+                        with self._lock:
+                            self.written += len(batch)
+            finally:
+                close_old_connections()
+
+        with self._lock:
+            newly_dropped = self.dropped - self._reported_dropped
+            self._reported_dropped = self.dropped
+        if newly_dropped:
+            logger.warning(f"Analytics buffer full, dropped {newly_dropped} records")
+        return written
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
+
+    def shutdown(self, timeout=5.0):
+        """
+        Menghentikan thread flusher dan menuliskan sisa buffer.
+        """
+        if self._pid != os.getpid():
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        worker = self._worker
+        if worker is not None and worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout)
+        deadline = time.monotonic() + timeout
+        while self._buffer and time.monotonic() < deadline:
+            if not self.flush():
+                break
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': type(self).__name__,
+                'recorded': self.recorded,
+                'written': self.written,
+                'dropped': self.dropped,
+                'failed': self.failed,
+                'buffered': len(self._buffer),
+            }
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_ingestion_backend():
+    """
+    Mengembalikan instance backend ingestion sesuai `settings.ANALYTICS_INGESTION`.
+
+    Returns:
+        SyncIngestionBackend | BufferedIngestionBackend: Backend aktif.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                options = {**DEFAULT_INGESTION_SETTINGS, **getattr(settings, 'ANALYTICS_INGESTION', {})}
+                backend_class = import_string(options['BACKEND'])
+                _backend = backend_class(
+                    batch_size=options['BATCH_SIZE'],
+                    flush_interval_ms=options['FLUSH_INTERVAL_MS'],
+                    max_buffer_size=options['MAX_BUFFER_SIZE'],
+                )
+    return _backend
+
+
+def reset_ingestion_backend():
+    """
+    Flush dan buang backend aktif agar dibuat ulang dari settings terbaru.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is not None:
+            _backend.shutdown()
+        _backend = None
+
+
+@receiver(setting_changed)
+def reset_backend_on_setting_change(sender, setting, **kwargs):
+    if setting == 'ANALYTICS_INGESTION':
+        reset_ingestion_backend()
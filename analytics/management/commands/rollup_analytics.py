@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from analytics.rollups import rollup_analytics, ROLLUP_BATCH_SIZE
+import time
+
+
+class Command(BaseCommand):
+    help = 'Aggregate new analytics records into hourly/daily rollup tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=ROLLUP_BATCH_SIZE,
+            help='Maximum number of analytics records per batch'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and aggregate every N seconds (0 = run once)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = rollup_analytics(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Rolled up {processed} analytics records'))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -1,6 +1,6 @@
 from .models import Analytics
-from rest_framework.permissions import AllowAny
-from django.urls import resolve
+from .ingestion import get_ingestion_backend
+from .routing import get_public_route_index
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,9 +8,20 @@ logger = logging.getLogger(__name__)
 class AnalyticsMiddleware:
     """
     Middleware untuk mencatat setiap request API ke dalam Analytics.
+
+    Penulisan ke database didelegasikan ke backend ingestion (lihat
+    `analytics.ingestion`) sehingga tidak berada di jalur kritis request.
+    Status publik sebuah route dibaca dari index yang dibangun sekali dari
+    URLconf (lihat `analytics.routing`).
     """
     def __init__(self, get_response):
         self.get_response = get_response
+        self.route_index = get_public_route_index()
+        try:
+            # Bangun index route publik saat startup, bukan di request pertama
+            self.route_index.is_public('/')
+        except Exception as e:
+            logger.error(f"Error building public route index: {str(e)}", exc_info=True)
 
     def __call__(self, request):
         response = self.get_response(request)
@@ -20,34 +31,24 @@ class AnalyticsMiddleware:
             not request.path.startswith('/api/dashboard/')):
             
             try:
-                # Cek permission class dari view
-                resolved = resolve(request.path)
-                view_func = resolved.func
-                
-                # Periksa apakah view adalah class-based atau function-based
-                if hasattr(view_func, 'cls'):
-                    # Class-based view
-                    permission_classes = getattr(view_func.cls, 'permission_classes', [])
-                elif hasattr(view_func, 'view_class'):
-                    # Class-based view (alternatif)
-                    permission_classes = getattr(view_func.view_class, 'permission_classes', [])
+                # Gunakan hasil resolve dari handler jika ada, selain itu
+                # cari di index route publik (tanpa resolve ulang)
+                resolver_match = getattr(request, 'resolver_match', None)
+                if resolver_match is not None:
+                    is_public_api = self.route_index.is_public_view(resolver_match.func)
                 else:
-                    # Function-based view
-                    permission_classes = getattr(view_func, 'permission_classes', [])
-
-                # Periksa apakah view menggunakan AllowAny permission
-                is_public_api = any(issubclass(permission, AllowAny) for permission in permission_classes)
+                    is_public_api = self.route_index.is_public(request.path)
 
                 # Hanya catat jika API bersifat public (AllowAny)
                 if is_public_api:
-                    Analytics.objects.create(
+                    get_ingestion_backend().record(Analytics(
                         path=request.path,
                         method=request.method,
                         ip_address=self.get_client_ip(request),
                         user_agent=request.META.get('HTTP_USER_AGENT'),
                         is_authenticated=request.user.is_authenticated,
                         response_status=response.status_code
-                    )
+                    ))
 
             except Exception as e:
                 logger.error(
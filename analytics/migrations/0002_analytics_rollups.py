@@ -0,0 +1,68 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnalyticsRollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AnalyticsDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('path', models.CharField(max_length=255)),
+                ('method', models.CharField(max_length=10)),
+                ('status_class', models.PositiveSmallIntegerField()),
+                ('is_authenticated', models.BooleanField(default=False)),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-bucket'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'path', 'method', 'status_class', 'is_authenticated'), name='analytics_daily_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsHourlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.DateTimeField()),
+                ('path', models.CharField(max_length=255)),
+                ('method', models.CharField(max_length=10)),
+                ('status_class', models.PositiveSmallIntegerField()),
+                ('is_authenticated', models.BooleanField(default=False)),
+                ('views', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-bucket'],
+                'abstract': False,
+                'constraints': [models.UniqueConstraint(fields=('bucket', 'path', 'method', 'status_class', 'is_authenticated'), name='analytics_hourly_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsVisitorSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('registers', models.BinaryField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket'), name='analytics_visitor_sketch_unique')],
+            },
+        ),
+    ]
@@ -2,10 +2,6 @@ from django.db import models
 from django.utils import timezone
 from django.core.cache import cache
 import logging
-import csv
-import os
-from django.conf import settings
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +41,9 @@ class Analytics(models.Model):
     def cleanup_old_records(cls, days=90):
         """
         Hapus record analytics yang lebih lama dari X hari.
+
+        Hanya record sampai checkpoint rollup yang dihapus, sehingga record
+        yang belum diagregasi (rollup gagal atau tertinggal) tetap disimpan.
         
         Args:
             days (int): Jumlah hari untuk menyimpan data
@@ -53,8 +52,15 @@ class Analytics(models.Model):
             int: Jumlah record yang dihapus
         """
         try:
+            # Pastikan record lama sudah masuk rollup sebelum dihapus
+            from .rollups import get_rollup_checkpoint, rollup_analytics
+            rollup_analytics()
+
             cutoff = timezone.now() - timezone.timedelta(days=days)
-            deleted_count, _ = cls.objects.filter(timestamp__lt=cutoff).delete()
+            deleted_count, _ = cls.objects.filter(
+                timestamp__lt=cutoff,
+                id__lte=get_rollup_checkpoint()
+            ).delete()
             logger.info(f"Cleaned up {deleted_count} old analytics records")
             return deleted_count
         except Exception as e:
@@ -65,6 +71,10 @@ class Analytics(models.Model):
     def get_stats(cls, days=30):
         """
         Mendapatkan statistik view untuk periode tertentu.
+
+        Statistik dihitung dari tabel rollup per jam/hari ditambah record yang
+        belum diagregasi, sehingga biayanya sebanding dengan jumlah bucket,
+        bukan jumlah record Analytics.
         
         Args:
             days (int): Jumlah hari ke belakang untuk statistik.
@@ -85,34 +95,9 @@ class Analytics(models.Model):
             return cached_stats
 
         try:
-            end_date = timezone.now()
-            start_date = end_date - timezone.timedelta(days=days)
-            
-            total_views = cls.objects.count()
-            recent_views = cls.objects.filter(
-                timestamp__gte=start_date,
-                timestamp__lte=end_date
-            ).count()
-            
-            unique_visitors = cls.objects.filter(
-                timestamp__gte=start_date,
-                timestamp__lte=end_date
-            ).values('ip_address').distinct().count()
-            
-            successful_requests = cls.objects.filter(
-                timestamp__gte=start_date,
-                timestamp__lte=end_date,
-                response_status__gte=200,
-                response_status__lt=300
-            ).count()
-            
-            stats = {
-                'total_views': total_views,
-                'recent_views': recent_views,
-                'unique_visitors': unique_visitors,
-                'successful_requests': successful_requests,
-                'period_days': days
-            }
+            # Statistik dibaca dari tabel rollup (lihat analytics.rollups)
+            from .rollups import get_rollup_stats
+            stats = get_rollup_stats(days)
             
             cache.set(cache_key, stats, timeout=3600)  # Cache for 1 hour
             return stats
@@ -122,52 +107,136 @@ class Analytics(models.Model):
             raise
 
     @classmethod
-    def archive_old_records(cls, days=30):
+    def archive_old_records(cls, days=30, compression='gzip', chunk_size=5000):
         """
-        Arsipkan record lama ke CSV dan hapus dari database
+        Arsipkan record lama ke CSV terkompresi dan hapus dari database.
+
+        Ekspor dilakukan per chunk rentang primary key dan setiap chunk langsung
+        dihapus dalam transaksi sendiri (lihat `analytics.archiver`), sehingga
+        proses dapat dilanjutkan jika terhenti.
+
+        Args:
+            days (int): Record yang lebih lama dari X hari akan diarsipkan.
+            compression (str): 'gzip', 'zstd' atau 'none'.
+            chunk_size (int): Jumlah record per chunk.
+
+        Returns:
+            int: Jumlah record yang diarsipkan
         """
         try:
-            cutoff_date = timezone.now() - timezone.timedelta(days=days)
-            old_records = cls.objects.filter(timestamp__lt=cutoff_date)
-            
-            if not old_records.exists():
-                return 0
+            # Pastikan record lama sudah masuk rollup sebelum dihapus
+            from .rollups import rollup_analytics
+            rollup_analytics()
 
-            # Buat direktori archive jika belum ada
-            archive_dir = os.path.join(settings.MEDIA_ROOT, 'analytics', 'archives')
-            os.makedirs(archive_dir, exist_ok=True)
-            
-            # Buat nama file dengan timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f'analytics_archive_{timestamp}.csv'
-            filepath = os.path.join(archive_dir, filename)
-            
-            # Tulis ke CSV
-            with open(filepath, 'w', newline='') as csvfile:
-                writer = csv.writer(csvfile)
-                # Tulis header
-                writer.writerow(['path', 'method', 'timestamp', 'ip_address', 
-                               'user_agent', 'is_authenticated', 'response_status'])
-                
-                # Tulis records
-                for record in old_records.iterator():
-                    writer.writerow([
-                        record.path,
-                        record.method,
-                        record.timestamp.isoformat(),
-                        record.ip_address,
-                        record.user_agent,
-                        record.is_authenticated,
-                        record.response_status
-                    ])
-            
-            # Hapus records yang sudah diarsipkan
-            deleted_count = old_records.count()
-            old_records.delete()
-            
-            logger.info(f"Archived {deleted_count} records to {filename}")
-            return deleted_count
+            from .archiver import AnalyticsArchiver
+            return AnalyticsArchiver(
+                days=days,
+                chunk_size=chunk_size,
+                compression=compression
+            ).run()
             
         except Exception as e:
             logger.error(f"Error archiving records: {str(e)}", exc_info=True)
             raise
+
+
+class AnalyticsRollup(models.Model):
+    """
+    Model abstrak untuk agregasi jumlah view Analytics per bucket waktu.
+
+    Fields:
+        bucket (DateTimeField): Awal bucket waktu (jam atau hari, UTC).
+        path (CharField): Path URL yang diakses.
+        method (CharField): HTTP method yang digunakan.
+        status_class (PositiveSmallIntegerField): Kelas status response (2 untuk 2xx, 4 untuk 4xx, dst).
+        is_authenticated (BooleanField): Status autentikasi pengunjung.
+        views (PositiveIntegerField): Jumlah request dalam bucket.
+    """
+    bucket = models.DateTimeField()
+    path = models.CharField(max_length=255)
+    method = models.CharField(max_length=10)
+    status_class = models.PositiveSmallIntegerField()
+    is_authenticated = models.BooleanField(default=False)
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ['-bucket']
+
+    def __str__(self):
+        return f"{self.bucket} {self.method} {self.path} ({self.status_class}xx) - {self.views}"
+
+
+class AnalyticsHourlyRollup(AnalyticsRollup):
+    """
+    Agregasi view Analytics per jam.
+    """
+    class Meta(AnalyticsRollup.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket', 'path', 'method', 'status_class', 'is_authenticated'],
+                name='analytics_hourly_rollup_unique'
+            ),
+        ]
+
+
+class AnalyticsDailyRollup(AnalyticsRollup):
+    """
+    Agregasi view Analytics per hari.
+    """
+    class Meta(AnalyticsRollup.Meta):
+        constraints = [
+            models.UniqueConstraint(
+                fields=['bucket', 'path', 'method', 'status_class', 'is_authenticated'],
+                name='analytics_daily_rollup_unique'
+            ),
+        ]
+
+
+class AnalyticsVisitorSketch(models.Model):
+    """
+    Sketch HyperLogLog pengunjung unik (berdasarkan IP) per bucket waktu.
+
+    Fields:
+        granularity (CharField): Ukuran bucket, 'hour' atau 'day'.
+        bucket (DateTimeField): Awal bucket waktu (UTC).
+        registers (BinaryField): Register HyperLogLog (lihat `analytics.hll`).
+    """
+    GRANULARITY_HOUR = 'hour'
+    GRANULARITY_DAY = 'day'
+    GRANULARITY_CHOICES = (
+        (GRANULARITY_HOUR, 'Hour'),
+        (GRANULARITY_DAY, 'Day'),
+    )
+
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket = models.DateTimeField()
+    registers = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket'],
+                name='analytics_visitor_sketch_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket}"
+
+
+class AnalyticsRollupCheckpoint(models.Model):
+    """
+    Menyimpan ID Analytics terakhir yang sudah diagregasi ke tabel rollup.
+
+    Fields:
+        name (CharField): Nama checkpoint (unik).
+        last_id (BigIntegerField): ID Analytics terakhir yang sudah diproses.
+        updated_at (DateTimeField): Waktu checkpoint terakhir diperbarui.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
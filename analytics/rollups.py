@@ -0,0 +1,316 @@
+# analytics/rollups.py - Agregasi inkremental Analytics ke tabel rollup
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from .hll import HyperLogLog
+from .models import (
+    Analytics,
+    AnalyticsDailyRollup,
+    AnalyticsHourlyRollup,
+    AnalyticsRollupCheckpoint,
+    AnalyticsVisitorSketch,
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_CHECKPOINT = 'rollups'
+ROLLUP_BATCH_SIZE = 10000
+# Record yang lebih baru dari lag ini belum diagregasi, untuk memberi waktu
+# pada record yang masih berada di buffer ingestion atau transaksi lain.
+ROLLUP_LAG = timedelta(minutes=5)
+
+DEFAULT_ROLLUP_SETTINGS = {
+    'HOURLY_RETENTION_DAYS': 90,
+}
+
+
+def get_rollup_settings():
+    return {**DEFAULT_ROLLUP_SETTINGS, **getattr(settings, 'ANALYTICS_ROLLUPS', {})}
+
+
+def hourly_retention_start(now=None):
+    """
+    Mengembalikan awal hari tertua yang rollup per jamnya masih disimpan.
+    """
+    now = now or timezone.now()
+    return _day_of(now - timedelta(days=get_rollup_settings()['HOURLY_RETENTION_DAYS']))
+
+
+def get_rollup_checkpoint():
+    """
+    Mengembalikan id Analytics terakhir yang sudah masuk rollup (0 jika belum ada).
+    """
+    return (
+        AnalyticsRollupCheckpoint.objects
+        .filter(name=ROLLUP_CHECKPOINT)
+        .values_list('last_id', flat=True)
+        .first()
+    ) or 0
+
+
+def _status_class():
+    return ExpressionWrapper(F('response_status') / 100, output_field=IntegerField())
+
+
+def _day_of(bucket):
+    return bucket.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _upsert_rollups(model, counts):
+    """
+    Menambahkan jumlah view ke baris rollup yang ada atau membuat baris baru.
+
+    Args:
+        model (Model): AnalyticsHourlyRollup atau AnalyticsDailyRollup.
+        counts (dict): (bucket, path, method, status_class, is_authenticated) -> jumlah view.
+    """
+    if not counts:
+        return
+
+    buckets = {key[0] for key in counts}
+    existing = {
+        (row.bucket, row.path, row.method, row.status_class, row.is_authenticated): row
+        for row in model.objects.select_for_update().filter(bucket__in=buckets)
+    }
+
+    to_update = []
+    to_create = []
+    for key, views in counts.items():
+        row = existing.get(key)
+        if row is not None:
+            row.views += views
+            to_update.append(row)
+        else:
+            bucket, path, method, status_class, is_authenticated = key
+            to_create.append(model(
+                bucket=bucket,
+                path=path,
+                method=method,
+                status_class=status_class,
+                is_authenticated=is_authenticated,
+                views=views
+            ))
+
+    model.objects.bulk_update(to_update, ['views'], batch_size=500)
+    model.objects.bulk_create(to_create, batch_size=500)
+
+
+def _upsert_sketches(granularity, sketches):
+    """
+    Menggabungkan sketch pengunjung baru ke sketch yang sudah tersimpan.
+
+    Args:
+        granularity (str): 'hour' atau 'day'.
+        sketches (dict): bucket -> HyperLogLog.
+    """
+    if not sketches:
+        return
+
+    existing = {
+        row.bucket: row
+        for row in AnalyticsVisitorSketch.objects.select_for_update().filter(
+            granularity=granularity,
+            bucket__in=list(sketches)
+        )
+    }
+
+    to_update = []
+    to_create = []
+    for bucket, sketch in sketches.items():
+        row = existing.get(bucket)
+        if row is not None:
+            sketch.merge(HyperLogLog.from_bytes(row.registers))
+            row.registers = sketch.to_bytes()
+            to_update.append(row)
+        else:
+            to_create.append(AnalyticsVisitorSketch(
+                granularity=granularity,
+                bucket=bucket,
+                registers=sketch.to_bytes()
+            ))
+
+    AnalyticsVisitorSketch.objects.bulk_update(to_update, ['registers'], batch_size=100)
+    AnalyticsVisitorSketch.objects.bulk_create(to_create, batch_size=100)
+
+
+def _rollup_batch(batch_size, lag):
+    horizon = timezone.now() - lag
+
+    with transaction.atomic():
+        AnalyticsRollupCheckpoint.objects.get_or_create(name=ROLLUP_CHECKPOINT)
+        checkpoint = AnalyticsRollupCheckpoint.objects.select_for_update().get(name=ROLLUP_CHECKPOINT)
+
+        candidates = (
+            Analytics.objects
+            .filter(id__gt=checkpoint.last_id)
+            .order_by('id')
+            .values_list('id', 'timestamp')[:batch_size]
+        )
+        upto = None
+        for pk, timestamp in candidates:
+            if timestamp >= horizon:
+                break
+            upto = pk
+        if upto is None:
+            return 0
+
+        rows = Analytics.objects.filter(id__gt=checkpoint.last_id, id__lte=upto).order_by()
+
+        hourly = {}
+        daily = defaultdict(int)
+        grouped = (
+            rows.annotate(hour=TruncHour('timestamp'), status_class=_status_class())
+            .values('hour', 'path', 'method', 'status_class', 'is_authenticated')
+            .annotate(views=Count('id'))
+        )
+        for group in grouped:
+            dimensions = (group['path'], group['method'], group['status_class'], group['is_authenticated'])
+            hourly[(group['hour'], *dimensions)] = group['views']
+            daily[(_day_of(group['hour']), *dimensions)] += group['views']
+
+        hourly_sketches = defaultdict(HyperLogLog)
+        daily_sketches = defaultdict(HyperLogLog)
+        visitors = rows.annotate(hour=TruncHour('timestamp')).values_list('hour', 'ip_address').distinct()
+        for hour, ip_address in visitors:
+            hourly_sketches[hour].add(ip_address)
+            daily_sketches[_day_of(hour)].add(ip_address)
+
+        _upsert_rollups(AnalyticsHourlyRollup, hourly)
+        _upsert_rollups(AnalyticsDailyRollup, daily)
+        _upsert_sketches(AnalyticsVisitorSketch.GRANULARITY_HOUR, hourly_sketches)
+        _upsert_sketches(AnalyticsVisitorSketch.GRANULARITY_DAY, daily_sketches)
+
+        checkpoint.last_id = upto
+        checkpoint.save(update_fields=['last_id', 'updated_at'])
+
+    return sum(hourly.values())
+
+
+def prune_hourly_rollups(now=None):
+    """
+    Menghapus rollup dan sketch per jam yang lebih lama dari
+    `ANALYTICS_ROLLUPS['HOURLY_RETENTION_DAYS']`. Rollup per hari tetap disimpan.
+
+    Returns:
+        int: Jumlah baris yang dihapus.
+    """
+    since = hourly_retention_start(now)
+    with transaction.atomic():
+        rollups, _ = AnalyticsHourlyRollup.objects.filter(bucket__lt=since).delete()
+        sketches, _ = AnalyticsVisitorSketch.objects.filter(
+            granularity=AnalyticsVisitorSketch.GRANULARITY_HOUR,
+            bucket__lt=since
+        ).delete()
+    if rollups or sketches:
+        logger.info(f"Pruned {rollups} hourly rollups and {sketches} hourly sketches before {since}")
+    return rollups + sketches
+
+
+def rollup_analytics(batch_size=ROLLUP_BATCH_SIZE, lag=ROLLUP_LAG):
+    """
+    Mengagregasi record Analytics baru (setelah checkpoint) ke tabel rollup
+    per jam dan per hari, termasuk sketch pengunjung unik, lalu menghapus
+    rollup per jam yang melewati masa retensi.
+
+    Setiap batch diproses dalam satu transaksi bersama pembaruan checkpoint,
+    sehingga proses aman dijalankan ulang dan tidak menghitung record dua kali.
+
+    Args:
+        batch_size (int): Jumlah record maksimal per batch.
+        lag (timedelta): Record yang lebih baru dari `now - lag` ditunda.
+
+    Returns:
+        int: Jumlah record yang diagregasi.
+    """
+    total = 0
+    while True:
+        processed = _rollup_batch(batch_size, lag)
+        if not processed:
+            break
+        total += processed
+    if total:
+        logger.info(f"Rolled up {total} analytics records")
+    prune_hourly_rollups()
+    return total
+
+
+def get_rollup_stats(days):
+    """
+    Menghitung statistik Analytics dari tabel rollup.
+
+    Record yang belum diagregasi (setelah checkpoint) dihitung langsung dari
+    tabel Analytics, sehingga hasilnya tetap lengkap di antara dua kali
+    `rollup_analytics` berjalan. Bucket jam pertama periode ikut dihitung penuh;
+    jika awal periode sudah melewati retensi rollup per jam, hari pertama
+    periode dihitung penuh dari rollup per hari.
+
+    Args:
+        days (int): Jumlah hari ke belakang untuk statistik.
+
+    Returns:
+        dict: Dictionary berisi statistik view (format sama dengan `Analytics.get_stats`).
+    """
+    end_date = timezone.now()
+    start_date = end_date - timedelta(days=days)
+    start_hour = start_date.replace(minute=0, second=0, microsecond=0)
+    start_day = _day_of(start_hour)
+    hourly_available = start_hour >= hourly_retention_start(end_date)
+
+    last_id = get_rollup_checkpoint()
+
+    total_views = AnalyticsDailyRollup.objects.aggregate(total=Sum('views'))['total'] or 0
+    if hourly_available:
+        recent_rollups = AnalyticsHourlyRollup.objects.filter(bucket__gte=start_hour, bucket__lte=end_date)
+    else:
+        recent_rollups = AnalyticsDailyRollup.objects.filter(bucket__gte=start_day, bucket__lte=end_date)
+    recent = recent_rollups.aggregate(
+        recent_views=Sum('views'),
+        successful_views=Sum('views', filter=Q(status_class=2))
+    )
+
+    in_period = Q(timestamp__gte=start_date, timestamp__lte=end_date)
+    pending = Analytics.objects.filter(id__gt=last_id).order_by()
+    pending_stats = pending.aggregate(
+        total=Count('id'),
+        recent=Count('id', filter=in_period),
+        successful=Count('id', filter=in_period & Q(response_status__gte=200, response_status__lt=300))
+    )
+
+    # Hari pertama memakai sketch per jam, hari-hari berikutnya sketch per hari
+    visitors = HyperLogLog()
+    if hourly_available:
+        sketch_filter = Q(
+            granularity=AnalyticsVisitorSketch.GRANULARITY_HOUR,
+            bucket__gte=start_hour,
+            bucket__lt=start_day + timedelta(days=1)
+        ) | Q(
+            granularity=AnalyticsVisitorSketch.GRANULARITY_DAY,
+            bucket__gt=start_day,
+            bucket__lte=end_date
+        )
+    else:
+        sketch_filter = Q(
+            granularity=AnalyticsVisitorSketch.GRANULARITY_DAY,
+            bucket__gte=start_day,
+            bucket__lte=end_date
+        )
+    sketches = AnalyticsVisitorSketch.objects.filter(sketch_filter).values_list('registers', flat=True)
+    for registers in sketches:
+        visitors.merge(HyperLogLog.from_bytes(registers))
+    visitors.update(pending.filter(in_period).values_list('ip_address', flat=True).distinct())
+
+    return {
+        'total_views': total_views + pending_stats['total'],
+        'recent_views': (recent['recent_views'] or 0) + pending_stats['recent'],
+        'unique_visitors': visitors.count(),
+        'successful_requests': (recent['successful_views'] or 0) + pending_stats['successful'],
+        'period_days': days
+    }
@@ -0,0 +1,158 @@
+# analytics/routing.py - Index route publik untuk AnalyticsMiddleware
+
+import re
+import threading
+from functools import lru_cache
+
+from django.urls import get_resolver, URLResolver
+from django.urls.resolvers import RoutePattern
+from rest_framework.permissions import AllowAny
+
+ROUTE_CACHE_SIZE = 2048
+
+# Named group diganti non-capturing group agar pola dari beberapa level include
+# bisa digabung tanpa bentrok nama group (misalnya 'format' pada router DRF).
+NAMED_GROUP_RE = re.compile(r'\(\?P<\w+>')
+
+
+def view_is_public(view_func):
+    """
+    Menentukan apakah sebuah view memakai permission AllowAny.
+
+    Args:
+        view_func (callable): Callback view dari URLconf.
+
+    Returns:
+        bool: True jika salah satu permission class adalah turunan AllowAny.
+    """
+    # Periksa apakah view adalah class-based atau function-based
+    if hasattr(view_func, 'cls'):
+        # Class-based view
+        permission_classes = getattr(view_func.cls, 'permission_classes', [])
+    elif hasattr(view_func, 'view_class'):
+        # Class-based view (alternatif)
+        permission_classes = getattr(view_func.view_class, 'permission_classes', [])
+    else:
+        # Function-based view
+        permission_classes = getattr(view_func, 'permission_classes', [])
+
+    return any(issubclass(permission, AllowAny) for permission in permission_classes)
+
+
+def _strip_anchor(regex):
+    return regex[1:] if regex.startswith('^') else regex
+
+
+class PublicRouteIndex:
+    """
+    Tabel yang dibangun sekali dari URLconf untuk memetakan path ke flag "publik".
+
+    Route tanpa parameter disimpan di dictionary path -> index, route dinamis
+    disimpan sebagai regex gabungan sesuai urutan URLconf sehingga aturan
+    "pola pertama yang cocok menang" milik Django tetap berlaku. Hasil lookup
+    per path disimpan di LRU cache. Index dibangun ulang otomatis jika resolver
+    URLconf berganti (misalnya setelah `clear_url_caches()` atau perubahan
+    `ROOT_URLCONF`).
+    """
+    def __init__(self, urlconf=None, cache_size=ROUTE_CACHE_SIZE):
+        self.urlconf = urlconf
+        self._resolver = None
+        self._build_lock = threading.Lock()
+        self._static = {}
+        self._entries = []
+        self._views = {}
+        self._lookup = lru_cache(maxsize=cache_size)(self._match)
+
+    def _walk(self, resolver, prefix, literal):
+        for pattern in resolver.url_patterns:
+            regex = prefix + _strip_anchor(NAMED_GROUP_RE.sub('(?:', pattern.pattern.regex.pattern))
+            is_literal = (
+                literal is not None
+                and isinstance(pattern.pattern, RoutePattern)
+                and not pattern.pattern.converters
+            )
+            route = literal + str(pattern.pattern) if is_literal else None
+
+            if isinstance(pattern, URLResolver):
+                yield from self._walk(pattern, regex, route)
+            else:
+                yield regex, route, pattern.callback
+
+    def _build(self, resolver):
+        static = {}
+        entries = []
+        views = {}
+        for regex, route, callback in self._walk(resolver, '^/', '/'):
+            if callback not in views:
+                views[callback] = view_is_public(callback)
+            if route is not None:
+                static.setdefault(route, len(entries))
+            entries.append((re.compile(regex), views[callback]))
+
+        self._static = static
+        self._entries = entries
+        self._views = views
+        self._lookup.cache_clear()
+        self._resolver = resolver
+
+    def _ensure_current(self):
+        resolver = get_resolver(self.urlconf)
+        if resolver is not self._resolver:
+            with self._build_lock:
+                if resolver is not self._resolver:
+                    self._build(resolver)
+
+    def _match(self, path):
+        # Pola dinamis yang terdaftar sebelum route statis tetap diprioritaskan
+        limit = self._static.get(path, len(self._entries))
+        for regex, is_public in self._entries[:limit]:
+            if regex.match(path):
+                return is_public
+        if limit < len(self._entries):
+            return self._entries[limit][1]
+        return False
+
+    def is_public(self, path):
+        """
+        Mengecek apakah path mengarah ke view publik.
+
+        Args:
+            path (str): Path request, misalnya '/api/photos/public/'.
+
+        Returns:
+            bool: True jika view yang cocok memakai AllowAny, False jika tidak
+            publik atau tidak ada route yang cocok.
+        """
+        self._ensure_current()
+        return self._lookup(path)
+
+    def is_public_view(self, view_func):
+        """
+        Mengecek flag publik berdasarkan callback view yang sudah di-resolve.
+
+        Args:
+            view_func (callable): Callback dari `request.resolver_match.func`.
+
+        Returns:
+            bool: True jika view memakai AllowAny.
+        """
+        self._ensure_current()
+        is_public = self._views.get(view_func)
+        if is_public is None:
+            is_public = view_is_public(view_func)
+        return is_public
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_public_route_index(urlconf=None):
+    """
+    Mengembalikan PublicRouteIndex untuk URLconf tertentu (default: ROOT_URLCONF).
+    """
+    index = _indexes.get(urlconf)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.setdefault(urlconf, PublicRouteIndex(urlconf))
+    return index
@@ -1,3 +1,201 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import path
+from django.utils import timezone
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .ingestion import BufferedIngestionBackend, SyncIngestionBackend, get_ingestion_backend
+from .models import Analytics, AnalyticsDailyRollup, AnalyticsHourlyRollup, AnalyticsVisitorSketch
+from .rollups import get_rollup_checkpoint, rollup_analytics
 
 # Create your tests here.
+
+
+class PublicPingView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({'status': 'ok'})
+
+
+class PrivatePingView(PublicPingView):
+    permission_classes = [IsAuthenticated]
+
+
+# URLconf untuk test middleware (ROOT_URLCONF='analytics.tests')
+urlpatterns = [
+    path('api/public-ping/', PublicPingView.as_view()),
+    path('api/private-ping/', PrivatePingView.as_view()),
+]
+
+
+def make_entry(path='/api/albums/public/', **fields):
+    return Analytics(**{
+        'path': path,
+        'method': 'GET',
+        'ip_address': '127.0.0.1',
+        'response_status': 200,
+        **fields,
+    })
+
+
+@override_settings(
+    ANALYTICS_INGESTION={'BACKEND': 'analytics.ingestion.SyncIngestionBackend'},
+    ROOT_URLCONF='analytics.tests',
+)
+class SyncIngestionTestCase(TestCase):
+    """
+    Test backend ingestion sinkron (dipakai saat testing).
+    """
+    def test_record_writes_immediately(self):
+        backend = get_ingestion_backend()
+        self.assertIsInstance(backend, SyncIngestionBackend)
+        written = backend.stats()['written']
+
+        backend.record(make_entry())
+
+        self.assertEqual(Analytics.objects.count(), 1)
+        self.assertEqual(backend.stats()['written'], written + 1)
+
+    def test_middleware_records_public_requests(self):
+        self.client.get('/api/public-ping/', HTTP_USER_AGENT='test-agent', REMOTE_ADDR='10.0.0.1')
+        # Endpoint non-publik tidak dicatat
+        self.client.get('/api/private-ping/')
+
+        entry = Analytics.objects.get()
+        self.assertEqual(entry.path, '/api/public-ping/')
+        self.assertEqual(entry.method, 'GET')
+        self.assertEqual(entry.ip_address, '10.0.0.1')
+        self.assertEqual(entry.user_agent, 'test-agent')
+        self.assertEqual(entry.response_status, 200)
+
+
+class BufferedIngestionTestCase(TransactionTestCase):
+    """
+    Test backend ingestion buffered. Memakai TransactionTestCase karena flush
+    juga berjalan di thread flusher dengan koneksi database sendiri.
+    """
+    def make_backend(self, **options):
+        # Interval panjang: flush hanya terjadi karena BATCH_SIZE atau dipanggil langsung
+        backend = BufferedIngestionBackend(flush_interval_ms=60000, **options)
+        self.addCleanup(backend.shutdown)
+        return backend
+
+    def test_flush_writes_buffered_records(self):
+        backend = self.make_backend(batch_size=10)
+
+        for index in range(3):
+            backend.record(make_entry(path=f'/api/photos/{index}/'))
+        self.assertEqual(Analytics.objects.count(), 0)
+
+        self.assertEqual(backend.flush(), 3)
+        self.assertEqual(Analytics.objects.count(), 3)
+        self.assertEqual(backend.stats(), {
+            'backend': 'BufferedIngestionBackend',
+            'recorded': 3,
+            'written': 3,
+            'dropped': 0,
+            'failed': 0,
+            'buffered': 0,
+        })
+
+    def test_failed_batch_is_counted(self):
+        backend = self.make_backend(batch_size=2)
+
+        # Tahan flush dari thread flusher agar batch dapat ditentukan
+        with backend._flush_lock:
+            backend.record(make_entry())
+            backend.record(make_entry())
+            backend.record(make_entry(response_status=None))
+        backend.flush()
+
+        stats = backend.stats()
+        self.assertEqual(stats['written'], 2)
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['buffered'], 0)
+        self.assertEqual(Analytics.objects.count(), 2)
+
+    def test_full_buffer_drops_oldest_records(self):
+        backend = self.make_backend(batch_size=3, max_buffer_size=3)
+
+        with backend._flush_lock:
+            for index in range(5):
+                backend.record(make_entry(path=f'/api/photos/{index}/'))
+            self.assertEqual(backend.stats()['dropped'], 2)
+        backend.flush()
+
+        self.assertEqual(
+            sorted(Analytics.objects.values_list('path', flat=True)),
+            ['/api/photos/2/', '/api/photos/3/', '/api/photos/4/'],
+        )
+        self.assertEqual(backend.stats()['written'], 3)
+
+    def test_flusher_thread_writes_full_batches(self):
+        backend = self.make_backend(batch_size=2)
+
+        backend.record(make_entry())
+        backend.record(make_entry())
+        backend.shutdown()
+
+        self.assertEqual(Analytics.objects.count(), 2)
+        self.assertEqual(backend.stats()['written'], 2)
+
+
+@override_settings(ANALYTICS_ROLLUPS={'HOURLY_RETENTION_DAYS': 7})
+class RollupRetentionTestCase(TestCase):
+    """
+    Test retensi rollup per jam dan pembersihan record yang dibatasi checkpoint rollup.
+    """
+    def create_records(self, *ages):
+        now = timezone.now()
+        entries = Analytics.objects.bulk_create([make_entry() for _ in ages])
+        # timestamp memakai auto_now_add, jadi diubah setelah dibuat
+        for entry, age in zip(entries, ages):
+            Analytics.objects.filter(pk=entry.pk).update(timestamp=now - age)
+        return [entry.pk for entry in entries]
+
+    def test_rollup_prunes_expired_hourly_rollups(self):
+        self.create_records(timedelta(days=20), timedelta(days=1))
+
+        rollup_analytics()
+
+        since = timezone.now() - timedelta(days=8)
+        self.assertFalse(AnalyticsHourlyRollup.objects.filter(bucket__lt=since).exists())
+        self.assertFalse(AnalyticsVisitorSketch.objects.filter(
+            granularity=AnalyticsVisitorSketch.GRANULARITY_HOUR, bucket__lt=since
+        ).exists())
+        self.assertEqual(AnalyticsHourlyRollup.objects.count(), 1)
+        # Rollup per hari tetap disimpan
+        self.assertEqual(AnalyticsDailyRollup.objects.count(), 2)
+
+    def test_stats_beyond_hourly_retention_use_daily_rollups(self):
+        self.create_records(timedelta(days=20), timedelta(days=1))
+        rollup_analytics()
+
+        stats = Analytics.get_stats(days=30)
+
+        self.assertEqual(stats['total_views'], 2)
+        self.assertEqual(stats['recent_views'], 2)
+        self.assertEqual(stats['successful_requests'], 2)
+        self.assertEqual(stats['unique_visitors'], 1)
+
+    def test_cleanup_keeps_records_not_rolled_up(self):
+        old_1, old_2, recent = self.create_records(timedelta(days=100), timedelta(days=100), timedelta(days=1))
+        rollup_analytics()
+        self.assertEqual(get_rollup_checkpoint(), recent)
+        # Record lama yang masuk setelah rollup terakhir (misalnya dari buffer ingestion)
+        (late,) = self.create_records(timedelta(days=100))
+
+        # Rollup tertinggal: cleanup berjalan tanpa rollup baru
+        with mock.patch('analytics.rollups.rollup_analytics'):
+            self.assertEqual(Analytics.cleanup_old_records(days=90), 2)
+
+        self.assertEqual(sorted(Analytics.objects.values_list('pk', flat=True)), [recent, late])
+
+        # Setelah masuk rollup, record tersebut ikut dibersihkan
+        self.assertEqual(Analytics.cleanup_old_records(days=90), 1)
+        self.assertEqual(list(Analytics.objects.values_list('pk', flat=True)), [recent])
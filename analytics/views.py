@@ -5,11 +5,10 @@ from .models import Analytics
 from .serializers import AnalyticsStatsSerializer
 from gallery.throttles import AdminRateThrottle
 from users.permissions import IsAdmin
+from .archiver import ARCHIVE_CONTENT_TYPES, archive_extension, get_archive_dir, list_archives
+from gallery.streaming import ranged_file_response
 import logging
-from django.http import FileResponse
-from django.conf import settings
 import os
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
@@ -72,6 +71,9 @@ class AnalyticsArchiveView(APIView):
     """
     View untuk mengakses file arsip analytics.
     Hanya admin yang bisa mengakses.
+
+    File arsip dikirim secara streaming dan mendukung header Range sehingga
+    unduhan besar dapat dilanjutkan.
     """
     permission_classes = [IsAdmin]
     
@@ -79,30 +81,20 @@ class AnalyticsArchiveView(APIView):
         try:
             # Jika filename tidak ada, tampilkan daftar arsip
             if filename is None:
-                archive_dir = os.path.join(settings.MEDIA_ROOT, 'analytics', 'archives')
-                files = []
-                
-                if os.path.exists(archive_dir):
-                    for file in os.listdir(archive_dir):
-                        if file.endswith('.csv'):
-                            filepath = os.path.join(archive_dir, file)
-                            files.append({
-                                'name': file,
-                                'size': os.path.getsize(filepath),
-                                'created': datetime.fromtimestamp(os.path.getctime(filepath))
-                            })
-                
                 return Response({
-                    'archives': sorted(files, key=lambda x: x['created'], reverse=True)
+                    'archives': list_archives()
                 })
             
             # Jika filename ada, download file
-            filepath = os.path.join(settings.MEDIA_ROOT, 'analytics', 'archives', filename)
-            if not os.path.exists(filepath):
+            extension = archive_extension(filename)
+            filepath = os.path.join(get_archive_dir(), os.path.basename(filename))
+            if extension is None or not os.path.isfile(filepath):
                 return Response({'error': 'File not found'}, status=404)
                 
-            return FileResponse(
-                open(filepath, 'rb'), 
+            return ranged_file_response(
+                request,
+                filepath,
+                content_type=ARCHIVE_CONTENT_TYPES[extension],
                 as_attachment=True,
                 filename=filename
             )
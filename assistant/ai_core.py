@@ -1,137 +1,268 @@
 # assistant/ai_core.py
-from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
-from sentence_transformers import SentenceTransformer
-from langdetect import detect
-import torch
 import numpy as np
-from textblob import TextBlob
-import os
 from pathlib import Path
+from .intent_index import IntentIndex, KeywordAutomaton
+from .model_registry import ModelsUnavailable, get_assistant_ai_settings, registry
 from .responses import GalleryResponses
+from .suggestion_index import SuggestionIndex
+
+# Folder cache model HuggingFace
+CACHE_DIR = Path(__file__).resolve().parent / 'models_cache'
+
+DEFAULT_SENTIMENT = {'label': '3 stars', 'score': 0.5}
+
+SEMANTIC_MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+
+# Loader model. Import transformers/torch dilakukan di dalam loader agar proses
+# yang tidak memakai assistant (migrate, shell, worker tanpa chat) tidak
+# membayar waktu import dan memorinya.
+
+def load_sentiment_analyzer():
+    """Load multilingual BERT sentiment pipeline"""
+    from transformers import pipeline
+    return pipeline(
+        "sentiment-analysis",
+        model="nlptown/bert-base-multilingual-uncased-sentiment",
+        model_kwargs={"cache_dir": CACHE_DIR / 'sentiment'}
+    )
+
+
+def load_semantic_model():
+    """Load SentenceTransformer untuk similarity"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(
+        SEMANTIC_MODEL_NAME,
+        cache_folder=str(CACHE_DIR / 'semantic')
+    )
+
+
+def load_ner_model():
+    """Load Indonesian NER pipeline"""
+    from transformers import pipeline, AutoTokenizer, AutoModelForTokenClassification
+    tokenizer = AutoTokenizer.from_pretrained(
+        "cahya/bert-base-indonesian-NER",
+        cache_dir=CACHE_DIR / 'ner'
+    )
+    model = AutoModelForTokenClassification.from_pretrained(
+        "cahya/bert-base-indonesian-NER",
+        cache_dir=CACHE_DIR / 'ner'
+    )
+    return pipeline(
+        "ner",
+        model=model,
+        tokenizer=tokenizer,
+        aggregation_strategy="simple",
+    )
+
+
+def load_intent_index():
+    """Indeks embedding pola intent, dibaca dari disk atau dibangun sekali"""
+    return IntentIndex.load_or_build(
+        registry.get('semantic'),
+        GalleryResponses.INTENTS,
+        CACHE_DIR / 'intent_index',
+        SEMANTIC_MODEL_NAME,
+    )
+
+
+def load_suggestion_index():
+    """Embedding pertanyaan yang disarankan per bahasa (memory-mapped dari disk)"""
+    return SuggestionIndex.load_or_build(
+        registry.get('semantic'),
+        GalleryResponses.SUGGESTED_QUESTIONS,
+        CACHE_DIR / 'suggestion_index',
+        SEMANTIC_MODEL_NAME,
+    )
+
+
+registry.register('sentiment', load_sentiment_analyzer)
+registry.register('semantic', load_semantic_model)
+registry.register('ner', load_ner_model)
+registry.register('intent_index', load_intent_index)
+registry.register('suggestion_index', load_suggestion_index)
+
+
+# Pemakai hasil analisis: pemilihan respons di GalleryAssistantService, dan
+# enrichment InteractionLog yang berjalan di luar request (assistant.enrichment)
+RESPONSE = 'response'
+ENRICHMENT = 'enrichment'
+
+
+class AnalysisStage:
+    """
+    Satu tahap `GalleryAICore.analyze_batch`.
+
+    Args:
+        name (str): Nama tahap.
+        method (str): Method GalleryAICore `(texts, analyses)` yang mengisi
+            hasil tahap ke setiap dict analisis.
+        consumers (set): Pemakai yang membutuhkan hasil tahap ini.
+        uses_models (bool): True jika tahap menjalankan model AI.
+    """
+    def __init__(self, name, method, consumers, uses_models=False):
+        self.name = name
+        self.method = method
+        self.consumers = frozenset(consumers)
+        self.uses_models = uses_models
+
+    def __repr__(self):
+        return f'<AnalysisStage {self.name}>'
+
+
+# Semua handler intent di process_query hanya memakai language dan intent;
+# sentiment dan entitas hanya dipakai untuk InteractionLog. Tahap intent memakai
+# indeks embedding (model semantic) dan baru jatuh ke automaton kata kunci jika
+# model tidak tersedia.
+ANALYSIS_STAGES = (
+    AnalysisStage('language', '_analyze_language', {RESPONSE, ENRICHMENT}),
+    AnalysisStage('intent', '_analyze_intent', {RESPONSE}, uses_models=True),
+    AnalysisStage('sentiment', '_analyze_sentiment', {ENRICHMENT}, uses_models=True),
+    AnalysisStage('entities', '_analyze_entities', {ENRICHMENT}, uses_models=True),
+)
+
+
+def stages_for(consumers):
+    """
+    Tahap analisis yang dibutuhkan `consumers`, sesuai urutan ANALYSIS_STAGES.
+    """
+    consumers = set(consumers)
+    return [stage for stage in ANALYSIS_STAGES if stage.consumers & consumers]
+
 
 class GalleryAICore:
-    """Core AI functionality untuk Gallery Assistant"""
+    """
+    Core AI functionality untuk Gallery Assistant.
+
+    Model tidak dimuat di constructor; setiap model dimuat oleh
+    `assistant.model_registry` saat pertama kali dipakai.
+    """
     
     def __init__(self):
-        # Set up cache directory
-        base_dir = Path(__file__).resolve().parent
-        self.cache_dir = base_dir / 'models_cache'
+        self.cache_dir = CACHE_DIR
         self.cache_dir.mkdir(exist_ok=True)
         
-        print(f"Loading AI models from cache: {self.cache_dir}")
-        
-        # Initialize sentiment analyzer
-        self.sentiment_analyzer = pipeline(
-            "sentiment-analysis",
-            model="nlptown/bert-base-multilingual-uncased-sentiment",
-            model_kwargs={"cache_dir": self.cache_dir / 'sentiment'}
-        )
-        print("Sentiment analyzer loaded")
-        
-        # Initialize semantic model
-        self.semantic_model = SentenceTransformer(
-            'paraphrase-multilingual-MiniLM-L12-v2',
-            cache_folder=str(self.cache_dir / 'semantic')
-        )
-        print("Semantic model loaded")
-        
-        # Initialize NER model with max_length
-        tokenizer = AutoTokenizer.from_pretrained(
-            "cahya/bert-base-indonesian-NER",
-            cache_dir=self.cache_dir / 'ner'
-        )
-        model = AutoModelForTokenClassification.from_pretrained(
-            "cahya/bert-base-indonesian-NER",
-            cache_dir=self.cache_dir / 'ner'
-        )
-        self.ner_model = pipeline(
-            "ner",
-            model=model,
-            tokenizer=tokenizer,
-            aggregation_strategy="simple",
-        )
-        print("NER model loaded")
-        
         # Gunakan intents dari GalleryResponses
         self.intents = GalleryResponses.INTENTS
+        self.keyword_automaton = KeywordAutomaton(self.intents)
         
         # Pre-defined responses dari GalleryResponses
         self.responses = GalleryResponses.RESPONSES
         
-        # Pre-compute embeddings
-        print("Computing embeddings...")
-        self.embeddings = self._compute_embeddings()
-        print("Embeddings computed")
-        
         # Forbidden topics
         self.forbidden_topics = [
             'password', 'admin', 'login', 'database', 'server',
             'backend', 'code', 'sistem', 'system', 'private'
         ]
-        
-        print("AI Core initialization completed")
-
-    def _compute_embeddings(self):
-        """Pre-compute embeddings untuk semua responses"""
-        embeddings = {}
-        for intent, lang_responses in self.responses.items():
-            embeddings[intent] = {}
-            for lang, response in lang_responses.items():
-                embeddings[intent][lang] = self.semantic_model.encode(response['text'])
-        return embeddings
-
-    def analyze_text(self, text, conversation_history=None):
-        """Analyze text comprehensively with conversation context"""
-        try:
-            # Language detection - improve accuracy
-            text_lower = text.lower()
-            id_words = ['apa', 'bagaimana', 'cara', 'lihat', 'foto', 'gambar', 'bisa', 'tolong']
-            is_indonesian = any(word in text_lower for word in id_words)
-            language = 'id' if is_indonesian else 'en'
-
-            # Sentiment analysis
-            sentiment = self._convert_to_native_types(self.sentiment_analyzer(text)[0])
-
-            # NER dengan handling max_length - Perbaikan disini
-            try:
-                # Batasi panjang teks untuk NER
-                max_length = 128
-                truncated_text = ' '.join(text.split()[:max_length])
-                entities = self._convert_to_native_types(
-                    self.ner_model(truncated_text)
-                )
-            except Exception as e:
-                print(f"NER error: {str(e)}")
-                entities = []
-
-            # Intent classification - Disederhanakan
-            intent = self.classify_intent(text)
-            confidence = 0.8  # Default confidence
 
-            # Determine if clarification is needed
-            requires_clarification = confidence < 0.4
-            
-            return {
-                'language': language,
-                'sentiment': sentiment,
-                'entities': entities,
-                'intent': intent,
-                'confidence': confidence,
-                'requires_clarification': requires_clarification
-            }
-            
+    @property
+    def sentiment_analyzer(self):
+        return registry.get('sentiment')
+
+    @property
+    def semantic_model(self):
+        return registry.get('semantic')
+
+    @property
+    def ner_model(self):
+        return registry.get('ner')
+
+    @property
+    def intent_index(self):
+        return registry.get('intent_index')
+
+    @property
+    def suggestion_index(self):
+        return registry.get('suggestion_index')
+
+    def analyze_batch(self, texts, consumers=(RESPONSE,)):
+        """
+        Analyze beberapa teks sekaligus. Hanya tahap di `ANALYSIS_STAGES` yang
+        dibutuhkan `consumers` yang dijalankan; tahap bermodel dijalankan
+        sebagai satu batch per model.
+
+        Args:
+            texts (list): Teks yang dianalisis.
+            consumers (tuple): Pemakai hasil analisis (RESPONSE, ENRICHMENT).
+
+        Returns:
+            list: Dict analisis per teks. Berisi `degraded: True` jika tahap
+                bermodel yang diminta tidak dapat dijalankan.
+        """
+        texts = list(texts)
+        analyses = [{} for _ in texts]
+        for stage in stages_for(consumers):
+            getattr(self, stage.method)(texts, analyses)
+        return analyses
+
+    def analyze_text(self, text, conversation_history=None, consumers=(RESPONSE,)):
+        """Analyze text sesuai kebutuhan consumers (default: pemilihan respons)"""
+        try:
+            return self.analyze_batch([text], consumers)[0]
         except Exception as e:
             print(f"Error in analyze_text: {str(e)}")
             # Return default values jika error
             return {
                 'language': 'id',
-                'sentiment': {'label': '3 stars', 'score': 0.5},
+                'sentiment': DEFAULT_SENTIMENT,
                 'entities': [],
                 'intent': 'general',
                 'confidence': 0.5,
-                'requires_clarification': False
+                'requires_clarification': False,
+                'degraded': True
             }
 
+    # Tahap analisis (lihat ANALYSIS_STAGES)
+
+    def _analyze_language(self, texts, analyses):
+        # Language detection berbasis kata kunci
+        id_words = ['apa', 'bagaimana', 'cara', 'lihat', 'foto', 'gambar', 'bisa', 'tolong']
+        for text, analysis in zip(texts, analyses):
+            text_lower = text.lower()
+            analysis['language'] = 'id' if any(word in text_lower for word in id_words) else 'en'
+
+    def _analyze_intent(self, texts, analyses):
+        for analysis, (intent, confidence) in zip(analyses, self.classify_intents(texts)):
+            analysis['intent'] = intent
+            analysis['confidence'] = confidence
+            # Determine if clarification is needed
+            analysis['requires_clarification'] = confidence < 0.4
+
+    def _analyze_sentiment(self, texts, analyses):
+        try:
+            sentiments = self._convert_to_native_types(self.sentiment_analyzer(texts))
+        except ModelsUnavailable:
+            sentiments = None
+        except Exception as e:
+            print(f"Sentiment error: {str(e)}")
+            sentiments = None
+
+        for index, analysis in enumerate(analyses):
+            if sentiments is None:
+                analysis['sentiment'] = DEFAULT_SENTIMENT
+                analysis['degraded'] = True
+            else:
+                analysis['sentiment'] = sentiments[index]
+
+    def _analyze_entities(self, texts, analyses):
+        try:
+            # Batasi panjang teks untuk NER
+            max_length = 128
+            truncated_texts = [' '.join(text.split()[:max_length]) for text in texts]
+            entities = self._convert_to_native_types(self.ner_model(truncated_texts))
+        except ModelsUnavailable:
+            entities = None
+        except Exception as e:
+            print(f"NER error: {str(e)}")
+            entities = None
+
+        for index, analysis in enumerate(analyses):
+            if entities is None:
+                analysis['entities'] = []
+                analysis['degraded'] = True
+            else:
+                analysis['entities'] = entities[index]
+
     def _advanced_intent_classification(self, text):
         """Classify intent with advanced analysis"""
         text_lower = text.lower()
@@ -190,19 +321,33 @@ class GalleryAICore:
 
     def classify_intent(self, text):
         """Classify intent of the text"""
-        text_lower = text.lower()
-        
-        # Find best matching intent
-        best_intent = None
-        highest_score = 0
-        
-        for intent, patterns in self.intents.items():
-            score = sum(1 for pattern in patterns if pattern in text_lower)
-            if score > highest_score:
-                highest_score = score
-                best_intent = intent
-                
-        return best_intent or 'general'
+        return self.classify_intents([text])[0][0]
+
+    def classify_intents(self, texts):
+        """
+        Klasifikasi intent beberapa teks.
+
+        Teks di-encode sekali (satu batch) lalu dibandingkan dengan indeks
+        embedding pola intent; teks dengan similarity di bawah
+        `ASSISTANT_AI['INTENT_THRESHOLD']` menjadi 'general'. Automaton kata
+        kunci hanya dipakai jika model tidak tersedia di proses ini (model
+        dimatikan, atau proses web dalam mode worker saat worker tidak dapat
+        dihubungi).
+
+        Returns:
+            list: (intent, confidence) per teks; 'general' jika tidak ada yang cocok.
+        """
+        if not texts:
+            return []
+        try:
+            index = self.intent_index
+            vectors = self.semantic_model.encode(list(texts))
+        except ModelsUnavailable:
+            # Default confidence untuk klasifikasi kata kunci
+            return [(self.keyword_automaton.classify(text) or 'general', 0.8) for text in texts]
+
+        threshold = get_assistant_ai_settings()['INTENT_THRESHOLD']
+        return [(intent or 'general', score) for intent, score in index.classify(vectors, threshold)]
 
     def get_best_response(self, text, language, intent):
         """Get best response based on semantic similarity"""
@@ -218,19 +363,19 @@ class GalleryAICore:
 
     def get_suggested_questions(self, text, language):
         """Get context-aware suggested questions"""
-        suggestions = GalleryResponses.get_suggested_questions(language)
-        
-        # Get embeddings
-        text_embedding = self.semantic_model.encode(text)
-        suggestion_embeddings = self.semantic_model.encode(suggestions)
-        
-        # Calculate similarities
-        similarities = torch.nn.functional.cosine_similarity(
-            torch.tensor(text_embedding).unsqueeze(0),
-            torch.tensor(suggestion_embeddings),
-            dim=1
-        )
-        
-        # Get top 3 most relevant suggestions
-        top_indices = torch.topk(similarities, k=3).indices
-        return [suggestions[idx] for idx in top_indices]
\ No newline at end of file
+        return self.get_suggested_questions_batch([text], [language])[0]
+
+    def get_suggested_questions_batch(self, texts, languages):
+        """
+        Tiga pertanyaan yang disarankan paling relevan untuk setiap teks.
+        Semua teks di-encode dalam satu batch lalu diurutkan terhadap embedding
+        pertanyaan yang sudah dihitung (lihat SuggestionIndex).
+        """
+        # Tanpa model semantic, kembalikan saran default
+        try:
+            semantic_model = self.semantic_model
+            index = self.suggestion_index
+        except ModelsUnavailable:
+            return [GalleryResponses.get_suggested_questions(language)[:3] for language in languages]
+
+        return index.rank(semantic_model.encode(list(texts)), languages, limit=3)
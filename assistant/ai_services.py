@@ -1,7 +1,7 @@
 # assistant/ai_services.py
-from .ai_core import GalleryAICore
+from .enrichment import schedule_enrichment
+from .inference import get_ai_core
 from .models import AssistantContext, ChatHistory, InteractionLog
-from googletrans import Translator
 import numpy as np
 from .responses import GalleryResponses
 from datetime import datetime
@@ -12,10 +12,16 @@ from django.utils import timezone
 from datetime import timedelta
 from django.utils.text import slugify
 from .dynamic_data_services import DynamicDataService
+import json
 import random
 
 class GalleryAssistantService:
-    """Service layer untuk Gallery Assistant"""
+    """
+    Service layer untuk Gallery Assistant.
+
+    Dengan `ASSISTANT_AI['INFERENCE'] = 'worker'`, analisis dikirim ke inference
+    worker (lihat assistant.inference); service ini tidak memuat model sendiri.
+    """
     
     _instance = None
     _ai_core = None
@@ -24,7 +30,7 @@ class GalleryAssistantService:
         if cls._instance is None:
             print("Creating new GalleryAssistantService instance")
             cls._instance = super().__new__(cls)
-            cls._instance._ai_core = GalleryAICore()
+            cls._instance._ai_core = get_ai_core()
         return cls._instance
 
     def __init__(self):
@@ -33,15 +39,24 @@ class GalleryAssistantService:
             return
             
         self._initialized = True
-        self.translator = Translator()
+        self._translator = None
         print("GalleryAssistantService initialized")
 
     @property
     def ai_core(self):
         return self._ai_core
 
+    @property
+    def translator(self):
+        """Translator googletrans, dibuat saat pertama dipakai"""
+        if self._translator is None:
+            from googletrans import Translator
+            self._translator = Translator()
+        return self._translator
+
     def process_query(self, query, session_id):
         """Process user query and generate response"""
+        language = 'id'
         try:
             print(f"Processing query: {query}")
             
@@ -53,56 +68,66 @@ class GalleryAssistantService:
             # Analyze with context
             analysis = self.ai_core.analyze_text(query)
             print(f"Analysis result: {analysis}")
-            
             language = analysis['language']
-            intent = analysis['intent']
-            
-            # Handle popular photos intent
-            if intent == 'popular_photos':
-                dynamic_data = self._get_dynamic_data(intent, language)
-                if dynamic_data:
-                    response = {
-                        'text': {
-                            'intro': GalleryResponses.DYNAMIC_RESPONSES['popular_photos'][language],
-                            'text': dynamic_data,
-                            'outro': "Ada yang ingin ditanyakan lagi? 😊"
-                        },
-                        'isDynamic': True
-                    }
-                    print(f"Dynamic response: {response}")  # Debug log
-                    return response
-            
-            # Handle greeting intent
-            if intent == 'greeting':
-                greeting_response = random.choice(GalleryResponses.GENERAL_RESPONSES['greeting'][language])
-                response = {'text': greeting_response}
-                print(f"Greeting response: {response}")  # Debug log
-                return response
-            
-            # Handle about intent
-            if intent == 'about':
-                about_response = GalleryResponses.RESPONSES['about'][language]['text']
-                response = {'text': about_response}
-                print(f"About response: {response}")  # Debug log
-                return response
-            
-            # Handle casual intent
-            if intent == 'casual':
-                casual_responses = GalleryResponses.RESPONSES['casual'][language]['text']
-                casual_response = random.choice(casual_responses)
-                response = {'text': casual_response}
-                print(f"Casual response: {response}")  # Debug log
-                return response
 
-            # Default response if no specific intent is matched
-            default_response = {'text': GalleryResponses.GENERAL_RESPONSES['not_understood'][language]}
-            print(f"Default response: {default_response}")  # Debug log
-            return default_response
+            response = self._respond(analysis)
+            self._log_interaction(session_id, query, response, analysis)
+            return response
 
         except Exception as e:
             print(f"Error processing query: {str(e)}")
             return {'text': GalleryResponses.get_error_response(language)}
 
+    def _respond(self, analysis):
+        """
+        Memilih respons berdasarkan intent dan bahasa. Hanya memakai tahap
+        analisis RESPONSE; sentiment dan entitas diisi belakangan oleh enrichment.
+        """
+        language = analysis['language']
+        intent = analysis['intent']
+        
+        # Handle popular photos intent
+        if intent == 'popular_photos':
+            dynamic_data = self._get_dynamic_data(intent, language)
+            if dynamic_data:
+                response = {
+                    'text': {
+                        'intro': GalleryResponses.DYNAMIC_RESPONSES['popular_photos'][language],
+                        'text': dynamic_data,
+                        'outro': "Ada yang ingin ditanyakan lagi? 😊"
+                    },
+                    'isDynamic': True
+                }
+                print(f"Dynamic response: {response}")  # Debug log
+                return response
+        
+        # Handle greeting intent
+        if intent == 'greeting':
+            greeting_response = random.choice(GalleryResponses.GENERAL_RESPONSES['greeting'][language])
+            response = {'text': greeting_response}
+            print(f"Greeting response: {response}")  # Debug log
+            return response
+        
+        # Handle about intent
+        if intent == 'about':
+            about_response = GalleryResponses.RESPONSES['about'][language]['text']
+            response = {'text': about_response}
+            print(f"About response: {response}")  # Debug log
+            return response
+        
+        # Handle casual intent
+        if intent == 'casual':
+            casual_responses = GalleryResponses.RESPONSES['casual'][language]['text']
+            casual_response = random.choice(casual_responses)
+            response = {'text': casual_response}
+            print(f"Casual response: {response}")  # Debug log
+            return response
+
+        # Default response if no specific intent is matched
+        default_response = {'text': GalleryResponses.GENERAL_RESPONSES['not_understood'][language]}
+        print(f"Default response: {default_response}")  # Debug log
+        return default_response
+
     def _generate_response(self, query, analysis, context):
         """Generate contextual response"""
         language = analysis['language']
@@ -209,18 +234,19 @@ class GalleryAssistantService:
             )
 
     def _log_interaction(self, session_id, query, response, analysis):
-        """Log interaction for analytics"""
+        """Log interaction for analytics; sentiment dan entitas diisi oleh enrichment"""
         try:
-            InteractionLog.objects.create(
+            answer = response['text']
+            log = InteractionLog.objects.create(
                 session_id=session_id,
                 question=query,
-                answer=response['text'],
+                answer=answer if isinstance(answer, str) else json.dumps(answer, ensure_ascii=False, default=str),
                 language=analysis['language'],
-                sentiment=analysis['sentiment']['label'],
                 intent=analysis['intent'],
                 confidence_score=analysis.get('confidence', 0.0),
                 is_helpful=self._estimate_helpfulness(response)
             )
+            schedule_enrichment(log.pk, self.ai_core)
         except Exception as e:
             print(f"Error logging interaction: {str(e)}")
 
@@ -1,3 +1,5 @@
+import threading
+
 from django.apps import AppConfig
 
 class AssistantConfig(AppConfig):
@@ -5,7 +7,22 @@ class AssistantConfig(AppConfig):
     name = 'assistant'
     
     def ready(self):
-        """Initialize AI service when Django starts"""
-        from .ai_services import GalleryAssistantService
-        # Initialize the service
-        GalleryAssistantService()
\ No newline at end of file
+        """
+        Model AI tidak dimuat saat startup; setiap model dimuat saat pertama
+        dipakai (lihat `assistant.model_registry`). Jika `ASSISTANT_AI['PRELOAD']`
+        aktif, model dimuat di background thread agar request pertama tidak
+        menunggu.
+        """
+        from .model_registry import get_assistant_ai_settings, models_enabled, running_management_command
+
+        if get_assistant_ai_settings()['PRELOAD'] and models_enabled() and not running_management_command():
+            threading.Thread(target=preload_models, name='assistant-warmup', daemon=True).start()
+
+
+def preload_models():
+    from .ai_core import registry
+    from .model_registry import ModelsUnavailable
+    try:
+        registry.warmup()
+    except ModelsUnavailable:
+        pass  # Sudah dicatat oleh registry; model dicoba lagi saat dipakai
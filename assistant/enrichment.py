@@ -0,0 +1,99 @@
+# assistant/enrichment.py - Sentiment dan NER untuk InteractionLog di luar request
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .ai_core import ENRICHMENT
+from .model_registry import get_assistant_ai_settings
+from .models import InteractionLog
+
+logger = logging.getLogger(__name__)
+
+
+def enrich_interaction(log_id, ai_core):
+    """
+    Menjalankan tahap analisis ENRICHMENT (sentiment, entitas) untuk satu
+    InteractionLog dan menyimpan hasilnya.
+
+    Args:
+        log_id (int): ID InteractionLog.
+        ai_core (GalleryAICore): Core AI (lokal atau klien inference worker).
+
+    Returns:
+        bool: True jika log diperbarui; False jika log tidak ada atau model
+            tidak tersedia (log dibiarkan tanpa enrichment).
+    """
+    question = InteractionLog.objects.filter(pk=log_id).values_list('question', flat=True).first()
+    if question is None:
+        return False
+
+    analysis = ai_core.analyze_text(question, consumers=(ENRICHMENT,))
+    if analysis.get('degraded'):
+        logger.info(f"Skipping enrichment of interaction {log_id}: assistant models unavailable")
+        return False
+
+    InteractionLog.objects.filter(pk=log_id).update(
+        sentiment=analysis['sentiment']['label'][:20],
+        entities=analysis['entities'],
+        enriched_at=timezone.now(),
+    )
+    return True
+
+
+def _enrich_in_worker(log_id, ai_core):
+    # Koneksi database milik thread worker tidak dipakai ulang
+    close_old_connections()
+    try:
+        enrich_interaction(log_id, ai_core)
+    except Exception as e:
+        logger.error(f"Error enriching interaction {log_id}: {str(e)}", exc_info=True)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_enrichment_executor():
+    """
+    Thread pool (`ASSISTANT_AI['ENRICHMENT_WORKERS']`) untuk enrichment di luar
+    request. Dibuat ulang per proses setelah fork.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_assistant_ai_settings()['ENRICHMENT_WORKERS'],
+                    thread_name_prefix='assistant-enrichment',
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def schedule_enrichment(log_id, ai_core):
+    """
+    Menjadwalkan enrichment InteractionLog setelah transaksi aktif di-commit.
+
+    Tidak melakukan apa pun jika `ASSISTANT_AI['ENRICHMENT']` False. Jika
+    `ENRICHMENT_ASYNC` False, enrichment dijalankan langsung (misalnya saat
+    testing).
+    """
+    options = get_assistant_ai_settings()
+    if not options['ENRICHMENT']:
+        return
+
+    def submit():
+        if options['ENRICHMENT_ASYNC']:
+            get_enrichment_executor().submit(_enrich_in_worker, log_id, ai_core)
+        else:
+            enrich_interaction(log_id, ai_core)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,203 @@
+# assistant/inference.py - Klien inference worker assistant (Unix socket)
+#
+# Protokol: setiap pesan adalah frame `<panjang 4 byte big-endian><JSON UTF-8>`.
+#   request : {"op": "analyze", "text": "...", "consumers": ["enrichment"]} | {"op": "suggest", "text": "...", "language": "id"} | {"op": "ping"}
+#   response: {"ok": true, "result": ...} | {"ok": false, "error": "..."}
+# Satu koneksi dapat mengirim beberapa request berurutan.
+
+import json
+import logging
+import socket
+import struct
+import threading
+import time
+
+from .ai_core import RESPONSE, GalleryAICore, stages_for
+from .model_registry import get_assistant_ai_settings
+
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 1024 * 1024
+
+
+class InferenceUnavailable(RuntimeError):
+    """Inference worker tidak dapat dihubungi atau gagal menjawab."""
+
+
+class ProtocolError(ValueError):
+    """Frame tidak valid."""
+
+
+def encode_frame(message):
+    payload = json.dumps(message, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if len(payload) > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame too large ({len(payload)} bytes)")
+    return HEADER.pack(len(payload)) + payload
+
+
+def decode_payload(payload):
+    try:
+        message = json.loads(payload.decode('utf-8'))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ProtocolError(f"Invalid frame: {e}") from e
+    if not isinstance(message, dict):
+        raise ProtocolError("Frame must be a JSON object")
+    return message
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("Connection closed by inference worker")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def read_frame(sock):
+    """
+    Membaca satu frame dari socket blocking.
+
+    Returns:
+        dict: Pesan yang sudah di-decode.
+    """
+    (size,) = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+    if size > MAX_FRAME_SIZE:
+        raise ProtocolError(f"Frame too large ({size} bytes)")
+    return decode_payload(_recv_exactly(sock, size))
+
+
+class InferenceClient:
+    """
+    Klien sinkron untuk inference worker.
+
+    Setiap thread memakai koneksinya sendiri yang dipakai ulang antar request.
+    Jika worker tidak dapat dihubungi atau melewati `timeout`, klien berhenti
+    mencoba selama `retry_after` detik agar request berikutnya langsung memakai
+    mode degradasi tanpa menunggu timeout lagi.
+
+    Args:
+        socket_path (str): Path Unix socket worker.
+        timeout (float): Batas waktu per request (detik).
+        retry_after (float): Jeda sebelum mencoba worker lagi setelah gagal.
+    """
+    def __init__(self, socket_path, timeout=2.0, retry_after=5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._local = threading.local()
+        self._unavailable_until = 0.0
+
+    def _connection(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            self._local.sock = None
+            sock.close()
+
+    def request(self, op, **params):
+        """
+        Mengirim satu request dan menunggu jawabannya.
+
+        Returns:
+            Hasil request dari worker.
+
+        Raises:
+            InferenceUnavailable: Jika worker tidak tersedia, timeout, atau
+                mengembalikan error.
+        """
+        if time.monotonic() < self._unavailable_until:
+            raise InferenceUnavailable("Inference worker recently unavailable")
+
+        try:
+            frame = encode_frame({'op': op, **params})
+        except ProtocolError as e:
+            raise InferenceUnavailable(str(e)) from e
+        deadline = time.monotonic() + self.timeout
+        for attempt in (1, 2):
+            try:
+                sock = self._connection()
+                sock.settimeout(max(deadline - time.monotonic(), 0.001))
+                sock.sendall(frame)
+                reply = read_frame(sock)
+                break
+            except (ConnectionError, BrokenPipeError) as e:
+                # Koneksi lama mungkin ditutup worker (restart); coba sekali lagi
+                self.close()
+                if attempt == 2 or time.monotonic() >= deadline:
+                    return self._fail(op, e)
+            except (OSError, ProtocolError) as e:
+                self.close()
+                return self._fail(op, e)
+
+        if not reply.get('ok'):
+            raise InferenceUnavailable(reply.get('error') or 'Inference failed')
+        return reply.get('result')
+
+    def _fail(self, op, error):
+        self._unavailable_until = time.monotonic() + self.retry_after
+        logger.warning(f"Inference worker unavailable for {op}: {str(error)}")
+        raise InferenceUnavailable(str(error)) from error
+
+
+class RemoteAICore(GalleryAICore):
+    """
+    `GalleryAICore` yang meneruskan pekerjaan model ke inference worker.
+
+    Proses web tidak memuat model sama sekali. Analisis yang butuh tahap
+    bermodel (intent, sentiment, entitas) dikirim ke worker; analisis tanpa
+    tahap bermodel dijalankan langsung di proses ini. Jika worker tidak
+    tersedia, intent diambil dari automaton kata kunci, tahap bermodel lain
+    mendapat nilai default (`degraded`), dan saran pertanyaan memakai daftar
+    default.
+    """
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def analyze_batch(self, texts, consumers=(RESPONSE,)):
+        if not any(stage.uses_models for stage in stages_for(consumers)):
+            return super().analyze_batch(texts, consumers)
+        try:
+            return [
+                self.client.request('analyze', text=text, consumers=list(consumers))
+                for text in texts
+            ]
+        except InferenceUnavailable:
+            return super().analyze_batch(texts, consumers)
+
+    def get_suggested_questions(self, text, language):
+        try:
+            return self.client.request('suggest', text=text, language=language)
+        except InferenceUnavailable:
+            return super().get_suggested_questions(text, language)
+
+
+def get_ai_core():
+    """
+    `GalleryAICore` sesuai `ASSISTANT_AI['INFERENCE']`: model di proses ini
+    ('local') atau klien inference worker ('worker').
+    """
+    options = get_assistant_ai_settings()
+    if options['INFERENCE'] == 'worker':
+        return RemoteAICore(InferenceClient(
+            options['SOCKET_PATH'],
+            timeout=options['TIMEOUT'],
+            retry_after=options['RETRY_AFTER'],
+        ))
+    return GalleryAICore()
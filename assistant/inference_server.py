@@ -0,0 +1,180 @@
+# assistant/inference_server.py - Inference worker: satu proses yang memegang model AI
+#
+# Dijalankan lewat `manage.py run_inference_worker`. Proses web (gunicorn)
+# terhubung lewat Unix socket memakai protokol di assistant.inference.
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .ai_core import RESPONSE
+from .inference import HEADER, MAX_FRAME_SIZE, ProtocolError, decode_payload, encode_frame
+
+logger = logging.getLogger(__name__)
+
+
+def run_analyze(core, requests):
+    # Request dengan consumers yang sama dianalisis dalam satu batch
+    groups = {}
+    for index, request in enumerate(requests):
+        consumers = tuple(sorted(request.get('consumers') or [RESPONSE]))
+        groups.setdefault(consumers, []).append(index)
+
+    results = [None] * len(requests)
+    for consumers, indexes in groups.items():
+        analyses = core.analyze_batch([requests[index]['text'] for index in indexes], consumers)
+        for index, analysis in zip(indexes, analyses):
+            results[index] = analysis
+    return results
+
+
+def run_suggest(core, requests):
+    return core.get_suggested_questions_batch(
+        [request['text'] for request in requests],
+        [request.get('language', 'id') for request in requests],
+    )
+
+
+# Operasi yang dijalankan secara batch: op -> fungsi(core, daftar request)
+BATCH_HANDLERS = {
+    'analyze': run_analyze,
+    'suggest': run_suggest,
+}
+
+
+class InferenceServer:
+    """
+    Server asyncio di Unix socket yang mengumpulkan request bersamaan menjadi
+    batch.
+
+    Setiap operasi punya antrean sendiri. Batcher mengambil request pertama,
+    menunggu paling lama `max_batch_wait` detik untuk request lain (hingga
+    `max_batch_size`), lalu menjalankan satu batch di thread inference. Selama
+    batch berjalan, request baru menumpuk di antrean dan masuk ke batch
+    berikutnya, sehingga ukuran batch mengikuti beban.
+
+    Model hanya dipakai dari satu thread inference; event loop tetap melayani
+    koneksi selama batch berjalan.
+
+    Args:
+        core (GalleryAICore): Core AI yang memegang model.
+        socket_path (str): Path Unix socket.
+        max_batch_size (int): Jumlah request maksimum per batch.
+        max_batch_wait (float): Waktu tunggu maksimum untuk mengisi batch (detik).
+    """
+    def __init__(self, core, socket_path, max_batch_size=16, max_batch_wait=0.005):
+        self.core = core
+        self.socket_path = socket_path
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+        self.queues = {}
+        self.stats = {op: {'requests': 0, 'batches': 0} for op in BATCH_HANDLERS}
+
+    async def serve(self):
+        """
+        Menjalankan server sampai dibatalkan.
+        """
+        self.queues = {op: asyncio.Queue() for op in BATCH_HANDLERS}
+        batchers = [asyncio.create_task(self._run_batches(op)) for op in BATCH_HANDLERS]
+
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            # Socket sisa proses sebelumnya
+            os.unlink(self.socket_path)
+
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"Inference worker listening on {self.socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in batchers:
+                task.cancel()
+            self.executor.shutdown(wait=False)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                (size,) = HEADER.unpack(header)
+                if size > MAX_FRAME_SIZE:
+                    raise ProtocolError(f"Frame too large ({size} bytes)")
+                message = decode_payload(await reader.readexactly(size))
+
+                writer.write(encode_frame(await self._dispatch(message)))
+                await writer.drain()
+        except (ProtocolError, asyncio.IncompleteReadError, ConnectionError) as e:
+            logger.warning(f"Closing inference connection: {str(e)}")
+        finally:
+            writer.close()
+
+    async def _dispatch(self, message):
+        op = message.get('op')
+        if op == 'ping':
+            return {'ok': True, 'result': {'pid': os.getpid(), 'stats': self.stats}}
+        if op not in self.queues:
+            return {'ok': False, 'error': f"Unknown op {op!r}"}
+        if not isinstance(message.get('text'), str):
+            return {'ok': False, 'error': "'text' must be a string"}
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queues[op].put((message, future))
+        try:
+            return {'ok': True, 'result': await future}
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    async def _collect_batch(self, queue):
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_batch_wait
+        while len(batch) < self.max_batch_size:
+            if not queue.empty():
+                batch.append(queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_batches(self, op):
+        handler = BATCH_HANDLERS[op]
+        queue = self.queues[op]
+        loop = asyncio.get_running_loop()
+        while True:
+            # Request yang klien-nya sudah putus tidak perlu dihitung
+            batch = [(message, future) for message, future in await self._collect_batch(queue) if not future.done()]
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self.executor, handler, self.core, [message for message, _ in batch])
+            except Exception as e:
+                logger.error(f"Inference batch {op} failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats[op]['requests'] += len(batch)
+            self.stats[op]['batches'] += 1
+            logger.debug(f"Inference batch {op}: {len(batch)} requests in {time.perf_counter() - started:.3f}s")
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
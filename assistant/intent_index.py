@@ -0,0 +1,167 @@
+# assistant/intent_index.py - Klasifikasi intent dari pola di GalleryResponses.INTENTS
+
+import hashlib
+import os
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+RESPONSES_PATH = Path(__file__).resolve().parent / 'responses.py'
+
+
+class KeywordAutomaton:
+    """
+    Automaton Aho–Corasick untuk mencari semua pola kata kunci dalam satu
+    kali jalan atas teks, tanpa memeriksa pola satu per satu.
+
+    Args:
+        patterns (dict): Label -> daftar pola (huruf kecil).
+    """
+    def __init__(self, patterns):
+        self.labels = list(patterns)
+        self._goto = [{}]
+        # Indeks pola yang berakhir di setiap state (termasuk lewat fail link)
+        self._output = [[]]
+        self._pattern_labels = []
+
+        for label, label_patterns in patterns.items():
+            for pattern in label_patterns:
+                if pattern:
+                    self._add(pattern.lower(), label)
+        self._build_fail_links()
+
+    def _add(self, pattern, label):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._output.append([])
+            state = next_state
+        self._output[state].append(len(self._pattern_labels))
+        self._pattern_labels.append(label)
+
+    def _build_fail_links(self):
+        # Transisi gagal dilipat ke tabel goto (DFA penuh), sehingga pencarian
+        # hanya satu lookup dict per karakter
+        fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in list(self._goto[state].items()):
+                queue.append(next_state)
+                fail[next_state] = self._goto[fail[state]].get(char, 0) if state else 0
+                self._output[next_state] = self._output[next_state] + self._output[fail[next_state]]
+            if state:
+                for char, next_state in self._goto[fail[state]].items():
+                    self._goto[state].setdefault(char, next_state)
+
+    def matches(self, text):
+        """
+        Returns:
+            set: Indeks pola yang muncul di `text` (masing-masing sekali).
+        """
+        found = set()
+        state = 0
+        goto, output = self._goto, self._output
+        for char in text.lower():
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def classify(self, text):
+        """
+        Label dengan pola berbeda terbanyak di `text`; jika seri, label yang
+        lebih dulu di `patterns`.
+
+        Returns:
+            str: Label, atau None jika tidak ada pola yang cocok.
+        """
+        scores = Counter(self._pattern_labels[index] for index in self.matches(text))
+        best_label, best_score = None, 0
+        for label in self.labels:
+            if scores[label] > best_score:
+                best_label, best_score = label, scores[label]
+        return best_label
+
+
+def responses_digest(model_name):
+    """
+    Hash isi responses.py dan nama model; indeks yang tersimpan dibuat ulang
+    jika salah satunya berubah.
+    """
+    digest = hashlib.sha256(RESPONSES_PATH.read_bytes())
+    digest.update(model_name.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class IntentIndex:
+    """
+    Embedding ternormalisasi semua pola intent dalam satu matriks float32
+    (baris = pola). Klasifikasi adalah satu perkalian matriks-vektor:
+    pola dengan cosine similarity tertinggi menentukan intent.
+
+    Args:
+        labels (list): Intent untuk setiap baris matriks.
+        matrix (numpy.ndarray): Matriks (jumlah pola, dimensi) ternormalisasi.
+    """
+    def __init__(self, labels, matrix):
+        self.labels = list(labels)
+        self.matrix = matrix
+
+    @classmethod
+    def build(cls, model, intents):
+        labels, patterns = [], []
+        for intent, intent_patterns in intents.items():
+            for pattern in intent_patterns:
+                labels.append(intent)
+                patterns.append(pattern)
+        matrix = np.ascontiguousarray(normalize_rows(model.encode(patterns)))
+        return cls(labels, matrix)
+
+    @classmethod
+    def load_or_build(cls, model, intents, directory, model_name):
+        """
+        Memuat indeks dari `directory` jika ada untuk hash responses.py saat
+        ini, atau membangun dan menyimpannya.
+        """
+        path = Path(directory) / f'intents-{responses_digest(model_name)}.npz'
+        if path.exists():
+            with np.load(path, allow_pickle=False) as data:
+                return cls(data['labels'].tolist(), np.ascontiguousarray(data['matrix'], dtype=np.float32))
+
+        index = cls.build(model, intents)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Tulis ke file sementara lalu rename agar proses lain tidak membaca file setengah jadi
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, labels=np.array(index.labels), matrix=index.matrix)
+        os.replace(tmp_path, path)
+        return index
+
+    def classify(self, vectors, threshold):
+        """
+        Args:
+            vectors (numpy.ndarray): Embedding teks (dimensi) atau (jumlah teks, dimensi).
+            threshold (float): Similarity minimum agar intent diterima.
+
+        Returns:
+            list: (intent atau None, similarity) per teks.
+        """
+        queries = normalize_rows(np.atleast_2d(vectors))
+        scores = queries @ self.matrix.T
+        best = scores.argmax(axis=1)
+        results = []
+        for row, index in enumerate(best):
+            score = float(scores[row, index])
+            results.append((self.labels[index] if score >= threshold else None, score))
+        return results
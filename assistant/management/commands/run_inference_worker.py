@@ -0,0 +1,63 @@
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assistant.model_registry import ModelsUnavailable, claim_models, get_assistant_ai_settings
+
+
+class Command(BaseCommand):
+    help = 'Run the assistant inference worker that owns the AI models and serves web workers over a Unix socket'
+
+    def add_arguments(self, parser):
+        options = get_assistant_ai_settings()
+        parser.add_argument(
+            '--socket',
+            default=options['SOCKET_PATH'],
+            help='Unix socket path (default: ASSISTANT_AI["SOCKET_PATH"])'
+        )
+        parser.add_argument(
+            '--max-batch-size',
+            type=int,
+            default=options['MAX_BATCH_SIZE'],
+            help='Maximum requests per inference batch'
+        )
+        parser.add_argument(
+            '--max-batch-wait',
+            type=float,
+            default=options['MAX_BATCH_WAIT'],
+            help='Seconds to wait for more requests before running a batch'
+        )
+        parser.add_argument(
+            '--no-warmup',
+            action='store_true',
+            help='Load models on first request instead of at startup'
+        )
+
+    def handle(self, *args, **options):
+        if not get_assistant_ai_settings()['ENABLED']:
+            raise CommandError("Assistant AI is disabled (ASSISTANT_AI['ENABLED'])")
+        claim_models()
+
+        from assistant.ai_core import GalleryAICore, registry
+        from assistant.inference_server import InferenceServer
+
+        if not options['no_warmup']:
+            # Model dimuat sebelum socket dibuka; selama itu proses web
+            # memakai mode kata kunci
+            try:
+                for name, stats in registry.warmup().items():
+                    self.stdout.write(f"Loaded {name} in {stats.get('seconds', 0):.2f}s")
+            except ModelsUnavailable as e:
+                raise CommandError(str(e))
+
+        server = InferenceServer(
+            GalleryAICore(),
+            options['socket'],
+            max_batch_size=options['max_batch_size'],
+            max_batch_wait=options['max_batch_wait'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Inference worker listening on {options['socket']}"))
+        try:
+            asyncio.run(server.serve())
+        except KeyboardInterrupt:
+            self.stdout.write("Inference worker stopped")
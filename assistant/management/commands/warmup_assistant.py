@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from assistant.model_registry import ModelsUnavailable, claim_models, current_rss
+
+
+def _mb(value):
+    return value / 2 ** 20
+
+
+class Command(BaseCommand):
+    help = 'Load the assistant AI models ahead of time and report load time and RSS per model'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            help='Models to load (default: all registered models)'
+        )
+
+    def handle(self, *args, **options):
+        claim_models()
+        rss_start = current_rss()
+        started = time.perf_counter()
+        from assistant.ai_core import registry
+        self.stdout.write(
+            f"Imported assistant.ai_core in {time.perf_counter() - started:.2f}s, "
+            f"RSS {_mb(rss_start):.0f} -> {_mb(current_rss()):.0f} MB"
+        )
+
+        unknown = set(options['models']) - set(registry.names)
+        if unknown:
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown))} (available: {', '.join(registry.names)})")
+
+        for name in options['models'] or registry.names:
+            try:
+                stats = registry.warmup([name])[name]
+            except ModelsUnavailable as e:
+                raise CommandError(str(e))
+            if not stats:
+                self.stdout.write(f"{name}: already loaded")
+                continue
+            self.stdout.write(
+                f"{name}: {stats['seconds']:.2f}s, "
+                f"RSS {_mb(stats['rss_before']):.0f} -> {_mb(stats['rss_after']):.0f} MB "
+                f"(+{_mb(stats['rss_after'] - stats['rss_before']):.0f} MB)"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Total {time.perf_counter() - started:.2f}s, "
+            f"RSS {_mb(rss_start):.0f} -> {_mb(current_rss()):.0f} MB"
+        ))
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assistant', '0002_interactionlog_assistantcontext_conversation_history_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interactionlog',
+            name='enriched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interactionlog',
+            name='entities',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='interactionlog',
+            name='sentiment',
+            field=models.CharField(blank=True, default='', max_length=20),
+        ),
+    ]
@@ -0,0 +1,210 @@
+# assistant/model_registry.py - Registry model AI yang dimuat saat pertama dipakai
+
+import logging
+import os
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ASSISTANT_AI_SETTINGS = {
+    'ENABLED': True,
+    'SKIP_FOR_COMMANDS': True,
+    'ALLOWED_COMMANDS': ['runserver'],
+    'PRELOAD': False,
+    'INTENT_THRESHOLD': 0.6,
+    # Inference di proses terpisah (lihat assistant.inference)
+    'INFERENCE': 'local',
+    'SOCKET_PATH': '/tmp/gallery-assistant.sock',
+    'TIMEOUT': 2.0,
+    'RETRY_AFTER': 5.0,
+    'MAX_BATCH_SIZE': 16,
+    'MAX_BATCH_WAIT': 0.005,
+    # Sentiment/NER untuk InteractionLog (lihat assistant.enrichment)
+    'ENRICHMENT': True,
+    'ENRICHMENT_ASYNC': True,
+    'ENRICHMENT_WORKERS': 1,
+}
+
+
+def get_assistant_ai_settings():
+    return {**DEFAULT_ASSISTANT_AI_SETTINGS, **getattr(settings, 'ASSISTANT_AI', {})}
+
+
+class ModelsUnavailable(RuntimeError):
+    """Model AI dimatikan lewat settings atau gagal dimuat."""
+
+
+_owns_models = False
+
+
+def claim_models():
+    """
+    Menandai proses ini sebagai pemilik model (inference worker atau
+    `warmup_assistant`), sehingga model boleh dimuat walaupun
+    `ASSISTANT_AI['INFERENCE']` adalah 'worker'.
+    """
+    global _owns_models
+    _owns_models = True
+
+
+def running_management_command():
+    """
+    Nama management command yang sedang berjalan (`manage.py <command>`),
+    atau None jika proses bukan management command (misalnya worker gunicorn).
+    """
+    if len(sys.argv) > 1 and os.path.basename(sys.argv[0]) in ('manage.py', 'django-admin', 'django-admin.py'):
+        return sys.argv[1]
+    return None
+
+
+def models_enabled():
+    """
+    True jika proses ini boleh memuat model AI.
+
+    Model tidak dimuat jika `ASSISTANT_AI['ENABLED']` False, jika inference
+    dijalankan di proses terpisah (`INFERENCE = 'worker'`) dan proses ini
+    bukan worker tersebut, atau jika proses adalah management command
+    (migrate, shell, ...) yang tidak ada di `ALLOWED_COMMANDS` selama
+    `SKIP_FOR_COMMANDS` aktif.
+    """
+    options = get_assistant_ai_settings()
+    if not options['ENABLED']:
+        return False
+    if _owns_models:
+        return True
+    if options['INFERENCE'] == 'worker':
+        return False
+    command = running_management_command()
+    if command and options['SKIP_FOR_COMMANDS'] and command not in options['ALLOWED_COMMANDS']:
+        return False
+    return True
+
+
+def current_rss():
+    """
+    Resident set size proses saat ini dalam byte (0 jika tidak dapat dibaca).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # ru_maxrss adalah puncak RSS (KB di Linux, byte di macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return 0
+
+
+class ModelRegistry:
+    """
+    Registry model AI yang dimuat saat pertama kali dibutuhkan.
+
+    Setiap model punya lock sendiri sehingga beberapa thread yang meminta
+    model yang sama hanya memuatnya sekali, sementara model lain tetap dapat
+    dimuat secara paralel. Waktu muat dan pertambahan RSS setiap model dicatat
+    di `load_stats`.
+    """
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._locks = {}
+        # Waktu (monotonic) kegagalan muat terakhir per model
+        self._failed_at = {}
+        self.load_stats = {}
+
+    def register(self, name, loader):
+        """
+        Args:
+            name (str): Nama model, misalnya 'sentiment'.
+            loader (callable): Fungsi tanpa argumen yang mengembalikan model.
+        """
+        self._loaders[name] = loader
+        self._locks.setdefault(name, threading.Lock())
+
+    @property
+    def names(self):
+        return list(self._loaders)
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        """
+        Mengembalikan model, memuatnya lebih dulu jika belum dimuat.
+
+        Raises:
+            ModelsUnavailable: Jika model AI dimatikan untuk proses ini atau
+                gagal dimuat.
+        """
+        try:
+            return self._models[name]
+        except KeyError:
+            pass
+
+        if not models_enabled():
+            raise ModelsUnavailable(f"Assistant model '{name}' is disabled in this process")
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+
+            # Setelah gagal, model tidak dicoba dimuat lagi selama RETRY_AFTER
+            # detik agar setiap request tidak mengulang import yang gagal
+            failed_at = self._failed_at.get(name)
+            if failed_at is not None and time.monotonic() - failed_at < get_assistant_ai_settings()['RETRY_AFTER']:
+                raise ModelsUnavailable(f"Assistant model '{name}' failed to load recently")
+
+            rss_before = current_rss()
+            started = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+            except Exception as e:
+                self._failed_at[name] = time.monotonic()
+                logger.error(f"Failed to load assistant model {name}: {str(e)}")
+                raise ModelsUnavailable(f"Assistant model '{name}' could not be loaded") from e
+
+            stats = {
+                'seconds': time.perf_counter() - started,
+                'rss_before': rss_before,
+                'rss_after': current_rss(),
+            }
+            self.load_stats[name] = stats
+            self._failed_at.pop(name, None)
+            self._models[name] = model
+            logger.info(
+                f"Loaded assistant model {name} in {stats['seconds']:.2f}s "
+                f"(RSS +{(stats['rss_after'] - rss_before) / 2 ** 20:.0f} MB)"
+            )
+            return model
+
+    def warmup(self, names=None):
+        """
+        Memuat model (default: semua) lebih awal.
+
+        Returns:
+            dict: Nama model -> statistik muat (kosong jika sudah dimuat sebelumnya).
+        """
+        results = {}
+        for name in names or self.names:
+            already_loaded = self.is_loaded(name)
+            self.get(name)
+            results[name] = {} if already_loaded else self.load_stats[name]
+        return results
+
+    def unload(self, name=None):
+        """
+        Melepas model (default: semua) agar memorinya dapat dibebaskan.
+        """
+        for model_name in [name] if name else self.names:
+            with self._locks[model_name]:
+                self._models.pop(model_name, None)
+
+
+registry = ModelRegistry()
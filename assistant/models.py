@@ -36,7 +36,10 @@ class InteractionLog(models.Model):
     question = models.TextField()
     answer = models.TextField()
     language = models.CharField(max_length=10)
-    sentiment = models.CharField(max_length=20)
+    # Sentiment dan entitas diisi belakangan oleh assistant.enrichment
+    sentiment = models.CharField(max_length=20, blank=True, default='')
+    entities = models.JSONField(default=list, blank=True)
+    enriched_at = models.DateTimeField(null=True, blank=True)
     intent = models.CharField(max_length=50)
     confidence_score = models.FloatField()
     is_helpful = models.BooleanField(default=True)
@@ -0,0 +1,92 @@
+# assistant/suggestion_index.py - Embedding pertanyaan yang disarankan per bahasa
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .intent_index import normalize_rows, responses_digest
+
+
+class SuggestionIndex:
+    """
+    Embedding ternormalisasi (float32) `GalleryResponses.SUGGESTED_QUESTIONS`,
+    satu matriks per bahasa.
+
+    Matriks disimpan sebagai file .npy dan dibuka dengan `mmap_mode='r'`,
+    sehingga semua proses yang memakai indeks yang sama berbagi page cache
+    yang sama alih-alih masing-masing menyimpan salinan.
+
+    Args:
+        suggestions (dict): Bahasa -> daftar pertanyaan.
+        matrices (dict): Bahasa -> matriks (jumlah pertanyaan, dimensi).
+        default_language (str): Bahasa yang dipakai jika bahasa tidak dikenal.
+    """
+    def __init__(self, suggestions, matrices, default_language='en'):
+        self.suggestions = suggestions
+        self.matrices = matrices
+        self.default_language = default_language
+
+    @classmethod
+    def load_or_build(cls, model, suggestions, directory, model_name, default_language='en'):
+        """
+        Membuka matriks setiap bahasa dari `directory` (memory-mapped), atau
+        meng-encode dan menyimpannya jika belum ada untuk hash responses.py
+        saat ini.
+        """
+        digest = responses_digest(model_name)
+        directory = Path(directory)
+        matrices = {}
+        for language, questions in suggestions.items():
+            path = directory / f'suggestions-{language}-{digest}.npy'
+            matrix = cls._open(path)
+            if matrix is None or matrix.shape[0] != len(questions):
+                cls._write(path, normalize_rows(model.encode(list(questions))))
+                matrix = cls._open(path)
+            matrices[language] = matrix
+        return cls(suggestions, matrices, default_language)
+
+    @staticmethod
+    def _open(path):
+        try:
+            return np.load(path, mmap_mode='r', allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def _write(path, matrix):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Tulis ke file sementara lalu rename agar proses lain tidak membaca file setengah jadi
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        os.replace(tmp_path, path)
+
+    def rank(self, vectors, languages, limit=3):
+        """
+        Pertanyaan paling mirip untuk setiap teks.
+
+        Args:
+            vectors (numpy.ndarray): Embedding teks (jumlah teks, dimensi).
+            languages (list): Bahasa setiap teks.
+            limit (int): Jumlah pertanyaan per teks.
+
+        Returns:
+            list: Daftar pertanyaan per teks, urut dari yang paling mirip.
+        """
+        queries = normalize_rows(np.atleast_2d(vectors))
+        results = []
+        for query, language in zip(queries, languages):
+            if language not in self.matrices:
+                language = self.default_language
+            questions = self.suggestions[language]
+            scores = self.matrices[language] @ query
+            count = min(limit, len(questions))
+            if count <= 0:
+                results.append([])
+                continue
+            # argpartition memilih `count` teratas tanpa mengurutkan semua skor
+            top = np.argpartition(-scores, count - 1)[:count]
+            top = top[np.argsort(-scores[top])]
+            results.append([questions[index] for index in top])
+        return results
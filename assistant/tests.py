@@ -1,3 +1,103 @@
-from django.test import TestCase
+import tempfile
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from .intent_index import IntentIndex, KeywordAutomaton
 
 # Create your tests here.
+
+
+class StubEncoder:
+    """
+    Encoder tiruan pengganti model sentence-transformers: setiap teks
+    dipetakan ke vektor yang sudah ditentukan.
+    """
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def encode(self, texts):
+        return np.array([self.vectors[text] for text in texts], dtype=np.float32)
+
+
+class KeywordAutomatonTestCase(SimpleTestCase):
+    """
+    Test pencocokan kata kunci Aho–Corasick (`assistant.intent_index.KeywordAutomaton`).
+    """
+    def test_overlapping_patterns_all_match(self):
+        automaton = KeywordAutomaton({
+            'album': ['album', 'bum'],
+            'photo': ['foto', 'fotografer'],
+        })
+
+        matched = {automaton._pattern_labels[index] for index in automaton.matches('Albumnya fotografer')}
+
+        self.assertEqual(len(automaton.matches('Albumnya fotografer')), 4)
+        self.assertEqual(matched, {'album', 'photo'})
+        # Pola yang berakhir di dalam pola lain ditemukan lewat fail link
+        self.assertEqual(len(automaton.matches('xbum')), 1)
+        self.assertEqual(automaton.matches('tidak ada'), set())
+
+    def test_repeated_pattern_counts_once(self):
+        automaton = KeywordAutomaton({
+            'album': ['album'],
+            'photo': ['foto', 'gambar'],
+        })
+
+        # 'album' tiga kali tetap satu pola; 'foto' dan 'gambar' dua pola berbeda
+        self.assertEqual(automaton.classify('album album album foto gambar'), 'photo')
+
+    def test_tie_break_follows_label_order(self):
+        text = 'album foto'
+
+        self.assertEqual(KeywordAutomaton({'album': ['album'], 'photo': ['foto']}).classify(text), 'album')
+        self.assertEqual(KeywordAutomaton({'photo': ['foto'], 'album': ['album']}).classify(text), 'photo')
+        self.assertIsNone(KeywordAutomaton({'album': ['album']}).classify('kategori'))
+
+
+class IntentIndexTestCase(SimpleTestCase):
+    """
+    Test klasifikasi intent berbasis embedding (`assistant.intent_index.IntentIndex`).
+    """
+    def setUp(self):
+        self.encoder = StubEncoder({
+            'halo': [1, 0, 0],
+            'selamat pagi': [2, 0.2, 0],
+            'lihat album': [0, 1, 0],
+        })
+        self.index = IntentIndex.build(self.encoder, {
+            'greeting': ['halo', 'selamat pagi'],
+            'album': ['lihat album'],
+        })
+
+    def test_build_normalizes_pattern_rows(self):
+        self.assertEqual(self.index.labels, ['greeting', 'greeting', 'album'])
+        self.assertEqual(self.index.matrix.dtype, np.float32)
+        np.testing.assert_allclose(np.linalg.norm(self.index.matrix, axis=1), 1, rtol=1e-6)
+
+    def test_classify_above_threshold(self):
+        [(intent, score)] = self.index.classify(np.array([0, 3, 0]), threshold=0.8)
+
+        self.assertEqual(intent, 'album')
+        self.assertAlmostEqual(score, 1.0, places=5)
+
+    def test_classify_below_threshold(self):
+        # Similarity tertinggi cos 45° ~ 0.707 (terhadap 'halo')
+        [(intent, score)] = self.index.classify(np.array([1, 0, 1]), threshold=0.8)
+
+        self.assertIsNone(intent)
+        self.assertAlmostEqual(score, 0.7071, places=3)
+
+    def test_classify_batch(self):
+        results = self.index.classify(np.array([[1, 0.1, 0], [0, 0, 1]]), threshold=0.5)
+
+        self.assertEqual([intent for intent, _ in results], ['greeting', None])
+
+    def test_load_or_build_reuses_saved_index(self):
+        with tempfile.TemporaryDirectory() as directory:
+            built = IntentIndex.load_or_build(self.encoder, {'greeting': ['halo']}, directory, 'stub')
+            # Indeks tersimpan dipakai tanpa memanggil encoder lagi
+            loaded = IntentIndex.load_or_build(StubEncoder({}), {'greeting': ['halo']}, directory, 'stub')
+
+        self.assertEqual(loaded.labels, built.labels)
+        np.testing.assert_array_equal(loaded.matrix, built.matrix)
@@ -1,7 +1,11 @@
 # models.py
 
 from django.db import models
-from django.db.models import Max
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from dashboard import counters
+from gallery import versions
+from gallery.ordering import SequenceOrdering
 from django.utils.text import slugify
 
 
@@ -19,38 +23,17 @@ class Category(models.Model):
     sequence_number = models.PositiveIntegerField(blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)  # Menambahkan field created_at
 
+    sequence_order = SequenceOrdering(version_table='categories')  # Urutan kategori (lihat gallery.ordering)
+
     def save(self, *args, **kwargs):
         """
         Override method save untuk mengatur sequence_number secara otomatis
-        saat kategori baru ditambahkan.
+        saat kategori baru ditambahkan (di akhir urutan).
         """
         if self._state.adding:  # Jika objek baru ditambahkan
-            max_sequence_number = Category.objects.aggregate(max_seq=Max('sequence_number'))['max_seq']
-            if max_sequence_number is not None:
-                self.sequence_number = max_sequence_number + 1
-            else:
-                self.sequence_number = 1
+            Category.sequence_order.assign(self)
         super(Category, self).save(*args, **kwargs)
 
-    def delete(self, *args, **kwargs):
-        """
-        Override method delete untuk memastikan sequence_number diubah
-        setelah penghapusan kategori.
-        """
-        super(Category, self).delete(*args, **kwargs)
-        self.restructure_sequence_numbers()
-
-    @staticmethod
-    def restructure_sequence_numbers():
-        """
-        Metode statis untuk mengatur ulang sequence_number semua kategori
-        setelah terjadi penghapusan, memastikan urutan yang konsisten.
-        """
-        categories = Category.objects.all().order_by('sequence_number')
-        for index, category in enumerate(categories, start=1):
-            category.sequence_number = index
-            category.save()
-
     def __str__(self):
         """
         Representasi string dari objek Category, yaitu namanya.
@@ -64,4 +47,21 @@ class Category(models.Model):
         """
         return slugify(self.name)
 
-    
\ No newline at end of file
+
+# Signal untuk memperbarui counter dashboard
+@receiver(post_save, sender=Category)
+def count_category_saved(sender, instance, created, **kwargs):
+    """
+    Memperbarui counter dashboard setelah kategori dibuat.
+    """
+    counters.count_saved('categories', instance, created)
+    versions.bump('categories')
+
+
+@receiver(post_delete, sender=Category)
+def count_category_deleted(sender, instance, **kwargs):
+    """
+    Memperbarui counter dashboard setelah kategori dihapus.
+    """
+    counters.count_deleted('categories', instance)
+    versions.bump('categories')
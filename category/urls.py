@@ -1,7 +1,7 @@
 # urls.py
 
 from django.urls import path
-from .views import CategoryListCreateView, CategoryDetailView, CategoryPublicListView
+from .views import CategoryListCreateView, CategoryDetailView, CategoryPublicListView, CategoryMoveView
 
 urlpatterns = [
     # Endpoint untuk mendapatkan daftar semua kategori atau membuat kategori baru
@@ -12,4 +12,7 @@ urlpatterns = [
     
     # Endpoint untuk mendapatkan daftar semua kategori yang bersifat publik
     path('categories/public/', CategoryPublicListView.as_view(), name='category-public-list'),
+    
+    # Endpoint untuk memindahkan urutan beberapa kategori sekaligus
+    path('categories/move/', CategoryMoveView.as_view(), name='category-move'),
 ]
@@ -6,8 +6,11 @@ from .models import Category
 from .serializers import CategorySerializer
 from users.permissions import AllowAny, IsPetugas
 from gallery.throttles import PetugasRateThrottle
+from gallery.conditional import ConditionalGetMixin
+from gallery.ordering_views import SequenceMoveView
+from gallery.response_cache import CachedResponseMixin
 
-class CategoryPublicListView(generics.ListAPIView):
+class CategoryPublicListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar semua kategori yang bersifat publik.
     
@@ -19,6 +22,7 @@ class CategoryPublicListView(generics.ListAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]  
+    version_tables = ('categories',)
 
     def list(self, request, *args, **kwargs):
         """
@@ -155,8 +159,19 @@ class CategoryDetailView(generics.RetrieveUpdateDestroyAPIView):
         """
         instance = self.get_object()
         instance.delete()
-        Category.restructure_sequence_numbers()  # Panggil metode ini setelah kategori dihapus
         return Response({
             "status": "deleted",
             "data": f"Category dengan id {kwargs['pk']} telah dihapus."
         }, status=status.HTTP_204_NO_CONTENT)
+
+
+class CategoryMoveView(SequenceMoveView):
+    """
+    View untuk memindahkan urutan beberapa kategori sekaligus.
+
+    Body: `{"ids": [...], "after": id}` atau `{"ids": [...], "before": id}`
+    (lihat `gallery.ordering_views.SequenceMoveView`).
+    """
+    queryset = Category.objects.all()
+    permission_classes = [IsPetugas]
+    throttle_classes = [PetugasRateThrottle]
@@ -3,13 +3,14 @@ from django.utils.text import slugify
 from contentblock.models import ContentBlock
 from contentblock.utils import refresh_contentblock_paths
 import os
-from django.conf import settings
+from gallery.media import get_media_store
 
 class Command(BaseCommand):
     help = 'Fix content block image paths and verify file existence'
 
     def handle(self, *args, **options):
         content_blocks = ContentBlock.objects.all()
+        store = get_media_store()
         fixed_count = 0
         missing_count = 0
         
@@ -23,8 +24,7 @@ class Command(BaseCommand):
                 actual_path = block.image.name
                 
                 # Check if file exists
-                full_path = os.path.join(settings.MEDIA_ROOT, actual_path)
-                file_exists = os.path.isfile(full_path)
+                file_exists = store.exists(actual_path)
                 
                 if not file_exists or expected_path != actual_path:
                     self.stdout.write(self.style.WARNING(
@@ -8,6 +8,9 @@ from page.models import Page
 import os
 from django.conf import settings
 from .validators import validate_image_path
+from dashboard import counters
+from gallery import versions
+from gallery.ordering import SequenceOrdering
 
 
 class ContentBlock(models.Model):
@@ -31,6 +34,8 @@ class ContentBlock(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     sequence_number = models.PositiveIntegerField(blank=True, null=True)
 
+    sequence_order = SequenceOrdering(scope=('page',), version_table='content_blocks')  # Urutan per halaman
+
     def save(self, *args, **kwargs):
         """
         Override method save untuk mengatur path upload gambar dan menyimpan instance.
@@ -96,26 +101,23 @@ def set_contentblock_sequence(sender, instance, **kwargs):
         None
     """
     if not instance.pk:  # Hanya untuk instance baru
-        last_sequence = ContentBlock.objects.filter(page=instance.page).aggregate(models.Max('sequence_number'))['sequence_number__max']
-        instance.sequence_number = (last_sequence or 0) + 1
+        ContentBlock.sequence_order.assign(instance)
+
+
+# Signal untuk memperbarui counter dashboard
+@receiver(post_save, sender=ContentBlock)
+def count_contentblock_saved(sender, instance, created, **kwargs):
+    """
+    Memperbarui counter dashboard setelah blok konten dibuat.
+    """
+    counters.count_saved('content_blocks', instance, created)
+    versions.bump('content_blocks')
 
 
 @receiver(post_delete, sender=ContentBlock)
-def reorder_contentblock_sequence(sender, instance, **kwargs):
+def count_contentblock_deleted(sender, instance, **kwargs):
     """
-    Signal handler yang dipanggil setelah ContentBlock dihapus.
-    Mengatur ulang sequence_number untuk semua ContentBlock dalam page yang sama.
-    
-    Args:
-        sender (Model): Model yang mengirim signal.
-        instance (ContentBlock): Instance ContentBlock yang telah dihapus.
-        **kwargs: Argumen kata kunci tambahan.
-    
-    Returns:
-        None
+    Memperbarui counter dashboard setelah blok konten dihapus.
     """
-    content_blocks = ContentBlock.objects.filter(page=instance.page).order_by('sequence_number')
-    for index, block in enumerate(content_blocks):
-        if block.sequence_number != index + 1:
-            block.sequence_number = index + 1
-            block.save(update_fields=['sequence_number'])
+    counters.count_deleted('content_blocks', instance)
+    versions.bump('content_blocks')
@@ -7,7 +7,8 @@ from .views import (
     PublicContentBlockListView, 
     ContentBlockByPages, 
     ContentBlockByPageSlug,
-    ContentBlockDetailView
+    ContentBlockDetailView,
+    ContentBlockMoveView
 )
 
 # Inisialisasi router DefaultRouter dari Django REST Framework
@@ -28,6 +29,9 @@ urlpatterns = [
     # Endpoint untuk mendapatkan detail ContentBlock berdasarkan ID
     path('detail/<int:id>/', ContentBlockDetailView.as_view(), name='contentblock-detail'),
     
+    # Endpoint untuk memindahkan urutan beberapa ContentBlock dalam satu halaman sekaligus
+    path('move/', ContentBlockMoveView.as_view(), name='contentblock-move'),
+    
     # Menyertakan semua URL yang didefinisikan oleh router
     path('', include(router.urls)),
 ]
@@ -1,6 +1,6 @@
 import os, uuid
-from django.conf import settings
 import logging
+from gallery.media import get_media_store
 
 # Mendapatkan instance logger untuk modul ini
 logger = logging.getLogger(__name__)
@@ -10,8 +10,8 @@ def create_contentblock_folders(page_slug):
     """
     Membuat folder untuk ContentBlock berdasarkan slug dari halaman terkait.
 
-    Fungsi ini membuat direktori 'images' di dalam direktori halaman yang diidentifikasi oleh `page_slug`.
-    Jika direktori sudah ada, tidak ada tindakan yang diambil.
+    Fungsi ini menyiapkan folder 'images' di dalam folder halaman yang diidentifikasi oleh `page_slug`
+    pada storage media. Jika folder sudah ada, tidak ada tindakan yang diambil.
 
     Args:
         page_slug (str): Slug dari halaman yang terkait dengan ContentBlock.
@@ -19,16 +19,15 @@ def create_contentblock_folders(page_slug):
     Returns:
         None
     """
-    image_folder = os.path.join(settings.MEDIA_ROOT, 'pages', page_slug, 'images')
-    os.makedirs(image_folder, exist_ok=True)
+    get_media_store().ensure_prefix(f'pages/{page_slug}/images/')
 
 
 def rename_contentblock_folders(old_slug, new_slug):
     """
     Mengganti nama folder ContentBlock saat slug halaman berubah.
 
-    Fungsi ini mengganti nama direktori 'images' dari `old_slug` ke `new_slug`.
-    Jika direktori lama tidak ada, tidak ada tindakan yang diambil.
+    Fungsi ini memindahkan seluruh file di folder 'images' dari `old_slug` ke `new_slug`
+    lewat MediaStore. Jika folder lama tidak ada, tidak ada tindakan yang diambil.
 
     Args:
         old_slug (str): Slug lama dari halaman.
@@ -37,12 +36,7 @@ def rename_contentblock_folders(old_slug, new_slug):
     Returns:
         None
     """
-    base_path = os.path.join(settings.MEDIA_ROOT, 'pages')
-    old_image_folder = os.path.join(base_path, old_slug, 'images')
-    new_image_folder = os.path.join(base_path, new_slug, 'images')
-
-    if os.path.exists(old_image_folder):
-        os.rename(old_image_folder, new_image_folder)
+    get_media_store().move_prefix(f'pages/{old_slug}/images/', f'pages/{new_slug}/images/')
 
 
 def generate_random_filename(extension):
@@ -67,16 +61,17 @@ def generate_unique_filename(filepath):
     Fungsi ini memastikan bahwa nama file yang dihasilkan tidak bentrok dengan file yang sudah ada.
 
     Args:
-        filepath (str): Path lengkap dari file.
+        filepath (str): Path relatif file di storage media.
 
     Returns:
-        str: Path lengkap dengan nama file unik.
+        str: Path relatif dengan nama file unik.
     """
+    store = get_media_store()
     base, extension = os.path.splitext(filepath)
     unique_filename = generate_random_filename(extension)
     unique_filepath = os.path.join(os.path.dirname(filepath), unique_filename)
     
-    while os.path.exists(unique_filepath):
+    while store.exists(unique_filepath):
         unique_filename = generate_random_filename(extension)
         unique_filepath = os.path.join(os.path.dirname(filepath), unique_filename)
     
@@ -102,23 +97,19 @@ def refresh_contentblock_paths(contentblock, new_slug):
         
         # Membuat path relatif baru
         new_relative_path = os.path.join('pages', new_slug, 'images', filename)
-        new_full_path = os.path.join(settings.MEDIA_ROOT, new_relative_path)
-        
-        # Membuat direktori jika belum ada
-        os.makedirs(os.path.dirname(new_full_path), exist_ok=True)
+        old_relative_path = contentblock.image.name
         
         # Jika file ada di lokasi lama, pindahkan ke lokasi baru
-        if hasattr(contentblock.image, 'path') and os.path.isfile(contentblock.image.path):
-            old_path = contentblock.image.path
-            if old_path != new_full_path:
-                os.rename(old_path, new_full_path)
+        # (tidak ada tindakan jika file lama tidak ditemukan)
+        if old_relative_path != new_relative_path:
+            get_media_store().move_many([(old_relative_path, new_relative_path)])
         
         # Memperbarui field image dengan path baru
         contentblock.image.name = new_relative_path
         contentblock.save(update_fields=['image'])
         logger.info(
             f"Updated path for ContentBlock {contentblock.id}: "
-            f"from {contentblock.image.name} to {new_relative_path}"
+            f"from {old_relative_path} to {new_relative_path}"
         )
 
 
@@ -126,7 +117,7 @@ def delete_contentblock_files(contentblock):
     """
     Menghapus file gambar terkait dengan ContentBlock.
 
-    Fungsi ini menghapus file gambar dari sistem file jika ada.
+    Fungsi ini menghapus file gambar dari storage media jika ada.
 
     Args:
         contentblock (ContentBlock): Instance ContentBlock yang file gambarnya akan dihapus.
@@ -134,5 +125,5 @@ def delete_contentblock_files(contentblock):
     Returns:
         None
     """
-    if contentblock.image and os.path.isfile(contentblock.image.path):
-        os.remove(contentblock.image.path)
+    if contentblock.image:
+        get_media_store().delete_many([contentblock.image.name])
@@ -17,11 +17,15 @@ from .utils import (
 import os
 import logging
 from gallery.throttles import AdminRateThrottle
+from gallery.media import get_media_store
+from gallery.conditional import ConditionalGetMixin
+from gallery.ordering_views import SequenceMoveView
+from gallery.response_cache import CachedResponseMixin
 # Mendapatkan instance logger untuk modul ini
 logger = logging.getLogger(__name__)
 
 
-class PublicContentBlockListView(generics.ListAPIView):
+class PublicContentBlockListView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar semua ContentBlock yang bersifat publik.
 
@@ -33,6 +37,7 @@ class PublicContentBlockListView(generics.ListAPIView):
     queryset = ContentBlock.objects.all()
     serializer_class = ContentBlockSerializer
     permission_classes = [AllowAny]
+    version_tables = ('content_blocks', 'users')
 
     def list(self, request, *args, **kwargs):
         """
@@ -199,7 +204,7 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
         """
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
-        old_image_path = instance.image.path if instance.image else None
+        old_image_name = instance.image.name if instance.image else None
         
         # Hash nama file gambar jika ada gambar baru yang diupload
         if 'image' in request.data and request.data['image']:
@@ -212,8 +217,8 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
         
         # Menghapus gambar lama jika ada dan diganti dengan gambar baru
         if 'image' in request.data:
-            if old_image_path and os.path.isfile(old_image_path):
-                os.remove(old_image_path)
+            if old_image_name:
+                get_media_store().delete_many([old_image_name])
         
         contentblock = serializer.save()
         
@@ -289,10 +294,10 @@ class ContentBlockViewSet(viewsets.ModelViewSet):
             None
         """
         delete_contentblock_files(instance)
-        instance.delete()  # Ini akan memicu signal post_delete untuk mengatur ulang sequence_number
+        instance.delete()
 
 
-class ContentBlockByPages(generics.ListAPIView):
+class ContentBlockByPages(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar ContentBlock berdasarkan ID halaman tertentu.
 
@@ -304,6 +309,7 @@ class ContentBlockByPages(generics.ListAPIView):
     queryset = ContentBlock.objects.all()
     serializer_class = ContentBlockSerializer
     permission_classes = [AllowAny]
+    version_tables = ('content_blocks', 'users')
     
     def get_queryset(self):
         """
@@ -339,7 +345,7 @@ class ContentBlockByPages(generics.ListAPIView):
         return Response(response_data)
 
 
-class ContentBlockByPageSlug(generics.ListAPIView):
+class ContentBlockByPageSlug(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar ContentBlock berdasarkan slug halaman tertentu.
 
@@ -349,6 +355,7 @@ class ContentBlockByPageSlug(generics.ListAPIView):
     """
     serializer_class = ContentBlockSerializer
     permission_classes = [AllowAny]
+    version_tables = ('content_blocks', 'pages', 'users')
     
     def get_queryset(self):
         """
@@ -427,3 +434,15 @@ class ContentBlockDetailView(generics.RetrieveAPIView):
                 "message": "Content block not found",
                 "data": None
             }, status=status.HTTP_404_NOT_FOUND)
+
+
+class ContentBlockMoveView(SequenceMoveView):
+    """
+    View untuk memindahkan urutan beberapa ContentBlock dalam satu halaman sekaligus.
+
+    Body: `{"ids": [...], "after": id}` atau `{"ids": [...], "before": id}`
+    (lihat `gallery.ordering_views.SequenceMoveView`).
+    """
+    queryset = ContentBlock.objects.all()
+    permission_classes = [IsAdmin]
+    throttle_classes = [AdminRateThrottle]
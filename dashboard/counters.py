@@ -0,0 +1,172 @@
+# dashboard/counters.py - Counter statistik dashboard berbasis event
+
+import logging
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DashboardCounter
+
+logger = logging.getLogger(__name__)
+
+# Section dashboard beserta counter yang dimilikinya
+SECTION_COUNTERS = {
+    'users': ['total', 'admin', 'petugas'],
+    'categories': ['total'],
+    'albums': ['total', 'active', 'inactive'],
+    'photos': ['total'],
+    'pages': ['total', 'active', 'inactive'],
+    'content_blocks': ['total'],
+}
+
+ACTIVE_BUCKETS = {True: 'active', False: 'inactive'}
+ROLE_BUCKETS = {'admin': 'admin', 'petugas': 'petugas'}
+
+COUNTER_KEYS = [
+    f'{section}.{name}'
+    for section, names in SECTION_COUNTERS.items()
+    for name in names
+]
+
+
+def apply_deltas(deltas):
+    """
+    Menerapkan perubahan counter dengan UPDATE atomik (value = value + delta).
+
+    Counter yang belum ada diabaikan; nilainya akan dibuat oleh rekonsiliasi.
+
+    Args:
+        deltas (dict): key counter -> perubahan nilai.
+    """
+    for key, delta in deltas.items():
+        if delta:
+            DashboardCounter.objects.filter(key=key).update(
+                value=F('value') + delta,
+                updated_at=timezone.now()
+            )
+
+
+def schedule_deltas(deltas):
+    """
+    Menjadwalkan perubahan counter setelah transaksi aktif berhasil di-commit,
+    sehingga save yang di-rollback tidak mengubah counter.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: apply_deltas(deltas))
+
+
+def remember_previous(instance, field, update_fields=None):
+    """
+    Dipanggil dari handler pre_save untuk menyimpan nilai field sebelum save,
+    agar perpindahan bucket (misalnya active -> inactive) bisa dihitung.
+
+    Args:
+        instance (Model): Instance yang akan disimpan.
+        field (str): Nama field yang menentukan bucket.
+        update_fields (frozenset): Argumen update_fields dari save(), jika ada.
+    """
+    if instance._state.adding or instance.pk is None:
+        instance._dashboard_previous = None
+    elif update_fields is not None and field not in update_fields:
+        # Field tidak ikut disimpan, nilainya di database tidak berubah
+        instance._dashboard_previous = getattr(instance, field)
+    else:
+        instance._dashboard_previous = (
+            type(instance).objects.filter(pk=instance.pk).values_list(field, flat=True).first()
+        )
+
+
+def count_saved(section, instance, created, field=None, buckets=None):
+    """
+    Dipanggil dari handler post_save untuk memperbarui counter section.
+
+    Args:
+        section (str): Nama section dashboard, misalnya 'albums'.
+        instance (Model): Instance yang disimpan.
+        created (bool): True jika instance baru dibuat.
+        field (str): Nama field bucket (opsional).
+        buckets (dict): Nilai field -> nama counter bucket.
+    """
+    deltas = {}
+    if created:
+        deltas[f'{section}.total'] = 1
+    if field:
+        current = buckets.get(getattr(instance, field))
+        previous = None if created else buckets.get(getattr(instance, '_dashboard_previous', None))
+        if current != previous:
+            if previous:
+                deltas[f'{section}.{previous}'] = -1
+            if current:
+                deltas[f'{section}.{current}'] = 1
+        instance._dashboard_previous = getattr(instance, field)
+    schedule_deltas(deltas)
+
+
+def count_deleted(section, instance, field=None, buckets=None):
+    """
+    Dipanggil dari handler post_delete untuk memperbarui counter section.
+    """
+    deltas = {f'{section}.total': -1}
+    if field:
+        bucket = buckets.get(getattr(instance, field))
+        if bucket:
+            deltas[f'{section}.{bucket}'] = -1
+    schedule_deltas(deltas)
+
+
+def get_counter_stats():
+    """
+    Membaca seluruh counter dalam satu query dan menyusunnya per section.
+
+    Returns:
+        dict | None: Statistik per section, atau None jika counter belum
+        pernah direkonsiliasi.
+    """
+    values = dict(DashboardCounter.objects.filter(key__in=COUNTER_KEYS).values_list('key', 'value'))
+    if len(values) != len(COUNTER_KEYS):
+        return None
+    return {
+        section: {name: values[f'{section}.{name}'] for name in names}
+        for section, names in SECTION_COUNTERS.items()
+    }
+
+
+def reconcile_counters():
+    """
+    Menghitung ulang seluruh counter dari database dan mengoreksi selisihnya.
+
+    Baris counter dikunci (select_for_update) sebelum penghitungan ulang dan
+    baru dilepas setelah nilai baru ditulis, sehingga delta dari signal
+    (`apply_deltas`) menunggu dan diterapkan di atas hasil rekonsiliasi, bukan
+    ditimpa olehnya.
+
+    Returns:
+        dict: key counter -> selisih yang dikoreksi (hanya counter yang berubah).
+    """
+    from .services import DashboardService
+
+    with transaction.atomic():
+        current = dict(DashboardCounter.objects.select_for_update().values_list('key', 'value'))
+        stats = DashboardService.compute_model_stats()
+        expected = {
+            f'{section}.{name}': stats[section][name]
+            for section, names in SECTION_COUNTERS.items()
+            for name in names
+        }
+        drift = {
+            key: value - current.get(key, 0)
+            for key, value in expected.items()
+            if current.get(key) != value
+        }
+        DashboardCounter.objects.bulk_create(
+            [DashboardCounter(key=key, value=value) for key, value in expected.items()],
+            update_conflicts=True,
+            unique_fields=['key'],
+            update_fields=['value', 'updated_at'],
+        )
+
+    if drift:
+        logger.info(f"Reconciled dashboard counters: {drift}")
+    return drift
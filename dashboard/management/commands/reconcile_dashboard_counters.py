@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from dashboard.counters import reconcile_counters
+import time
+
+
+class Command(BaseCommand):
+    help = 'Recount dashboard counters from the database and correct any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            default=0,
+            help='Keep running and reconcile every N seconds (0 = run once)'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            drift = reconcile_counters()
+            if drift:
+                self.stdout.write(self.style.WARNING(f'Corrected drift: {drift}'))
+            else:
+                self.stdout.write(self.style.SUCCESS('Dashboard counters are consistent'))
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
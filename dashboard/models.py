@@ -1,3 +1,18 @@
 from django.db import models
 
-# Create your models here.
+
+class DashboardCounter(models.Model):
+    """
+    Counter statistik dashboard yang diperbarui secara inkremental oleh signal.
+
+    Fields:
+        key (CharField): Nama counter, misalnya 'albums.active'.
+        value (BigIntegerField): Nilai counter saat ini.
+        updated_at (DateTimeField): Waktu counter terakhir diperbarui.
+    """
+    key = models.CharField(max_length=50, unique=True)
+    value = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.key}: {self.value}"
@@ -26,6 +26,14 @@ class AnalyticsStatsSerializer(serializers.Serializer):
     successful_requests = serializers.IntegerField()
     period_days = serializers.IntegerField()
 
+class DashboardMetaSerializer(serializers.Serializer):
+    """
+    Serializer untuk metadata perhitungan dashboard (waktu eksekusi per section)
+    """
+    timings = serializers.DictField(child=serializers.FloatField())
+    total_ms = serializers.FloatField()
+    generated_at = serializers.DateTimeField()
+
 class DashboardStatsSerializer(serializers.Serializer):
     """
     Serializer utama untuk dashboard statistics
@@ -37,3 +45,4 @@ class DashboardStatsSerializer(serializers.Serializer):
     pages = ModelStatsSerializer()
     content_blocks = ModelStatsSerializer()
     analytics = AnalyticsStatsSerializer()
+    meta = DashboardMetaSerializer(required=False)
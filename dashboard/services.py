@@ -1,3 +1,8 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
@@ -9,40 +14,130 @@ from photo.models import Photo
 from page.models import Page
 from contentblock.models import ContentBlock
 from analytics.models import Analytics
+from .counters import get_counter_stats, reconcile_counters
 
 class DashboardService:
     @staticmethod
     def get_model_stats(model, active_field=None):
         """
-        Mendapatkan statistik dasar untuk model tertentu
+        Mendapatkan statistik dasar untuk model tertentu dalam satu query
+        (COUNT dengan filter kondisional untuk active/inactive)
         """
-        stats = {
-            'total': model.objects.count()
+        aggregates = {
+            'total': Count('pk')
         }
-        
+
         if active_field:
-            stats.update({
-                'active': model.objects.filter(**{active_field: True}).count(),
-                'inactive': model.objects.filter(**{active_field: False}).count()
+            aggregates.update({
+                'active': Count('pk', filter=Q(**{active_field: True})),
+                'inactive': Count('pk', filter=Q(**{active_field: False}))
             })
-            
-        return stats
+
+        return model.objects.aggregate(**aggregates)
+
+    @staticmethod
+    def get_user_stats():
+        """
+        Mendapatkan statistik user per role dalam satu query
+        """
+        return User.objects.aggregate(
+            total=Count('pk'),
+            admin=Count('pk', filter=Q(role='admin')),
+            petugas=Count('pk', filter=Q(role='petugas'))
+        )
 
     @classmethod
-    def get_dashboard_stats(cls):
+    def get_sections(cls):
         """
-        Mengumpulkan semua statistik untuk dashboard
+        Daftar section statistik model beserta fungsi penghitungnya
         """
         return {
-            'users': {
-                'total': User.objects.count(),
-                'admin': User.objects.filter(role='admin').count(),
-                'petugas': User.objects.filter(role='petugas').count()
-            },
-            'categories': cls.get_model_stats(Category),
-            'albums': cls.get_model_stats(Album, 'is_active'),
-            'photos': cls.get_model_stats(Photo),
-            'pages': cls.get_model_stats(Page, 'is_active'),
-            'content_blocks': cls.get_model_stats(ContentBlock),
-            'analytics': Analytics.get_stats(days=30)  # Menggunakan method yang sudah ada
+            'users': cls.get_user_stats,
+            'categories': lambda: cls.get_model_stats(Category),
+            'albums': lambda: cls.get_model_stats(Album, 'is_active'),
+            'photos': lambda: cls.get_model_stats(Photo),
+            'pages': lambda: cls.get_model_stats(Page, 'is_active'),
+            'content_blocks': lambda: cls.get_model_stats(ContentBlock),
         }
+
+    @staticmethod
+    def _timed(func, close_connection=False):
+        started = time.perf_counter()
+        try:
+            return func(), round((time.perf_counter() - started) * 1000, 2)
+        finally:
+            if close_connection:
+                # Koneksi database milik thread worker tidak dipakai ulang
+                connection.close()
+
+    @classmethod
+    def run_sections(cls, sections, workers=None):
+        """
+        Menjalankan fungsi-fungsi section secara paralel di thread pool
+        (`DASHBOARD_STATS_WORKERS`).
+
+        Args:
+            sections (dict): Nama section -> fungsi.
+            workers (int): Jumlah thread (opsional); 1 menjalankan semua
+                section di koneksi (dan transaksi) thread pemanggil.
+
+        Returns:
+            tuple: (hasil per section, waktu eksekusi per section dalam ms)
+        """
+        if workers is None:
+            workers = getattr(settings, 'DASHBOARD_STATS_WORKERS', 4)
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard-stats') as executor:
+                futures = {
+                    name: executor.submit(cls._timed, func, True)
+                    for name, func in sections.items()
+                }
+                results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {name: cls._timed(func) for name, func in sections.items()}
+
+        return (
+            {name: result for name, (result, _) in results.items()},
+            {name: elapsed for name, (_, elapsed) in results.items()}
+        )
+
+    @classmethod
+    def compute_model_stats(cls):
+        """
+        Menghitung statistik model langsung dari database (satu query agregat
+        per tabel). Dipakai untuk rekonsiliasi counter dashboard, sehingga
+        dijalankan berurutan di transaksi pemanggil.
+        """
+        stats, _ = cls.run_sections(cls.get_sections(), workers=1)
+        return stats
+
+    @classmethod
+    def get_dashboard_stats(cls, refresh=False):
+        """
+        Mengumpulkan semua statistik untuk dashboard.
+
+        Statistik model dibaca dari counter yang diperbarui oleh signal
+        (lihat `dashboard.counters`), sehingga biayanya konstan. Jika `refresh`
+        bernilai True atau counter belum pernah diisi, counter direkonsiliasi
+        lebih dulu. Waktu eksekusi tiap bagian dikembalikan pada key `meta`.
+        """
+        started = time.perf_counter()
+        timings = {}
+
+        if refresh:
+            _, timings['reconcile'] = cls._timed(reconcile_counters)
+
+        stats, timings['counters'] = cls._timed(get_counter_stats)
+        if stats is None:
+            _, timings['reconcile'] = cls._timed(reconcile_counters)
+            stats, timings['counters'] = cls._timed(get_counter_stats)
+
+        # Menggunakan method yang sudah ada
+        stats['analytics'], timings['analytics'] = cls._timed(lambda: Analytics.get_stats(days=30))
+        stats['meta'] = {
+            'timings': timings,
+            'total_ms': round((time.perf_counter() - started) * 1000, 2),
+            'generated_at': timezone.now()
+        }
+        return stats
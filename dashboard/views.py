@@ -1,8 +1,6 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from users.permissions import IsAdmin
-from django.core.cache import cache
-from django.conf import settings
 import logging
 
 from .services import DashboardService
@@ -21,6 +19,9 @@ class DashboardStatsView(APIView):
     - Statistik Halaman (pages, content blocks)
     - Statistik Analytics (kunjungan, visitors)
 
+    Statistik model dibaca dari counter yang diperbarui oleh signal
+    post_save/post_delete (lihat `dashboard.counters`).
+
     Permissions:
     - Harus terautentikasi
     - Harus memiliki role admin
@@ -37,7 +38,8 @@ class DashboardStatsView(APIView):
         Mengambil statistik dashboard.
         
         Query Parameters:
-            refresh (bool): Jika True, akan melewati cache
+            refresh (bool): Jika True, counter dashboard akan direkonsiliasi
+                dengan database sebelum dibaca
             
         Returns:
             Response: JSON response berisi statistik dashboard
@@ -46,26 +48,16 @@ class DashboardStatsView(APIView):
             500: Jika terjadi kesalahan dalam mengambil data
         """
         try:
-            # Check if refresh is requested
+            # Check if refresh (rekonsiliasi counter) is requested
             should_refresh = request.query_params.get('refresh', '').lower() == 'true'
             
-            # Try to get from cache first
-            cache_key = 'dashboard_stats'
-            if not should_refresh:
-                cached_stats = cache.get(cache_key)
-                if cached_stats:
-                    return Response(cached_stats)
-            
-            # Get fresh stats
-            stats = DashboardService.get_dashboard_stats()
+            # Statistik dibaca dari counter dashboard yang selalu up to date
+            stats = DashboardService.get_dashboard_stats(refresh=should_refresh)
             
             # Validate with serializer
             serializer = DashboardStatsSerializer(data=stats)
             serializer.is_valid(raise_exception=True)
             
-            # Cache the validated data
-            cache.set(cache_key, serializer.validated_data, timeout=settings.DASHBOARD_CACHE_TIMEOUT)
-            
             logger.info(
                 "Dashboard stats retrieved successfully",
                 extra={
@@ -0,0 +1,229 @@
+# gallery/cache.py - Backend cache lintas proses berbasis SQLite
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    cache_key TEXT PRIMARY KEY,
+    value BLOB,
+    expires REAL
+) WITHOUT ROWID
+"""
+
+
+class SQLiteCache(BaseCache):
+    """
+    Backend cache Django yang disimpan di satu file SQLite (mode WAL, dibaca
+    lewat mmap) sehingga bisa dipakai bersama oleh semua worker gunicorn tanpa
+    layanan eksternal.
+
+    - Setiap key memiliki TTL sendiri (kolom `expires`, NULL = tanpa batas).
+    - Nilai integer disimpan apa adanya sehingga `incr`/`decr` dijalankan
+      atomik di dalam SQLite (dipakai oleh throttle), nilai lain di-pickle.
+    - Entri kedaluwarsa dibersihkan berkala; jika jumlah entri melebihi
+      `MAX_ENTRIES`, sebagian entri yang paling cepat kedaluwarsa dibuang
+      sesuai `CULL_FREQUENCY`.
+
+    Konfigurasi:
+        CACHES = {
+            'default': {
+                'BACKEND': 'gallery.cache.SQLiteCache',
+                'LOCATION': '/path/ke/cache.sqlite3',
+                'OPTIONS': {'MAX_ENTRIES': 10000, 'MMAP_SIZE': 64 * 1024 * 1024},
+            }
+        }
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+    cull_every = 100  # Jumlah operasi tulis antar pembersihan
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = os.path.abspath(location)
+        options = params.get('OPTIONS', {})
+        self._mmap_size = int(options.get('MMAP_SIZE', 64 * 1024 * 1024))
+        self._busy_timeout = float(options.get('BUSY_TIMEOUT', 5.0))
+        self._local = threading.local()
+        self._writes = 0
+
+    # Koneksi
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(f'PRAGMA mmap_size={self._mmap_size}')
+            conn.execute(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _write(self, sql, params=()):
+        conn = self._connection()
+        cursor = conn.execute(sql, params)
+        self._writes += 1
+        if self._writes % self.cull_every == 0:
+            self._cull(conn)
+        return cursor
+
+    def close(self, **kwargs):
+        # Koneksi dipakai ulang antar request; ditutup saat proses berhenti
+        pass
+
+    # Serialisasi
+
+    def _encode(self, value):
+        if type(value) is int:
+            return value
+        return pickle.dumps(value, self.pickle_protocol)
+
+    @staticmethod
+    def _decode(value):
+        if isinstance(value, int):
+            return value
+        return pickle.loads(value)
+
+    def _expires(self, timeout):
+        return self.get_backend_timeout(timeout)
+
+    # API cache
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._write(
+            'INSERT INTO cache_entries (cache_key, value, expires) VALUES (?, ?, ?) '
+            'ON CONFLICT(cache_key) DO UPDATE SET value = excluded.value, expires = excluded.expires '
+            'WHERE cache_entries.expires IS NOT NULL AND cache_entries.expires <= ?',
+            (key, self._encode(value), self._expires(timeout), now)
+        )
+        return cursor.rowcount > 0
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT value FROM cache_entries WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        if row is None:
+            return default
+        return self._decode(row[0])
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        placeholders = ', '.join('?' * len(key_map))
+        rows = self._connection().execute(
+            f'SELECT cache_key, value FROM cache_entries '
+            f'WHERE cache_key IN ({placeholders}) AND (expires IS NULL OR expires > ?)',
+            (*key_map, time.time())
+        ).fetchall()
+        return {key_map[cache_key]: self._decode(value) for cache_key, value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        if timeout == 0:
+            self._write('DELETE FROM cache_entries WHERE cache_key = ?', (key,))
+            return
+        self._write(
+            'INSERT OR REPLACE INTO cache_entries (cache_key, value, expires) VALUES (?, ?, ?)',
+            (key, self._encode(value), self._expires(timeout))
+        )
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout=timeout, version=version)
+        return []
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._write(
+            'UPDATE cache_entries SET expires = ? '
+            'WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+            (self._expires(timeout), key, time.time())
+        )
+        return cursor.rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        # BEGIN IMMEDIATE mengambil write lock sehingga update dan pembacaan
+        # nilai baru terjadi atomik terhadap proses lain
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            cursor = conn.execute(
+                "UPDATE cache_entries SET value = value + ? "
+                "WHERE cache_key = ? AND typeof(value) = 'integer' "
+                "AND (expires IS NULL OR expires > ?)",
+                (delta, key, time.time())
+            )
+            if cursor.rowcount:
+                value = conn.execute(
+                    'SELECT value FROM cache_entries WHERE cache_key = ?', (key,)
+                ).fetchone()[0]
+            else:
+                # Nilai bukan integer (atau key tidak ada): dijumlahkan di Python
+                # seperti backend Django lain, sehingga nilai yang tidak bisa
+                # dijumlahkan menghasilkan TypeError
+                row = conn.execute(
+                    'SELECT value FROM cache_entries WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+                    (key, time.time())
+                ).fetchone()
+                if row is None:
+                    raise ValueError("Key '%s' not found" % key)
+                value = self._decode(row[0]) + delta
+                conn.execute(
+                    'UPDATE cache_entries SET value = ? WHERE cache_key = ?',
+                    (self._encode(value), key)
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return value
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._write('DELETE FROM cache_entries WHERE cache_key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if keys:
+            placeholders = ', '.join('?' * len(keys))
+            self._write(f'DELETE FROM cache_entries WHERE cache_key IN ({placeholders})', keys)
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache_entries WHERE cache_key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entries')
+
+    # Pembersihan
+
+    def _cull(self, conn):
+        conn.execute('DELETE FROM cache_entries WHERE expires IS NOT NULL AND expires <= ?', (time.time(),))
+        count = conn.execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        if count > self._max_entries:
+            if self._cull_frequency == 0:
+                conn.execute('DELETE FROM cache_entries')
+            else:
+                conn.execute(
+                    'DELETE FROM cache_entries WHERE cache_key IN ('
+                    'SELECT cache_key FROM cache_entries ORDER BY expires IS NULL, expires LIMIT ?)',
+                    (count // self._cull_frequency,)
+                )
@@ -0,0 +1,104 @@
+# gallery/conditional.py - Conditional GET (ETag/Last-Modified/304) untuk endpoint publik
+
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+from .versions import get_versions
+
+DEFAULT_CONDITIONAL_SETTINGS = {
+    'MAX_AGE': 0,
+}
+
+
+def get_conditional_settings():
+    return {**DEFAULT_CONDITIONAL_SETTINGS, **getattr(settings, 'CONDITIONAL_GET', {})}
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+class VersionedViewMixin:
+    """
+    Dasar untuk view yang isinya hanya bergantung pada tabel tertentu.
+    Versi tabel (`gallery.versions`) dibaca sekali per request dan dipakai
+    bersama oleh validator HTTP dan cache respons.
+
+    Attributes:
+        version_tables (tuple): Tabel logis yang memengaruhi isi respons,
+            misalnya ('albums', 'photos').
+    """
+    version_tables = ()
+
+    def get_version_tables(self):
+        return self.version_tables
+
+    def get_table_versions(self):
+        if not hasattr(self, '_table_versions'):
+            self._table_versions = get_versions(self.get_version_tables())
+        return self._table_versions
+
+    def get_version_digest(self, request):
+        """
+        Hash dari view, URL lengkap (host dan query string, karena link cursor
+        berisi URL absolut), format renderer dan versi setiap tabel.
+        """
+        parts = [
+            f'{type(self).__module__}.{type(self).__qualname__}',
+            request.build_absolute_uri(),
+            getattr(request.accepted_renderer, 'format', ''),
+            *(f'{table}={version}' for table, version in sorted(self.get_table_versions().items())),
+        ]
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+class ConditionalGetMixin(VersionedViewMixin):
+    """
+    Mixin untuk view GET publik yang menjawab `If-None-Match` /
+    `If-Modified-Since` dengan 304 sebelum queryset dan serializer dijalankan.
+
+    Validator dihitung dari versi tabel yang menjadi sumber data view, tanpa
+    query database:
+
+    - ETag (weak): `get_version_digest`.
+    - Last-Modified: versi terbaru dari tabel di `version_tables`.
+    """
+    def get_validators(self, request):
+        """
+        Returns:
+            tuple: (etag, last_modified dalam detik epoch)
+        """
+        last_modified = max(self.get_table_versions().values(), default=0) // 10 ** 9
+        return f'W/"{self.get_version_digest(request)}"', last_modified
+
+    @staticmethod
+    def is_not_modified(request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or _strip_weak(etag) in {_strip_weak(value) for value in etags}
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and last_modified <= if_modified_since
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=get_conditional_settings()['MAX_AGE'],
+                must_revalidate=True,
+            )
+        return response
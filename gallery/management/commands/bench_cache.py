@@ -0,0 +1,64 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+from gallery.cache import SQLiteCache
+from multiprocessing import Pool
+import os
+import tempfile
+import time
+
+
+def _incr_worker(args):
+    location, key, count = args
+    cache = SQLiteCache(location, {})
+    for _ in range(count):
+        cache.incr(key)
+    return count
+
+
+class Command(BaseCommand):
+    help = 'Benchmark gallery.cache.SQLiteCache against LocMemCache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ops', type=int, default=10000, help='Operations per benchmark')
+        parser.add_argument('--processes', type=int, default=4, help='Processes for the shared incr test')
+
+    def _measure(self, func, ops):
+        started = time.perf_counter()
+        for i in range(ops):
+            func(i)
+        elapsed = time.perf_counter() - started
+        return f'{ops / elapsed:>10,.0f} ops/s  {elapsed / ops * 1e6:>7.1f} us/op'
+
+    def handle(self, *args, **options):
+        ops = options['ops']
+        with tempfile.TemporaryDirectory() as tmp:
+            location = os.path.join(tmp, 'bench.sqlite3')
+            backends = {
+                'locmem': LocMemCache('bench', {'OPTIONS': {'MAX_ENTRIES': ops * 2}}),
+                'sqlite': SQLiteCache(location, {'OPTIONS': {'MAX_ENTRIES': ops * 2}}),
+            }
+
+            for name, cache in backends.items():
+                cache.set('counter', 0, None)
+                payload = {'total': 1, 'active': 1, 'inactive': 0}
+                self.stdout.write(f'{name}:')
+                self.stdout.write(f'  set   {self._measure(lambda i, cache=cache, payload=payload: cache.set(f"k{i}", payload, 300), ops)}')
+                self.stdout.write(f'  get   {self._measure(lambda i, cache=cache: cache.get(f"k{i}"), ops)}')
+                self.stdout.write(f'  miss  {self._measure(lambda i, cache=cache: cache.get(f"missing{i}"), ops)}')
+                self.stdout.write(f'  incr  {self._measure(lambda i, cache=cache: cache.incr("counter"), ops)}')
+
+            # Counter bersama: jumlah akhir harus sama dengan total incr semua proses
+            processes = options['processes']
+            per_process = ops // processes
+            backends['sqlite'].set('shared', 0, None)
+            started = time.perf_counter()
+            with Pool(processes) as pool:
+                pool.map(_incr_worker, [(location, 'shared', per_process)] * processes)
+            elapsed = time.perf_counter() - started
+            total = backends['sqlite'].get('shared')
+            expected = per_process * processes
+            style = self.style.SUCCESS if total == expected else self.style.ERROR
+            self.stdout.write(style(
+                f'sqlite shared incr: {processes} processes, {total}/{expected} increments, '
+                f'{expected / elapsed:,.0f} ops/s'
+            ))
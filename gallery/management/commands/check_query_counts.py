@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from album.models import Album
+from album.views import AlbumByCategoryView, AlbumListCreateView, PublicAlbumListView
+from category.models import Category
+from gallery.querycount import QueryCountDropError, QueryCountGrowthError, assert_constant_queries
+from photo.models import Photo
+from photo.views import PhotoByAlbumView, PhotoListCreateView, PhotoListPublic
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Fail when a photo/album list endpoint runs more queries as the result size grows (N+1)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[5, 25],
+            help='Result sizes to compare (default: 5 25)'
+        )
+
+    def _populate(self, size):
+        # bulk_create dipakai agar signal (folder album, counter dashboard) tidak berjalan
+        existing = len(self.albums)
+        albums = Album.objects.bulk_create([
+            Album(title=f'Query check {i}', category=self.category, created_by=self.user, sequence_number=i)
+            for i in range(existing, size)
+        ])
+        self.albums.extend(albums)
+
+        covers = Photo.objects.bulk_create([
+            Photo(title='cover', description='-', album=album, uploaded_by=self.user,
+                  photo=f'albums/query-check-{album.pk}/cover.jpg', sequence_number=1)
+            for album in albums
+        ])
+        for album, cover in zip(albums, covers):
+            album.cover_photo = cover
+        Album.objects.bulk_update(albums, ['cover_photo'])
+
+        album = self.albums[0]
+        current = Photo.objects.filter(album=album).count()
+        Photo.objects.bulk_create([
+            Photo(title=f'photo {i}', description='-', album=album, uploaded_by=self.user,
+                  photo=f'albums/query-check-{album.pk}/{i}.jpg', sequence_number=i + 1)
+            for i in range(current, size)
+        ])
+
+    def _endpoints(self):
+        return [
+            ('photo-list-public', PhotoListPublic, {}, False),
+            ('photo-list-create', PhotoListCreateView, {}, True),
+            ('photos-by-album', PhotoByAlbumView, {'album_id': lambda: self.albums[0].pk}, False),
+            ('public-album-list', PublicAlbumListView, {}, False),
+            ('album-list-create', AlbumListCreateView, {}, True),
+            ('album-by-category', AlbumByCategoryView, {'category_id': lambda: self.category.pk}, False),
+        ]
+
+    def _call(self, view_class, kwargs, authenticate):
+        def call():
+            request = self.factory.get('/', {'all': 'true'})
+            if authenticate:
+                force_authenticate(request, user=self.user)
+            response = view_class.as_view()(request, **{key: value() for key, value in kwargs.items()})
+            if response.status_code != 200:
+                raise CommandError(f'{view_class.__name__} returned {response.status_code}')
+            return response
+        return call
+
+    def handle(self, *args, **options):
+        self.factory = APIRequestFactory()
+        failures = []
+        not_measured = []
+
+        # Semua data dibuat di dalam transaksi yang selalu di-rollback. Versi
+        # tabel baru dinaikkan on_commit, sehingga cache respons akan
+        # mengembalikan hasil ukuran sebelumnya (dan menyimpan data yang
+        # di-rollback ke cache bersama); cache respons dimatikan di sini.
+        response_cache = {**getattr(settings, 'RESPONSE_CACHE', {}), 'ENABLED': False}
+        with override_settings(RESPONSE_CACHE=response_cache), transaction.atomic():
+            self.user = User.objects.create_user(username='query-check', password=None, role='petugas')
+            self.category = Category.objects.create(name='Query check')
+
+            for name, view_class, kwargs, authenticate in self._endpoints():
+                self.albums = []
+                sid = transaction.savepoint()
+                try:
+                    counts = assert_constant_queries(
+                        name, self._call(view_class, kwargs, authenticate), self._populate, options['sizes']
+                    )
+                    self.stdout.write(self.style.SUCCESS(f'{name}: {counts}'))
+                except QueryCountGrowthError as e:
+                    failures.append(name)
+                    self.stdout.write(self.style.ERROR(str(e)))
+                except QueryCountDropError as e:
+                    not_measured.append(name)
+                    self.stdout.write(self.style.ERROR(str(e)))
+                transaction.savepoint_rollback(sid)
+
+            transaction.set_rollback(True)
+
+        errors = []
+        if failures:
+            errors.append(f"N+1 queries detected in: {', '.join(failures)}")
+        if not_measured:
+            errors.append(f"Queryset not executed for every size in: {', '.join(not_measured)}")
+        if errors:
+            raise CommandError('; '.join(errors))
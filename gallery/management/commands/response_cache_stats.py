@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from gallery.response_cache import metrics
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counts of the public response cache per view'
+
+    def handle(self, *args, **options):
+        stats = metrics.stats()
+        total_hits = total_misses = 0
+        for view_name, entry in stats.items():
+            ratio = '-' if entry['hit_ratio'] is None else f"{entry['hit_ratio']:.1%}"
+            self.stdout.write(f"{view_name}: {entry['hit']} hits, {entry['miss']} misses ({ratio})")
+            total_hits += entry['hit']
+            total_misses += entry['miss']
+
+        total = total_hits + total_misses
+        ratio = f'{total_hits / total:.1%}' if total else '-'
+        self.stdout.write(self.style.SUCCESS(f'Total: {total_hits} hits, {total_misses} misses ({ratio})'))
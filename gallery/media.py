@@ -0,0 +1,389 @@
+# gallery/media.py - Abstraksi penyimpanan media (filesystem lokal / S3-compatible)
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import storages
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEDIA_STORE_SETTINGS = {
+    'BACKEND': 'gallery.media.LocalMediaStore',
+    'STORAGE': 'default',
+    'OPTIONS': {},
+}
+
+COPY_CHUNK_SIZE = 64 * 2 ** 10
+
+
+class MediaStore:
+    """
+    Layanan tunggal untuk seluruh operasi file media (album, foto, halaman,
+    content block). Semua operasi memakai Django Storage API sehingga media
+    dapat dipindahkan dari disk lokal ke object storage tanpa mengubah
+    pemanggil; subclass mengganti operasi batch dengan versi yang lebih cepat
+    untuk backend-nya.
+
+    Semua nama adalah path relatif dengan pemisah '/', sama seperti nilai
+    FileField di database. Prefix "folder" diakhiri dengan '/'.
+
+    Args:
+        storage (Storage): Instance storage Django yang dibungkus.
+        scratch_dir (str): Folder lokal untuk file sementara (upload yang sedang
+            diterima, varian yang sedang dibuat).
+    """
+    def __init__(self, storage, scratch_dir=None):
+        self.storage = storage
+        self.scratch_dir = scratch_dir or os.path.join(
+            getattr(settings, 'FILE_UPLOAD_TEMP_DIR', None) or tempfile.gettempdir(), 'gallery-media'
+        )
+
+    # Operasi satu file
+
+    def exists(self, name):
+        return self.storage.exists(name)
+
+    def open(self, name, mode='rb'):
+        return self.storage.open(name, mode)
+
+    def url(self, name):
+        return self.storage.url(name)
+
+    def get_modified_time(self, name):
+        return self.storage.get_modified_time(name)
+
+    def local_path(self, name):
+        """
+        Path lokal file, atau None jika backend bukan filesystem lokal.
+        """
+        try:
+            return self.storage.path(name)
+        except NotImplementedError:
+            return None
+
+    def temp_path(self, suffix=''):
+        """
+        Path file sementara baru di `scratch_dir` (file belum dibuat).
+        """
+        os.makedirs(self.scratch_dir, exist_ok=True)
+        return os.path.join(self.scratch_dir, f'{uuid.uuid4().hex}{suffix}')
+
+    @contextmanager
+    def local_copy(self, name):
+        """
+        Context manager yang menghasilkan path lokal berisi isi file `name`.
+        Untuk backend remote, file diunduh ke file sementara yang dihapus
+        setelah context selesai.
+        """
+        path = self.local_path(name)
+        if path is not None:
+            yield path
+            return
+
+        path = self.temp_path(os.path.splitext(name)[1])
+        try:
+            with self.storage.open(name, 'rb') as source, open(path, 'wb') as target:
+                for chunk in source.chunks(COPY_CHUNK_SIZE):
+                    target.write(chunk)
+            yield path
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def put_file(self, local_path, name):
+        """
+        Menyimpan file lokal ke storage dengan nama persis `name` (menimpa file
+        yang sudah ada), lalu menghapus file lokal.
+
+        Returns:
+            str: Nama file di storage.
+        """
+        if self.storage.exists(name):
+            self.storage.delete(name)
+        with open(local_path, 'rb') as f:
+            saved = self.storage.save(name, File(f, name=name))
+        os.remove(local_path)
+        return saved
+
+    # Operasi batch
+
+    def list_prefix(self, prefix):
+        """
+        Daftar nama seluruh file yang diawali `prefix` (rekursif).
+        """
+        directory = prefix.rsplit('/', 1)[0] if '/' in prefix else ''
+        return [name for name in self._walk(directory) if name.startswith(prefix)]
+
+    def _walk(self, directory):
+        try:
+            directories, files = self.storage.listdir(directory)
+        except FileNotFoundError:
+            return
+        for filename in files:
+            yield f'{directory}/{filename}' if directory else filename
+        for child in directories:
+            yield from self._walk(f'{directory}/{child}' if directory else child)
+
+    def ensure_prefix(self, prefix):
+        """
+        Menyiapkan "folder". Object storage tidak memiliki folder sehingga
+        implementasi dasar tidak melakukan apa pun.
+        """
+
+    def delete_many(self, names):
+        """
+        Menghapus banyak file sekaligus. Nama yang tidak ada diabaikan.
+
+        Returns:
+            int: Jumlah nama yang diproses.
+        """
+        names = [name for name in names if name]
+        for name in names:
+            self.storage.delete(name)
+        return len(names)
+
+    def move_many(self, pairs):
+        """
+        Memindahkan banyak file sekaligus.
+
+        Args:
+            pairs (list): Pasangan (nama lama, nama baru).
+
+        Returns:
+            int: Jumlah file yang dipindahkan.
+        """
+        moved = []
+        for old, new in pairs:
+            if old == new or not self.storage.exists(old):
+                continue
+            if self.storage.exists(new):
+                self.storage.delete(new)
+            with self.storage.open(old, 'rb') as source:
+                self.storage.save(new, source)
+            moved.append(old)
+        self.delete_many(moved)
+        return len(moved)
+
+    def delete_prefix(self, prefix):
+        """
+        Menghapus seluruh file di bawah `prefix`.
+        """
+        return self.delete_many(self.list_prefix(prefix))
+
+    def move_prefix(self, old_prefix, new_prefix):
+        """
+        Memindahkan seluruh file di bawah `old_prefix` ke `new_prefix`.
+        File dengan nama yang sama di tujuan ditimpa.
+        """
+        return self.move_many([
+            (name, new_prefix + name[len(old_prefix):])
+            for name in self.list_prefix(old_prefix)
+        ])
+
+
+class LocalMediaStore(MediaStore):
+    """
+    MediaStore untuk FileSystemStorage. Pemindahan folder memakai satu rename
+    dan penghapusan folder memakai `shutil.rmtree`. File sementara ditulis di
+    `<MEDIA_ROOT>/.incoming` agar dapat dipindahkan ke lokasi akhirnya dengan
+    rename (tanpa menyalin isi).
+    """
+    def __init__(self, storage, scratch_dir=None):
+        super().__init__(storage, scratch_dir or os.path.join(storage.location, '.incoming'))
+
+    def put_file(self, local_path, name):
+        target = self.storage.path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(local_path, target)
+        return name
+
+    def list_prefix(self, prefix):
+        directory = prefix.rsplit('/', 1)[0] if '/' in prefix else ''
+        root = self.storage.path(directory)
+        names = []
+        for current, _, files in os.walk(root):
+            relative = os.path.relpath(current, self.storage.location).replace(os.sep, '/')
+            for filename in files:
+                name = filename if relative == '.' else f'{relative}/{filename}'
+                if name.startswith(prefix):
+                    names.append(name)
+        return names
+
+    def ensure_prefix(self, prefix):
+        os.makedirs(self.storage.path(prefix), exist_ok=True)
+
+    def delete_many(self, names):
+        deleted = 0
+        for name in names:
+            if not name:
+                continue
+            try:
+                os.remove(self.storage.path(name))
+                deleted += 1
+            except FileNotFoundError:
+                pass
+        return deleted
+
+    def move_many(self, pairs):
+        moved = 0
+        for old, new in pairs:
+            if old == new:
+                continue
+            target = self.storage.path(new)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.replace(self.storage.path(old), target)
+                moved += 1
+            except FileNotFoundError:
+                pass
+        return moved
+
+    def delete_prefix(self, prefix):
+        if not prefix.endswith('/'):
+            return super().delete_prefix(prefix)
+        folder = self.storage.path(prefix)
+        if os.path.isdir(folder):
+            shutil.rmtree(folder)
+        return 1
+
+    def move_prefix(self, old_prefix, new_prefix):
+        if not (old_prefix.endswith('/') and new_prefix.endswith('/')):
+            return super().move_prefix(old_prefix, new_prefix)
+        old_folder = self.storage.path(old_prefix)
+        new_folder = self.storage.path(new_prefix)
+        if not os.path.isdir(old_folder):
+            return 0
+        if not os.path.exists(new_folder):
+            os.makedirs(os.path.dirname(new_folder.rstrip(os.sep)), exist_ok=True)
+            os.rename(old_folder, new_folder)
+            return 1
+
+        logger.warning(f"Media folder {new_prefix} already exists, merging {old_prefix} into it")
+        moved = super().move_prefix(old_prefix, new_prefix)
+        shutil.rmtree(old_folder)
+        return moved
+
+
+class S3MediaStore(MediaStore):
+    """
+    MediaStore untuk storage S3-compatible (AWS S3, MinIO) dari
+    django-storages. Penghapusan batch memakai `DeleteObjects` (maksimal 1000
+    key per request) dan pemindahan memakai copy di sisi server secara paralel,
+    sehingga isi file tidak melewati aplikasi.
+
+    Args:
+        max_workers (int): Jumlah copy paralel saat memindahkan file.
+    """
+    delete_batch_size = 1000
+
+    def __init__(self, storage, scratch_dir=None, max_workers=8):
+        super().__init__(storage, scratch_dir)
+        self.max_workers = max_workers
+
+    def _key(self, name):
+        from storages.utils import clean_name
+        return self.storage._normalize_name(clean_name(name))
+
+    def _name(self, key):
+        location = self.storage.location.strip('/')
+        return key[len(location) + 1:] if location else key
+
+    def put_file(self, local_path, name):
+        with open(local_path, 'rb') as f:
+            saved = self.storage.save(name, File(f, name=name))
+        os.remove(local_path)
+        return saved
+
+    def list_prefix(self, prefix):
+        key_prefix = self._key(prefix)
+        if prefix.endswith('/') and not key_prefix.endswith('/'):
+            key_prefix += '/'
+        return [self._name(obj.key) for obj in self.storage.bucket.objects.filter(Prefix=key_prefix)]
+
+    def delete_many(self, names):
+        keys = [self._key(name) for name in names if name]
+        for start in range(0, len(keys), self.delete_batch_size):
+            batch = keys[start:start + self.delete_batch_size]
+            self.storage.bucket.delete_objects(
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+            )
+        return len(keys)
+
+    def move_many(self, pairs):
+        pairs = [(old, new) for old, new in pairs if old != new]
+        if not pairs:
+            return 0
+        bucket = self.storage.bucket
+        client = bucket.meta.client
+
+        def copy(pair):
+            from botocore.exceptions import ClientError
+
+            old, new = pair
+            try:
+                client.copy({'Bucket': bucket.name, 'Key': self._key(old)}, bucket.name, self._key(new))
+            except ClientError as e:
+                # File sumber yang tidak ada diabaikan, sama seperti storage lokal
+                if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey'):
+                    return None
+                raise
+            return old
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            copied = [old for old in executor.map(copy, pairs) if old is not None]
+        self.delete_many(copied)
+        return len(copied)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_media_store():
+    """
+    Mengembalikan MediaStore aktif sesuai `settings.MEDIA_STORE`.
+
+    `MEDIA_STORE['STORAGE']` adalah alias di `settings.STORAGES` (default:
+    `default`, storage yang juga dipakai FileField/ImageField).
+
+    Returns:
+        MediaStore: Instance store aktif.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                options = {**DEFAULT_MEDIA_STORE_SETTINGS, **getattr(settings, 'MEDIA_STORE', {})}
+                try:
+                    store_class = import_string(options['BACKEND'])
+                except ImportError as e:
+                    raise ImproperlyConfigured(f"Invalid MEDIA_STORE backend {options['BACKEND']}: {e}") from e
+                _store = store_class(storages[options['STORAGE']], **options['OPTIONS'])
+    return _store
+
+
+def reset_media_store():
+    """
+    Membuang store aktif agar dibuat ulang dari settings terbaru.
+    """
+    global _store
+    with _store_lock:
+        _store = None
+
+
+@receiver(setting_changed)
+def reset_store_on_setting_change(sender, setting, **kwargs):
+    if setting in ('MEDIA_STORE', 'STORAGES', 'MEDIA_ROOT', 'FILE_UPLOAD_TEMP_DIR'):
+        reset_media_store()
@@ -0,0 +1,240 @@
+# gallery/ordering.py - Urutan manual (sequence_number) dengan kunci berjarak
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Min, Value, When
+
+from . import versions
+
+# Jarak antar kunci saat penomoran ulang / penambahan di akhir
+SEQUENCE_GAP = 1024
+# Batas PositiveIntegerField di PostgreSQL
+MAX_SEQUENCE = 2 ** 31 - 1
+
+
+class SequenceOrdering:
+    """
+    Urutan manual model berdasarkan kolom integer berjarak (gapped keys).
+
+    Kunci baru di akhir adalah `MAX + SEQUENCE_GAP`, dan elemen yang dipindah
+    mendapat kunci di antara dua tetangganya. Insert, delete dan move hanya
+    mengubah baris yang dipindah; lubang yang ditinggalkan delete dibiarkan.
+    Jika tidak ada ruang lagi di antara dua kunci, seluruh scope dinomori ulang
+    dengan satu UPDATE (`CASE WHEN`).
+
+    Dipasang sebagai atribut model, misalnya::
+
+        sequence_order = SequenceOrdering(scope=('album',), version_table='photos')
+
+    Args:
+        scope (tuple): Field yang membatasi urutan (misalnya foto per album).
+            Kosong berarti satu urutan untuk seluruh tabel.
+        field (str): Nama kolom kunci urutan.
+        gap (int): Jarak antar kunci.
+        version_table (str): Tabel logis `gallery.versions` yang dinaikkan
+            setelah urutan berubah (update massal tidak mengirim signal).
+    """
+    def __init__(self, scope=(), field='sequence_number', gap=SEQUENCE_GAP, version_table=None):
+        self.scope = tuple(scope)
+        self.field = field
+        self.gap = gap
+        self.version_table = version_table
+        self.model = None
+
+    def contribute_to_class(self, cls, name):
+        self.model = cls
+        setattr(cls, name, self)
+
+    # Scope
+
+    @property
+    def scope_attnames(self):
+        return [self.model._meta.get_field(name).attname for name in self.scope]
+
+    def scope_of(self, instance):
+        """
+        Nilai scope dari sebuah instance, misalnya `{'album_id': 3}`.
+        """
+        return {attname: getattr(instance, attname) for attname in self.scope_attnames}
+
+    def scope_queryset(self, scope):
+        return self.model._default_manager.filter(**scope)
+
+    def _ordered(self, queryset):
+        # NULL di depan, sama dengan SequenceCursorPagination
+        return queryset.order_by(F(self.field).asc(nulls_first=True), 'pk')
+
+    def _bump(self):
+        if self.version_table:
+            versions.bump(self.version_table)
+
+    # Penambahan
+
+    def next_key(self, scope):
+        """
+        Kunci untuk elemen baru di akhir scope (satu query MAX).
+        """
+        last = self.scope_queryset(scope).aggregate(last=Max(self.field))['last']
+        if last is not None and last + self.gap > MAX_SEQUENCE:
+            self.renumber(scope)
+            last = self.scope_queryset(scope).aggregate(last=Max(self.field))['last']
+        return (last or 0) + self.gap
+
+    def assign(self, instance):
+        """
+        Mengisi kunci urutan instance baru jika belum diatur.
+        """
+        if getattr(instance, self.field) is None:
+            setattr(instance, self.field, self.next_key(self.scope_of(instance)))
+
+    def reserve(self, scope, count):
+        """
+        Memesan `count` kunci berturut-turut di akhir scope untuk insert massal.
+
+        Returns:
+            list: Kunci untuk setiap elemen baru.
+        """
+        first = self.next_key(scope)
+        if first + self.gap * (count - 1) > MAX_SEQUENCE:
+            self.renumber(scope)
+            first = self.next_key(scope)
+        return [first + self.gap * index for index in range(count)]
+
+    # Penomoran ulang
+
+    def _write_keys(self, scope, pks):
+        """
+        Menulis kunci `gap, 2*gap, ...` untuk `pks` (sesuai urutannya) dengan satu UPDATE.
+        """
+        if not pks:
+            return 0
+        keys = {pk: (index + 1) * self.gap for index, pk in enumerate(pks)}
+        updated = self.scope_queryset(scope).filter(pk__in=keys).update(**{
+            self.field: Case(
+                *(When(pk=pk, then=Value(key)) for pk, key in keys.items()),
+                output_field=IntegerField(),
+            )
+        })
+        self._bump()
+        return updated
+
+    def renumber(self, scope):
+        """
+        Menomori ulang seluruh scope dengan jarak `gap` tanpa mengubah urutan.
+
+        Returns:
+            int: Jumlah baris yang diperbarui.
+        """
+        pks = list(self._ordered(self.scope_queryset(scope)).values_list('pk', flat=True))
+        return self._write_keys(scope, pks)
+
+    # Pemindahan
+
+    def move(self, obj, after=None, before=None):
+        """
+        Memindahkan satu elemen. Lihat `move_many`.
+        """
+        return self.move_many([obj], after=after, before=before)
+
+    def move_many(self, objects, after=None, before=None):
+        """
+        Memindahkan beberapa elemen (instance atau pk) dari scope yang sama
+        sehingga berurutan sesuai `objects`, tepat setelah `after` atau tepat
+        sebelum `before`. Tanpa keduanya, elemen dipindah ke akhir.
+
+        Hanya baris yang dipindah yang diperbarui, kecuali tidak ada cukup ruang
+        di antara kunci tetangga; dalam hal itu seluruh scope dinomori ulang
+        dengan satu UPDATE.
+
+        Args:
+            objects (list): Instance atau pk yang dipindah, sesuai urutan baru.
+            after: Instance atau pk tetangga di depan (opsional).
+            before: Instance atau pk tetangga di belakang (opsional).
+
+        Returns:
+            dict: pk -> kunci urutan baru untuk elemen yang dipindah.
+
+        Raises:
+            ValueError: Jika elemen tidak ditemukan, berasal dari scope berbeda,
+                atau tetangga termasuk elemen yang dipindah.
+        """
+        pks = [getattr(obj, 'pk', obj) for obj in objects]
+        if not pks:
+            return {}
+        if len(set(pks)) != len(pks):
+            raise ValueError("Duplicate items in move")
+        if after is not None and before is not None:
+            raise ValueError("Specify either 'after' or 'before', not both")
+        anchor = after if after is not None else before
+        anchor_pk = getattr(anchor, 'pk', anchor)
+        if anchor_pk is not None and anchor_pk in pks:
+            raise ValueError("Anchor cannot be one of the moved items")
+
+        attnames = self.scope_attnames
+        lookup_pks = pks + ([anchor_pk] if anchor_pk is not None else [])
+
+        with transaction.atomic():
+            rows = {
+                row['pk']: row
+                for row in self.model._default_manager.select_for_update()
+                .filter(pk__in=lookup_pks)
+                .values('pk', self.field, *attnames)
+            }
+            missing = [pk for pk in lookup_pks if pk not in rows]
+            if missing:
+                raise ValueError(f"Items not found: {missing}")
+            scopes = {tuple(row[name] for name in attnames) for row in rows.values()}
+            if len(scopes) > 1:
+                raise ValueError("Items belong to different scopes")
+            scope = dict(zip(attnames, scopes.pop()))
+
+            others = self.scope_queryset(scope).exclude(pk__in=pks)
+            anchor_key = rows[anchor_pk][self.field] if anchor_pk is not None else None
+            if anchor_pk is not None and anchor_key is None:
+                # Tetangga tanpa kunci (data lama); urutan harus dibangun ulang
+                keys = None
+            elif after is not None:
+                upper = others.filter(**{f'{self.field}__gt': anchor_key}).aggregate(key=Min(self.field))['key']
+                keys = self._spread(anchor_key, upper, len(pks))
+            elif before is not None:
+                lower = others.filter(**{f'{self.field}__lt': anchor_key}).aggregate(key=Max(self.field))['key']
+                keys = self._spread(lower or 0, anchor_key, len(pks))
+            else:
+                lower = others.aggregate(key=Max(self.field))['key']
+                keys = self._spread(lower or 0, None, len(pks))
+
+            if keys is None:
+                return self._renumber_with_moved(scope, others, pks, anchor_pk, before is not None)
+
+            moved = dict(zip(pks, keys))
+            self.scope_queryset(scope).filter(pk__in=pks).update(**{
+                self.field: Case(
+                    *(When(pk=pk, then=Value(key)) for pk, key in moved.items()),
+                    output_field=IntegerField(),
+                )
+            })
+            self._bump()
+            return moved
+
+    def _spread(self, lower, upper, count):
+        """
+        `count` kunci berjarak rata di antara `lower` dan `upper` (eksklusif),
+        atau None jika ruangnya tidak cukup.
+        """
+        if upper is None:
+            keys = [lower + self.gap * (index + 1) for index in range(count)]
+            return keys if keys[-1] <= MAX_SEQUENCE else None
+        step = (upper - lower) // (count + 1)
+        if step < 1:
+            return None
+        return [lower + step * (index + 1) for index in range(count)]
+
+    def _renumber_with_moved(self, scope, others, pks, anchor_pk, before):
+        order = list(self._ordered(others).values_list('pk', flat=True))
+        if anchor_pk is None:
+            position = len(order)
+        else:
+            position = order.index(anchor_pk) + (0 if before else 1)
+        order[position:position] = pks
+        self._write_keys(scope, order)
+        keys = {pk: (index + 1) * self.gap for index, pk in enumerate(order)}
+        return {pk: keys[pk] for pk in pks}
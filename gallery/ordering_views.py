@@ -0,0 +1,72 @@
+# gallery/ordering_views.py - Endpoint pemindahan urutan (lihat gallery.ordering)
+
+from rest_framework import generics, serializers, status
+from rest_framework.response import Response
+
+
+class MoveSerializer(serializers.Serializer):
+    """
+    Payload pemindahan: `ids` sesuai urutan baru, dan salah satu dari `after`
+    atau `before` (id tetangga). Tanpa keduanya, item dipindah ke akhir.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=1000)
+    after = serializers.IntegerField(required=False, allow_null=True)
+    before = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate(self, attrs):
+        if attrs.get('after') is not None and attrs.get('before') is not None:
+            raise serializers.ValidationError("Specify either 'after' or 'before', not both.")
+        return attrs
+
+
+class SequenceMoveView(generics.GenericAPIView):
+    """
+    Base view untuk memindahkan banyak item sekaligus dalam satu scope urutan
+    (misalnya beberapa foto dalam satu album).
+
+    POST `{"ids": [5, 9, 2], "after": 7}` menempatkan item 5, 9, 2 berurutan
+    tepat setelah item 7. Hanya item yang terlihat di `get_queryset()` yang
+    dapat dipindah atau dipakai sebagai tetangga.
+
+    Attributes:
+        ordering_attribute (str): Nama atribut `SequenceOrdering` pada model.
+    """
+    serializer_class = MoveSerializer
+    ordering_attribute = 'sequence_order'
+
+    def post(self, request, *args, **kwargs):
+        """
+        Returns:
+            Response: Kunci urutan baru setiap item yang dipindah.
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        after = serializer.validated_data.get('after')
+        before = serializer.validated_data.get('before')
+
+        queryset = self.get_queryset()
+        requested = set(ids) | {pk for pk in (after, before) if pk is not None}
+        visible = set(queryset.filter(pk__in=requested).values_list('pk', flat=True))
+        if requested - visible:
+            return Response({
+                "status": "failed",
+                "status_code": status.HTTP_404_NOT_FOUND,
+                "message": f"Items not found: {sorted(requested - visible)}"
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        ordering = getattr(queryset.model, self.ordering_attribute)
+        try:
+            keys = ordering.move_many(ids, after=after, before=before)
+        except ValueError as e:
+            return Response({
+                "status": "failed",
+                "status_code": status.HTTP_400_BAD_REQUEST,
+                "message": str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "status": "success",
+            "status_code": status.HTTP_200_OK,
+            "data": [{"id": pk, "sequence_number": keys[pk]} for pk in ids]
+        }, status=status.HTTP_200_OK)
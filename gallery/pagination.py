@@ -0,0 +1,141 @@
+# gallery/pagination.py - Keyset (cursor) pagination untuk endpoint daftar
+
+import base64
+import json
+
+from django.db.models import F, Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+class SequenceCursorPagination(BasePagination):
+    """
+    Keyset pagination berdasarkan pasangan (sequence_number, id).
+
+    Setiap halaman diambil dengan kondisi `WHERE (sequence_number, id) > posisi`
+    dan `LIMIT page_size + 1`, sehingga biayanya tetap meskipun halaman yang
+    diminta berada jauh di belakang (tanpa OFFSET). Nilai sequence_number NULL
+    diurutkan paling depan.
+
+    Query parameter:
+        cursor: Token dari field `next`/`prev` respons sebelumnya.
+        page_size: Jumlah item per halaman (maksimal `max_page_size`).
+        all: Jika bernilai true, pagination dimatikan dan seluruh data
+            dikembalikan seperti sebelumnya (kompatibilitas klien lama).
+    """
+    page_size = 50
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    full_list_query_param = 'all'
+    ordering_field = 'sequence_number'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(page_size, 1), self.max_page_size)
+
+    def wants_full_list(self, request):
+        value = request.query_params.get(self.full_list_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    # Cursor
+
+    def encode_cursor(self, position, reverse=False):
+        payload = json.dumps({'s': position[0], 'i': position[1], 'r': int(reverse)})
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            sequence, pk, reverse = payload['s'], int(payload['i']), bool(payload['r'])
+            if sequence is not None:
+                sequence = int(sequence)
+        except (TypeError, ValueError, KeyError):
+            raise ValidationError({self.cursor_query_param: ['Invalid cursor']})
+        return sequence, pk, reverse
+
+    def _position(self, obj):
+        return getattr(obj, self.ordering_field), obj.pk
+
+    def _after(self, sequence, pk):
+        field = self.ordering_field
+        if sequence is None:
+            return Q(**{f'{field}__isnull': True, 'pk__gt': pk}) | Q(**{f'{field}__isnull': False})
+        return Q(**{f'{field}__gt': sequence}) | Q(**{field: sequence, 'pk__gt': pk})
+
+    def _before(self, sequence, pk):
+        field = self.ordering_field
+        if sequence is None:
+            return Q(**{f'{field}__isnull': True, 'pk__lt': pk})
+        return (
+            Q(**{f'{field}__lt': sequence})
+            | Q(**{field: sequence, 'pk__lt': pk})
+            | Q(**{f'{field}__isnull': True})
+        )
+
+    # API pagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Mengembalikan satu halaman data, atau None jika klien meminta seluruh
+        data melalui parameter `all`.
+        """
+        if self.wants_full_list(request):
+            return None
+
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        field = F(self.ordering_field)
+
+        if cursor is not None and cursor[2]:
+            # Mundur: ambil item sebelum posisi dengan urutan terbalik
+            rows = list(
+                queryset.filter(self._before(cursor[0], cursor[1]))
+                .order_by(field.desc(nulls_last=True), '-pk')[:page_size + 1]
+            )
+            has_more = len(rows) > page_size
+            page = list(reversed(rows[:page_size]))
+            has_next, has_prev = True, has_more
+        else:
+            if cursor is not None:
+                queryset = queryset.filter(self._after(cursor[0], cursor[1]))
+            rows = list(queryset.order_by(field.asc(nulls_first=True), 'pk')[:page_size + 1])
+            page = rows[:page_size]
+            has_next, has_prev = len(rows) > page_size, cursor is not None
+
+        self.next_cursor = self.encode_cursor(self._position(page[-1])) if page and has_next else None
+        self.prev_cursor = self.encode_cursor(self._position(page[0]), reverse=True) if page and has_prev else None
+        return page
+
+    def get_cursors(self):
+        """
+        Cursor untuk halaman berikutnya dan sebelumnya (None jika tidak ada).
+        """
+        return {'next': self.next_cursor, 'prev': self.prev_cursor}
+
+    def get_paginated_response(self, data):
+        return Response({'data': data, **self.get_cursors()})
+
+
+class CursorPaginatedListMixin:
+    """
+    Mixin untuk view daftar yang memakai `SequenceCursorPagination` namun
+    tetap mempertahankan format respons standar (`status`, `data`, ...).
+    """
+    pagination_class = SequenceCursorPagination
+
+    def page_cursors(self, page):
+        """
+        Field `next`/`prev` untuk ditambahkan ke respons, atau dictionary kosong
+        jika pagination dimatikan dengan parameter `all`.
+        """
+        if page is None:
+            return {}
+        return self.paginator.get_cursors()
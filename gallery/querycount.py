@@ -0,0 +1,76 @@
+# gallery/querycount.py - Pemeriksaan jumlah query untuk endpoint daftar
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountGrowthError(AssertionError):
+    """
+    Dilempar jika jumlah query sebuah endpoint bertambah seiring jumlah data
+    (indikasi N+1 query).
+    """
+
+
+class QueryCountDropError(AssertionError):
+    """
+    Dilempar jika jumlah query berkurang pada data yang lebih besar, artinya
+    view tidak menjalankan queryset-nya (misalnya dilayani dari cache) dan
+    hasil pengukuran tidak dapat dipercaya.
+    """
+
+
+def count_queries(func, using=DEFAULT_DB_ALIAS):
+    """
+    Menjalankan `func` dan menghitung query database yang dieksekusi.
+
+    Returns:
+        tuple: (hasil func, jumlah query, daftar SQL yang dieksekusi)
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        result = func()
+    return result, len(context), [query['sql'] for query in context.captured_queries]
+
+
+def assert_constant_queries(name, func, populate, sizes=(5, 25), using=DEFAULT_DB_ALIAS):
+    """
+    Memastikan jumlah query `func` tidak bergantung pada jumlah data.
+
+    `populate(size)` dipanggil untuk setiap ukuran di `sizes` (secara
+    kumulatif) sebelum `func` dijalankan. Dapat dipakai di test case maupun
+    dari command `check_query_counts`.
+
+    Args:
+        name (str): Nama endpoint untuk pesan error.
+        func (callable): Fungsi yang menjalankan request ke endpoint.
+        populate (callable): Fungsi yang menambah data hingga ukuran tertentu.
+        sizes (tuple): Ukuran data yang dibandingkan.
+
+    Returns:
+        dict: ukuran data -> jumlah query.
+
+    Raises:
+        QueryCountGrowthError: Jika jumlah query bertambah seiring ukuran data.
+        QueryCountDropError: Jika jumlah query berkurang atau nol (queryset
+            tidak dijalankan).
+    """
+    counts = {}
+    statements = {}
+    for size in sizes:
+        populate(size)
+        _, counts[size], statements[size] = count_queries(func, using)
+
+    baseline = counts[sizes[0]]
+    if any(count < baseline for count in counts.values()) or not any(counts.values()):
+        change = 'drops with result size' if any(counts.values()) else 'is zero for every size'
+        raise QueryCountDropError(
+            f"{name}: query count {change} {counts}; "
+            f"the view did not run its queryset for every size"
+        )
+    if any(count > baseline for count in counts.values()):
+        smallest, largest = sizes[0], max(sizes, key=lambda size: counts[size])
+        extra = statements[largest][len(statements[smallest]):][:5]
+        raise QueryCountGrowthError(
+            f"{name}: query count grows with result size {counts}. "
+            f"Extra queries: {extra}"
+        )
+    return counts
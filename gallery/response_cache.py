@@ -0,0 +1,181 @@
+# gallery/response_cache.py - Cache respons JSON untuk endpoint list publik
+
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework.response import Response
+
+from .conditional import VersionedViewMixin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESPONSE_CACHE_SETTINGS = {
+    'ENABLED': True,
+    'CACHE': 'default',
+    'TIMEOUT': 3600,
+    'METRICS_FLUSH_EVERY': 100,
+}
+
+KEY_PREFIX = 'response-cache'
+METRIC_EVENTS = ('hit', 'miss')
+# Format renderer yang aman dibagikan antar user
+CACHED_FORMATS = ('json',)
+
+
+def get_response_cache_settings():
+    return {**DEFAULT_RESPONSE_CACHE_SETTINGS, **getattr(settings, 'RESPONSE_CACHE', {})}
+
+
+def _cache():
+    return caches[get_response_cache_settings()['CACHE']]
+
+
+class ResponseCacheMetrics:
+    """
+    Counter hit/miss per view. Counter dikumpulkan di memori proses lalu
+    ditambahkan ke cache bersama setiap `METRICS_FLUSH_EVERY` event, sehingga
+    request tidak menulis ke cache hanya untuk metrik.
+    """
+    VIEWS_KEY = f'{KEY_PREFIX}:metrics:views'
+
+    def __init__(self):
+        self._pending = Counter()
+        self._events = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(view_name, event):
+        return f'{KEY_PREFIX}:metrics:{view_name}:{event}'
+
+    def record(self, view_name, event):
+        with self._lock:
+            self._pending[(view_name, event)] += 1
+            self._events += 1
+            should_flush = self._events >= get_response_cache_settings()['METRICS_FLUSH_EVERY']
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._events = 0
+        cache = _cache()
+        # Daftar view yang pernah dicatat, agar statistik dapat dibaca dari
+        # proses lain (misalnya management command) yang tidak memuat view
+        known = cache.get(self.VIEWS_KEY, [])
+        new_views = {view_name for view_name, _ in pending} - set(known)
+        if new_views:
+            cache.set(self.VIEWS_KEY, sorted(set(known) | new_views), None)
+        for (view_name, event), count in pending.items():
+            key = self._key(view_name, event)
+            try:
+                cache.add(key, 0, None)
+                cache.incr(key, count)
+            except ValueError:
+                cache.set(key, count, None)
+
+    def stats(self):
+        """
+        Statistik hit/miss seluruh worker (cache bersama) ditambah event proses
+        ini yang belum di-flush.
+
+        Returns:
+            dict: Nama view -> {'hit', 'miss', 'hit_ratio'}.
+        """
+        with self._lock:
+            pending = dict(self._pending)
+        views = sorted(
+            set(_cache().get(self.VIEWS_KEY, []))
+            | set(get_cached_view_names())
+            | {view_name for view_name, _ in pending}
+        )
+        keys = {self._key(view_name, event): (view_name, event) for view_name in views for event in METRIC_EVENTS}
+        stored = _cache().get_many(list(keys))
+
+        result = {}
+        for key, (view_name, event) in keys.items():
+            entry = result.setdefault(view_name, {event: 0 for event in METRIC_EVENTS})
+            entry[event] = stored.get(key, 0) + pending.get((view_name, event), 0)
+        for entry in result.values():
+            total = entry['hit'] + entry['miss']
+            entry['hit_ratio'] = round(entry['hit'] / total, 4) if total else None
+        return result
+
+
+metrics = ResponseCacheMetrics()
+
+_cached_views = set()
+
+
+def get_cached_view_names():
+    """
+    Nama view yang memakai `CachedResponseMixin` (terdaftar saat class dibuat).
+    """
+    return sorted(_cached_views)
+
+
+class CachedResponseMixin(VersionedViewMixin):
+    """
+    Mixin untuk view list publik yang menyimpan respons JSON yang sudah
+    di-render (bytes) di cache bersama.
+
+    Hanya respons JSON yang dicache (`CACHED_FORMATS`); format lain, misalnya
+    HTML browsable API, selalu di-render per request.
+
+    Key cache terdiri dari view, URL lengkap, format renderer dan versi tabel
+    di `version_tables`. Signal post_save/post_delete model (dan jalur tulis
+    bulk) menaikkan versi tabel tersebut, sehingga entri lama otomatis tidak
+    terpakai lagi tanpa perlu menghapus key satu per satu; entri lama hilang
+    karena TIMEOUT atau cull.
+
+    Header `X-Response-Cache: hit|miss` menandai asal respons.
+    """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _cached_views.add(cls.get_response_cache_name())
+
+    @classmethod
+    def get_response_cache_name(cls):
+        return f'{cls.__module__}.{cls.__qualname__}'
+
+    def get(self, request, *args, **kwargs):
+        options = get_response_cache_settings()
+        # Hanya JSON yang dicache: HTML browsable API berisi username, token
+        # CSRF dan form milik user yang me-request
+        if not options['ENABLED'] or getattr(getattr(request, 'accepted_renderer', None), 'format', None) not in CACHED_FORMATS:
+            return super().get(request, *args, **kwargs)
+
+        view_name = self.get_response_cache_name()
+        key = f'{KEY_PREFIX}:{view_name}:{self.get_version_digest(request)}'
+        cached = _cache().get(key)
+        if cached is not None:
+            metrics.record(view_name, 'hit')
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Response-Cache'] = 'hit'
+            return response
+
+        metrics.record(view_name, 'miss')
+        self._response_cache_key = key
+        return super().get(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        key = getattr(self, '_response_cache_key', None)
+        if key and isinstance(response, Response) and response.status_code == 200:
+            response.render()
+            try:
+                _cache().set(
+                    key,
+                    (response.content, response['Content-Type']),
+                    get_response_cache_settings()['TIMEOUT'],
+                )
+            except Exception as e:
+                # Cache respons bersifat opsional; kegagalan tidak memengaruhi request
+                logger.warning(f"Could not store cached response for {request.path}: {str(e)}")
+            response['X-Response-Cache'] = 'miss'
+        return response
@@ -0,0 +1,248 @@
+# gallery/serving.py - Penyajian file media (sendfile/X-Accel-Redirect, Range, cache header)
+
+import mimetypes
+import os
+import re
+import stat
+import threading
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, SuspiciousFileOperation
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+
+from .media import get_media_store
+from .streaming import ranged_file_response
+
+DEFAULT_MEDIA_SERVING_SETTINGS = {
+    'BACKEND': 'gallery.serving.SendfileBackend',
+    'OPTIONS': {},
+    'MAX_AGE': 3600,
+    'IMMUTABLE_PREFIXES': ['blobs/'],
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 3600,
+    'DENIED_PREFIXES': ['analytics/'],
+}
+
+
+def get_media_serving_settings():
+    return {**DEFAULT_MEDIA_SERVING_SETTINGS, **getattr(settings, 'MEDIA_SERVING', {})}
+
+
+class MediaServingBackend:
+    """
+    Dasar backend pengirim isi file media. View `serve_media` sudah menangani
+    validasi path, conditional GET dan cache header; backend hanya menentukan
+    cara byte file dikirim.
+    """
+    def __init__(self, **options):
+        self.options = options
+
+    def serve(self, request, name, path, content_type, headers, allow_range=True):
+        """
+        Args:
+            request (HttpRequest): Objek permintaan HTTP.
+            name (str): Nama file relatif terhadap MEDIA_ROOT.
+            path (str): Path absolut file di disk.
+            content_type (str): Content-Type file.
+            headers (dict): Header yang harus ikut dikirim (ETag, Last-Modified).
+            allow_range (bool): False jika header Range harus diabaikan
+                (If-Range tidak cocok).
+
+        Returns:
+            HttpResponse: Response berisi file.
+        """
+        raise NotImplementedError
+
+
+class SendfileBackend(MediaServingBackend):
+    """
+    Mengirim file langsung dari proses Django. Dengan gunicorn, isi file
+    dikirim lewat `wsgi.file_wrapper` yang memakai `os.sendfile`, sehingga
+    byte file tidak melewati Python. Mendukung satu rentang HTTP Range.
+    """
+    def serve(self, request, name, path, content_type, headers, allow_range=True):
+        return ranged_file_response(
+            request,
+            path,
+            content_type=content_type,
+            headers=headers,
+            allow_range=allow_range,
+        )
+
+
+class XAccelRedirectBackend(MediaServingBackend):
+    """
+    Menyerahkan pengiriman file ke nginx lewat header `X-Accel-Redirect`.
+    nginx menangani Range sendiri; Cache-Control dan Content-Type dari Django
+    ikut dikirim ke klien.
+
+    Options:
+        INTERNAL_PREFIX (str): Location `internal` nginx yang menunjuk ke
+            MEDIA_ROOT, misalnya '/protected-media/'.
+    """
+    def serve(self, request, name, path, content_type, headers, allow_range=True):
+        prefix = self.options.get('INTERNAL_PREFIX', '/protected-media/')
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response['X-Accel-Redirect'] = f"{prefix.rstrip('/')}/{quote(name)}"
+        return response
+
+
+class XSendfileBackend(MediaServingBackend):
+    """
+    Menyerahkan pengiriman file ke Apache (mod_xsendfile) atau lighttpd lewat
+    header berisi path absolut file.
+
+    Options:
+        HEADER (str): Nama header, default 'X-Sendfile'.
+    """
+    def serve(self, request, name, path, content_type, headers, allow_range=True):
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response[self.options.get('HEADER', 'X-Sendfile')] = path
+        return response
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_media_serving_backend():
+    """
+    Mengembalikan backend aktif sesuai `settings.MEDIA_SERVING`.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                options = get_media_serving_settings()
+                try:
+                    backend_class = import_string(options['BACKEND'])
+                except ImportError as e:
+                    raise ImproperlyConfigured(f"Invalid MEDIA_SERVING backend {options['BACKEND']}: {e}") from e
+                _backend = backend_class(**options['OPTIONS'])
+    return _backend
+
+
+def reset_media_serving_backend():
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+@receiver(setting_changed)
+def reset_backend_on_setting_change(sender, setting, **kwargs):
+    if setting == 'MEDIA_SERVING':
+        reset_media_serving_backend()
+
+
+# Nama file asli blob: `<sha256>.<ext>`. Varian (`<sha256>_<ukuran>.<ext>`)
+# dapat ditulis ulang dengan isi baru oleh `generate_renditions --all`
+CONTENT_HASH_NAME = re.compile(r'^[0-9a-f]{64}(\.[A-Za-z0-9]+)?$')
+
+
+def is_immutable_name(name):
+    """
+    True jika isi file tidak pernah berubah untuk nama yang sama, yaitu file
+    asli berbasis hash isi di bawah `IMMUTABLE_PREFIXES`. Varian ukuran di
+    folder yang sama tidak termasuk karena namanya tidak bergantung pada
+    isinya.
+    """
+    return (
+        any(name.startswith(prefix) for prefix in get_media_serving_settings()['IMMUTABLE_PREFIXES'])
+        and CONTENT_HASH_NAME.match(os.path.basename(name)) is not None
+    )
+
+
+def media_etag(name, st):
+    """
+    ETag file media. File asli berbasis hash memakai nama file itu sendiri
+    karena blob bisa ditulis ulang dengan isi yang sama (mtime berubah); file
+    lain, termasuk varian ukuran, memakai ukuran dan waktu modifikasi.
+    """
+    if is_immutable_name(name):
+        return f'"{os.path.splitext(os.path.basename(name))[0]}"'
+    return f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+
+
+def _if_range_matches(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Menyajikan file di MEDIA_ROOT dengan ETag, Last-Modified, Cache-Control
+    dan dukungan HTTP Range. File asli blob (nama berbasis hash isi) mendapat cache
+    `immutable` jangka panjang.
+
+    Jika media disimpan di object storage, request diarahkan ke URL storage.
+
+    Args:
+        request (HttpRequest): Objek permintaan HTTP.
+        path (str): Path file relatif terhadap MEDIA_URL.
+
+    Returns:
+        HttpResponse: Response 200, 206, 304, 412 atau 416.
+
+    Raises:
+        Http404: Jika file tidak ditemukan, path tidak valid, atau berada di
+            bawah `DENIED_PREFIXES`.
+    """
+    name = path.lstrip('/')
+    # Folder/file tersembunyi (misalnya folder upload sementara '.incoming') tidak disajikan
+    if not name or any(part.startswith('.') for part in name.split('/')):
+        raise Http404("File not found")
+    # File privat di MEDIA_ROOT (misalnya arsip analytics) punya view download sendiri
+    options = get_media_serving_settings()
+    if any(name.startswith(prefix) for prefix in options['DENIED_PREFIXES']):
+        raise Http404("File not found")
+
+    store = get_media_store()
+    try:
+        local_path = store.local_path(name)
+    except SuspiciousFileOperation:
+        raise Http404("File not found")
+    if local_path is None:
+        return HttpResponseRedirect(store.url(name))
+
+    try:
+        st = os.stat(local_path)
+    except OSError:
+        raise Http404("File not found")
+    if not stat.S_ISREG(st.st_mode):
+        raise Http404("File not found")
+
+    etag = media_etag(name, st)
+    last_modified = int(st.st_mtime)
+    immutable = is_immutable_name(name)
+
+    headers = {'ETag': etag, 'Last-Modified': http_date(last_modified)}
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(name)
+        content_type = content_type or 'application/octet-stream'
+        response = get_media_serving_backend().serve(
+            request, name, local_path, content_type, headers,
+            allow_range=_if_range_matches(request, etag, last_modified),
+        )
+        if encoding:
+            response['Content-Encoding'] = encoding
+    else:
+        for key, value in headers.items():
+            response[key] = value
+
+    if immutable:
+        patch_cache_control(response, public=True, max_age=options['IMMUTABLE_MAX_AGE'], immutable=True)
+    else:
+        patch_cache_control(response, public=True, max_age=options['MAX_AGE'])
+    return response
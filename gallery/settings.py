@@ -1,11 +1,16 @@
 from pathlib import Path
 from dotenv import load_dotenv
 import os
+import sys
+import tempfile
 
 load_dotenv()
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# True saat menjalankan `manage.py test`
+TESTING = len(sys.argv) > 1 and sys.argv[1] == 'test'
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -105,14 +110,100 @@ LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 if not os.path.exists(LOGS_DIR):
     os.makedirs(LOGS_DIR)
 
+# Cache dipakai bersama oleh semua worker (throttle, statistik dashboard/analytics)
+CACHE_DIR = os.path.join(BASE_DIR, 'cache')
+if not os.path.exists(CACHE_DIR):
+    os.makedirs(CACHE_DIR)
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'gallery.cache.SQLiteCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(CACHE_DIR, 'default.sqlite3')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+            'MMAP_SIZE': 64 * 1024 * 1024,
+        },
     }
 }
+if TESTING:
+    # Setiap test run memakai file cache sendiri, bukan cache milik checkout ini
+    CACHES['default']['LOCATION'] = os.path.join(tempfile.mkdtemp(prefix='gallery-test-cache-'), 'default.sqlite3')
 
 # Dashboard settings
-DASHBOARD_CACHE_TIMEOUT = 3600  # 1 jam dalam detik
+DASHBOARD_STATS_WORKERS = 4  # Jumlah thread untuk menghitung statistik (1 = sekuensial)
+
+# Analytics ingestion settings
+# 'analytics.ingestion.SyncIngestionBackend' menulis langsung (default saat testing)
+ANALYTICS_INGESTION = {
+    'BACKEND': os.getenv(
+        'ANALYTICS_INGESTION_BACKEND',
+        'analytics.ingestion.SyncIngestionBackend' if TESTING else 'analytics.ingestion.BufferedIngestionBackend'
+    ),
+    'BATCH_SIZE': 200,  # Flush setiap N record
+    'FLUSH_INTERVAL_MS': 1000,  # Atau setiap M milidetik
+    'MAX_BUFFER_SIZE': 10000,  # Record tertua dibuang jika buffer penuh
+}
+
+# Analytics rollup settings
+ANALYTICS_ROLLUPS = {
+    'HOURLY_RETENTION_DAYS': 90,  # Rollup per jam lebih lama dari ini dihapus; rollup per hari tetap disimpan
+}
+
+# Photo like counter settings
+# Gunakan 'photo.likes.DirectLikeCounter' untuk menulis setiap like langsung ke database
+PHOTO_LIKES = {
+    'BACKEND': os.getenv('PHOTO_LIKES_BACKEND', 'photo.likes.BufferedLikeCounter'),
+    'FLUSH_INTERVAL_MS': 1000,  # Perubahan like digabung dan ditulis setiap M milidetik
+    'SHARDS': 0,  # > 0 untuk menyebar like foto populer ke tabel shard
+    'HOT_THRESHOLD': 20,  # Perubahan per interval agar foto dianggap populer
+    'FOLD_INTERVAL_MS': 60000,  # Interval pemindahan shard ke Photo.likes
+}
+
+# Photo rendition settings (varian ukuran foto yang dibuat setelah upload)
+PHOTO_RENDITIONS = {
+    'SIZES': {'thumb': 320, 'medium': 960, 'large': 1920},  # Sisi terpanjang dalam pixel
+    'FORMATS': ['jpeg', 'webp', 'avif'],  # Format yang tidak didukung Pillow dilewati
+    'WORKERS': 2,  # Jumlah thread pembuat varian
+    'ASYNC': True,  # False untuk membuat varian langsung setelah commit
+}
+
+# Versi data per tabel untuk ETag/Last-Modified (lihat gallery.versions)
+TABLE_VERSIONS = {
+    'CACHE': 'default',  # Harus cache bersama antar worker
+}
+
+# Conditional GET untuk endpoint publik (lihat gallery.conditional)
+CONDITIONAL_GET = {
+    'MAX_AGE': 0,  # Klien selalu revalidasi; jawaban 304 jika data tidak berubah
+}
+
+# Cache respons JSON endpoint list publik (lihat gallery.response_cache)
+RESPONSE_CACHE = {
+    'ENABLED': True,
+    'CACHE': 'default',  # Invalidasi lewat versi tabel, jadi harus cache bersama
+    'TIMEOUT': 3600,  # Entri yang versinya sudah usang dibuang setelah N detik
+    'METRICS_FLUSH_EVERY': 100,  # Counter hit/miss ditulis ke cache setiap N request
+}
+
+# Gallery Assistant: model AI dimuat saat pertama dipakai (lihat assistant.model_registry)
+ASSISTANT_AI = {
+    'ENABLED': os.getenv('ASSISTANT_AI_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    'SKIP_FOR_COMMANDS': True,  # migrate, shell, dll. tidak pernah memuat model
+    'ALLOWED_COMMANDS': ['runserver'],  # Command yang tetap boleh memuat model
+    'PRELOAD': False,  # True untuk memuat model di background saat worker start
+    'INTENT_THRESHOLD': 0.6,  # Cosine similarity minimum klasifikasi intent berbasis embedding
+    # 'local': model dimuat di setiap proses web; 'worker': satu proses
+    # `manage.py run_inference_worker` memegang model, proses web menjadi klien
+    'INFERENCE': os.getenv('ASSISTANT_INFERENCE', 'worker'),
+    'SOCKET_PATH': os.getenv('ASSISTANT_SOCKET_PATH', os.path.join(BASE_DIR, 'run', 'assistant.sock')),
+    'TIMEOUT': 2.0,  # Detik; lewat dari ini klien memakai mode kata kunci
+    'RETRY_AFTER': 5.0,  # Detik sebelum worker atau model yang gagal dimuat dicoba lagi
+    'MAX_BATCH_SIZE': 16,  # Request per batch inference
+    'MAX_BATCH_WAIT': 0.005,  # Detik menunggu request lain sebelum batch dijalankan
+    'ENRICHMENT': True,  # Sentiment dan NER untuk InteractionLog, di luar request
+    'ENRICHMENT_ASYNC': True,  # False untuk menjalankan enrichment langsung (testing)
+    'ENRICHMENT_WORKERS': 1,
+}
 
 AUTH_USER_MODEL = 'users.User'
 
@@ -167,6 +258,55 @@ DATABASES = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Backend penyimpanan media: 'local' (MEDIA_ROOT) atau 's3' (AWS S3/MinIO, butuh django-storages dan boto3)
+MEDIA_BACKEND = os.getenv('MEDIA_BACKEND', 'local')
+
+if MEDIA_BACKEND == 's3':
+    STORAGES = {
+        'default': {
+            'BACKEND': 'storages.backends.s3.S3Storage',
+            'OPTIONS': {
+                'bucket_name': os.getenv('MEDIA_S3_BUCKET'),
+                'endpoint_url': os.getenv('MEDIA_S3_ENDPOINT_URL'),  # Contoh MinIO: http://minio:9000
+                'region_name': os.getenv('MEDIA_S3_REGION'),
+                'access_key': os.getenv('MEDIA_S3_ACCESS_KEY'),
+                'secret_key': os.getenv('MEDIA_S3_SECRET_KEY'),
+                'custom_domain': os.getenv('MEDIA_S3_CUSTOM_DOMAIN'),
+                'location': os.getenv('MEDIA_S3_LOCATION', ''),
+                'querystring_auth': False,  # Media galeri bersifat publik
+                'file_overwrite': True,  # Nama file sudah unik (hash/uuid)
+            },
+        },
+        'staticfiles': {
+            'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+        },
+    }
+
+# Layanan operasi file media (lihat gallery.media)
+MEDIA_STORE = {
+    'BACKEND': 'gallery.media.S3MediaStore' if MEDIA_BACKEND == 's3' else 'gallery.media.LocalMediaStore',
+    'STORAGE': 'default',  # Alias di STORAGES
+    'OPTIONS': {},
+}
+
+# Penyajian file media di MEDIA_URL (lihat gallery.serving)
+# Di belakang nginx gunakan 'gallery.serving.XAccelRedirectBackend' dengan location internal:
+#   location /protected-media/ { internal; alias <MEDIA_ROOT>/; }
+# Apache (mod_xsendfile) / lighttpd: 'gallery.serving.XSendfileBackend'
+MEDIA_SERVING = {
+    'BACKEND': os.getenv('MEDIA_SERVING_BACKEND', 'gallery.serving.SendfileBackend'),
+    'OPTIONS': {
+        'INTERNAL_PREFIX': os.getenv('MEDIA_INTERNAL_PREFIX', '/protected-media/'),  # Untuk X-Accel-Redirect
+    },
+    'MAX_AGE': 3600,  # Cache file yang namanya bisa berisi file lain (misalnya cover halaman)
+    'IMMUTABLE_PREFIXES': ['blobs/'],  # File asli `<sha256>.<ext>`: cache 'immutable' satu tahun (varian tidak)
+    'IMMUTABLE_MAX_AGE': 365 * 24 * 3600,
+    'DENIED_PREFIXES': ['analytics/'],  # Arsip analytics (IP, user agent) hanya lewat view download yang terautentikasi
+}
+
+# Jumlah file maksimal per request upload (default Django: 100)
+DATA_UPLOAD_MAX_NUMBER_FILES = 500
+
 # Security settings
 # SECURE_SSL_REDIRECT = True
 # SESSION_COOKIE_SECURE = True
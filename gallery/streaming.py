@@ -0,0 +1,136 @@
+# gallery/streaming.py - Response streaming file dengan dukungan HTTP Range
+
+import os
+import re
+
+from django.http import FileResponse, HttpResponse
+from django.utils.http import content_disposition_header
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range_header(header, size):
+    """
+    Mem-parsing header Range satu rentang byte.
+
+    Args:
+        header (str): Nilai header Range, misalnya 'bytes=0-1023' atau 'bytes=-500'.
+        size (int): Ukuran file dalam byte.
+
+    Returns:
+        tuple | None: (start, end) inklusif jika valid, None jika header tidak
+        didukung (misalnya multi-range) sehingga file dikirim utuh.
+
+    Raises:
+        ValueError: Jika rentang tidak dapat dipenuhi (416).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        # Suffix range: N byte terakhir
+        length = int(end)
+        if length == 0:
+            raise ValueError("Unsatisfiable range")
+        return max(0, size - length), size - 1
+
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        raise ValueError("Unsatisfiable range")
+    return start, min(end, size - 1)
+
+
+class FileRange:
+    """
+    File-like yang hanya membaca byte `start` sampai `end` (inklusif).
+
+    Posisi file asli sudah berada di `start` dan `fileno()` diteruskan, sehingga
+    `wsgi.file_wrapper` (gunicorn memakai `os.sendfile`) dapat mengirim rentang
+    ini langsung dari kernel tanpa menyalin data lewat Python; panjangnya
+    dibatasi oleh Content-Length. Server tanpa file_wrapper membaca lewat
+    `read()` per potongan.
+    """
+    def __init__(self, path, start, end):
+        self._file = open(path, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start + 1
+
+    def fileno(self):
+        return self._file.fileno()
+
+    def read(self, size=-1):
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0:
+            size = self._remaining
+        data = self._file.read(min(size, self._remaining))
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def ranged_file_response(request, path, content_type='application/octet-stream',
+                         as_attachment=False, filename=None, headers=None, allow_range=True):
+    """
+    Membuat response streaming untuk file di disk dengan dukungan HTTP Range.
+
+    Request tanpa header Range menerima seluruh file (200), request dengan satu
+    rentang byte menerima 206 beserta Content-Range, dan rentang yang tidak
+    valid menerima 416. File tidak pernah dibaca utuh ke memori.
+
+    Args:
+        request (HttpRequest): Objek permintaan HTTP.
+        path (str): Path absolut file.
+        content_type (str): Content-Type response.
+        as_attachment (bool): Jika True, file dikirim sebagai attachment.
+        filename (str): Nama file untuk Content-Disposition.
+        headers (dict): Header tambahan untuk response.
+        allow_range (bool): False untuk mengabaikan header Range (misalnya
+            karena If-Range tidak cocok) dan mengirim file utuh.
+
+    Returns:
+        HttpResponse: Response 200, 206 atau 416.
+    """
+    size = os.path.getsize(path)
+    extra_headers = dict(headers or {})
+    extra_headers['Accept-Ranges'] = 'bytes'
+    disposition = content_disposition_header(as_attachment, filename or os.path.basename(path))
+    if disposition:
+        extra_headers['Content-Disposition'] = disposition
+
+    range_header = request.META.get('HTTP_RANGE') if allow_range else None
+    byte_range = None
+    if range_header and size:
+        try:
+            byte_range = parse_range_header(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416, headers=extra_headers)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        (start, end), status = byte_range, 206
+
+    response = FileResponse(
+        FileRange(path, start, end),
+        status=status,
+        content_type=content_type,
+        headers=extra_headers,
+    )
+    response.block_size = STREAM_CHUNK_SIZE
+    response['Content-Length'] = str(end - start + 1 if size else 0)
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
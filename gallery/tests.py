@@ -0,0 +1,223 @@
+import os
+import tempfile
+import time
+import unittest
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from gallery.cache import SQLiteCache
+from gallery.media import get_media_store
+from gallery.serving import serve_media
+
+try:
+    import boto3
+    from moto import mock_aws
+except ImportError:
+    boto3 = mock_aws = None
+
+# Create your tests here.
+
+S3_BUCKET = 'gallery-test'
+S3_STORAGES = {
+    'default': {
+        'BACKEND': 'storages.backends.s3.S3Storage',
+        'OPTIONS': {
+            'bucket_name': S3_BUCKET,
+            'region_name': 'us-east-1',
+            'access_key': 'testing',
+            'secret_key': 'testing',
+            'querystring_auth': False,
+            'file_overwrite': True,
+        },
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+
+@unittest.skipIf(mock_aws is None, 'moto is not installed')
+@override_settings(STORAGES=S3_STORAGES, MEDIA_STORE={'BACKEND': 'gallery.media.S3MediaStore'})
+class S3MediaStoreTestCase(SimpleTestCase):
+    """
+    Test `gallery.media.S3MediaStore` terhadap S3 tiruan (moto).
+    """
+    def setUp(self):
+        self.mock = mock_aws()
+        self.mock.start()
+        self.addCleanup(self.mock.stop)
+        boto3.client('s3', region_name='us-east-1').create_bucket(Bucket=S3_BUCKET)
+        self.store = get_media_store()
+
+    def put(self, name, content):
+        path = self.store.temp_path()
+        with open(path, 'wb') as f:
+            f.write(content)
+        saved = self.store.put_file(path, name)
+        self.assertFalse(os.path.exists(path))
+        return saved
+
+    def test_save_open_exists_delete(self):
+        self.assertEqual(self.put('albums/a/one.jpg', b'one'), 'albums/a/one.jpg')
+
+        self.assertTrue(self.store.exists('albums/a/one.jpg'))
+        with self.store.open('albums/a/one.jpg') as f:
+            self.assertEqual(f.read(), b'one')
+        with self.store.local_copy('albums/a/one.jpg') as path:
+            with open(path, 'rb') as f:
+                self.assertEqual(f.read(), b'one')
+
+        # Menimpa file dengan nama yang sama
+        self.put('albums/a/one.jpg', b'two')
+        with self.store.open('albums/a/one.jpg') as f:
+            self.assertEqual(f.read(), b'two')
+
+        self.assertEqual(self.store.delete_many(['albums/a/one.jpg']), 1)
+        self.assertFalse(self.store.exists('albums/a/one.jpg'))
+
+    def test_url_and_local_path(self):
+        self.put('albums/a/one.jpg', b'one')
+
+        self.assertIsNone(self.store.local_path('albums/a/one.jpg'))
+        self.assertEqual(self.store.url('albums/a/one.jpg'), f'https://{S3_BUCKET}.s3.amazonaws.com/albums/a/one.jpg')
+
+    def test_list_and_move_prefix(self):
+        self.put('albums/a/one.jpg', b'one')
+        self.put('albums/a/sub/two.jpg', b'two')
+        self.put('albums/ab/three.jpg', b'three')
+
+        self.assertEqual(sorted(self.store.list_prefix('albums/a/')), ['albums/a/one.jpg', 'albums/a/sub/two.jpg'])
+
+        self.assertEqual(self.store.move_prefix('albums/a/', 'albums/b/'), 2)
+        self.assertEqual(self.store.list_prefix('albums/a/'), [])
+        self.assertEqual(sorted(self.store.list_prefix('albums/b/')), ['albums/b/one.jpg', 'albums/b/sub/two.jpg'])
+        with self.store.open('albums/b/sub/two.jpg') as f:
+            self.assertEqual(f.read(), b'two')
+        self.assertTrue(self.store.exists('albums/ab/three.jpg'))
+
+        # Sumber yang tidak ada diabaikan
+        self.assertEqual(self.store.move_many([('albums/missing.jpg', 'albums/other.jpg')]), 0)
+
+    def test_serve_media_redirects_to_storage(self):
+        self.put('albums/a/one.jpg', b'one')
+
+        response = serve_media(RequestFactory().get('/media/albums/a/one.jpg'), 'albums/a/one.jpg')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], self.store.url('albums/a/one.jpg'))
+
+
+class SQLiteCacheTestCase(SimpleTestCase):
+    """
+    Test backend cache `gallery.cache.SQLiteCache`.
+    """
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.location = os.path.join(directory.name, 'cache.sqlite3')
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        return SQLiteCache(self.location, {'OPTIONS': options})
+
+    def stored_type(self, key):
+        return self.cache._connection().execute(
+            'SELECT typeof(value) FROM cache_entries WHERE cache_key = ?',
+            (self.cache.make_key(key),)
+        ).fetchone()[0]
+
+    def test_set_get_delete(self):
+        self.cache.set('a', {'total': 1})
+        self.cache.set('b', [1, 2])
+
+        self.assertEqual(self.cache.get('a'), {'total': 1})
+        self.assertEqual(self.cache.get('missing', 'default'), 'default')
+        self.assertEqual(self.cache.get_many(['a', 'b', 'missing']), {'a': {'total': 1}, 'b': [1, 2]})
+        self.assertTrue(self.cache.has_key('a'))
+
+        self.assertTrue(self.cache.delete('a'))
+        self.assertFalse(self.cache.delete('a'))
+        self.assertIsNone(self.cache.get('a'))
+
+        # timeout=0 menghapus key, sama seperti backend Django lain
+        self.cache.set('b', 1, 0)
+        self.assertFalse(self.cache.has_key('b'))
+
+    def test_add(self):
+        self.assertTrue(self.cache.add('a', 1))
+        self.assertFalse(self.cache.add('a', 2))
+        self.assertEqual(self.cache.get('a'), 1)
+
+    def test_expiry(self):
+        self.cache.set('short', 'value', 0.05)
+        self.cache.set('forever', 'value', None)
+        self.assertEqual(self.cache.get('short'), 'value')
+
+        time.sleep(0.1)
+
+        self.assertIsNone(self.cache.get('short'))
+        self.assertFalse(self.cache.has_key('short'))
+        self.assertEqual(self.cache.get('forever'), 'value')
+        # Key kedaluwarsa dapat di-add ulang
+        self.assertTrue(self.cache.add('short', 'new'))
+        self.assertEqual(self.cache.get('short'), 'new')
+
+    def test_shared_between_instances(self):
+        self.cache.set('a', 1)
+
+        self.assertEqual(self.make_cache().get('a'), 1)
+
+    def test_cull(self):
+        cache = self.make_cache(MAX_ENTRIES=10, CULL_FREQUENCY=2)
+        cache.cull_every = 1
+
+        for index in range(20):
+            cache.set(f'key{index}', index, None if index == 0 else 300 + index)
+
+        count = cache._connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0]
+        self.assertLessEqual(count, 11)
+        # Entri yang paling cepat kedaluwarsa dibuang lebih dulu; tanpa batas paling akhir
+        self.assertEqual(cache.get('key0'), 0)
+        self.assertEqual(cache.get('key19'), 19)
+        self.assertIsNone(cache.get('key1'))
+
+    def test_integers_are_stored_natively(self):
+        self.cache.set('count', 5)
+        self.cache.set('flag', True)
+        self.cache.set('text', '5')
+
+        self.assertEqual(self.stored_type('count'), 'integer')
+        self.assertEqual(self.stored_type('flag'), 'blob')
+        self.assertEqual(self.stored_type('text'), 'blob')
+        self.assertIs(self.cache.get('flag'), True)
+        self.assertEqual(self.cache.get('text'), '5')
+
+    def test_incr_decr(self):
+        self.cache.set('count', 5)
+
+        self.assertEqual(self.cache.incr('count'), 6)
+        self.assertEqual(self.cache.incr('count', 10), 16)
+        self.assertEqual(self.cache.decr('count', 3), 13)
+        self.assertEqual(self.cache.get('count'), 13)
+        self.assertEqual(self.stored_type('count'), 'integer')
+
+    def test_incr_decr_missing_key(self):
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        with self.assertRaises(ValueError):
+            self.cache.decr('missing')
+
+        self.cache.set('expired', 1, 0.05)
+        time.sleep(0.1)
+        with self.assertRaises(ValueError):
+            self.cache.incr('expired')
+
+    def test_incr_non_integer(self):
+        self.cache.set('text', 'abc')
+        self.cache.set('float', 1.5)
+
+        with self.assertRaises(TypeError):
+            self.cache.incr('text')
+        self.assertEqual(self.cache.get('text'), 'abc')
+        self.assertEqual(self.cache.incr('float'), 2.5)
+        self.assertEqual(self.cache.get('float'), 2.5)
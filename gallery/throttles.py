@@ -1,6 +1,46 @@
 from rest_framework.throttling import UserRateThrottle
 
-class PetugasRateThrottle(UserRateThrottle):
+class AtomicWindowThrottleMixin:
+    """
+    Throttle fixed-window yang memakai `cache.add` + `cache.incr`.
+
+    Implementasi bawaan DRF membaca riwayat timestamp, menambah satu entri lalu
+    menulisnya kembali, sehingga request paralel dari beberapa worker dapat
+    saling menimpa. Dengan counter per jendela waktu yang dinaikkan secara
+    atomik oleh backend cache bersama (`gallery.cache.SQLiteCache`), limit
+    berlaku untuk seluruh worker sekaligus.
+    """
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        self.window_start = int(self.now // self.duration * self.duration)
+        window_key = f'{self.key}:{self.window_start}'
+
+        self.cache.add(window_key, 0, self.duration)
+        try:
+            count = self.cache.incr(window_key)
+        except ValueError:
+            # Counter kedaluwarsa di antara add dan incr
+            self.cache.set(window_key, 1, self.duration)
+            count = 1
+
+        if count > self.num_requests:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        return max(self.window_start + self.duration - self.now, 0)
+
+class PetugasRateThrottle(AtomicWindowThrottleMixin, UserRateThrottle):
     """
     Throttle untuk petugas dengan rate limit 1000/day.
     Membatasi jumlah request yang dapat dilakukan oleh petugas.
@@ -15,7 +55,7 @@ class PetugasRateThrottle(UserRateThrottle):
             }
         return None
 
-class AdminRateThrottle(UserRateThrottle):
+class AdminRateThrottle(AtomicWindowThrottleMixin, UserRateThrottle):
     """
     Throttle untuk admin dengan rate limit 5000/day.
     Membatasi jumlah request yang dapat dilakukan oleh admin.
@@ -1,13 +1,15 @@
 # urls.py
 
+import re
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, re_path, include
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
 )
 from django.conf import settings
-from django.conf.urls.static import static
+from gallery.serving import serve_media
 
 # Definisi pola URL utama untuk proyek Django
 urlpatterns = [
@@ -45,8 +47,11 @@ urlpatterns = [
     path('api/dashboard/', include('dashboard.urls')),
     
     path('api/assistant/', include('assistant.urls')),
-]  + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
 
-# Menambahkan URL untuk melayani file media saat mode DEBUG aktif
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# File media (Range, ETag, cache header; lihat gallery.serving). Di production
+# pengiriman file dapat diserahkan ke nginx lewat MEDIA_SERVING.
+if settings.MEDIA_URL.startswith('/'):
+    urlpatterns += [
+        re_path(rf"^{re.escape(settings.MEDIA_URL.lstrip('/'))}(?P<path>.*)$", serve_media, name='media'),
+    ]
@@ -0,0 +1,65 @@
+# gallery/versions.py - Versi data per tabel untuk validator HTTP dan cache respons
+
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+DEFAULT_VERSION_SETTINGS = {
+    'CACHE': 'default',
+}
+
+KEY_PREFIX = 'table-version'
+
+
+def get_version_settings():
+    return {**DEFAULT_VERSION_SETTINGS, **getattr(settings, 'TABLE_VERSIONS', {})}
+
+
+def _cache():
+    return caches[get_version_settings()['CACHE']]
+
+
+def _key(table):
+    return f'{KEY_PREFIX}:{table}'
+
+
+def bump(*tables):
+    """
+    Menandai bahwa isi tabel berubah. Versi baru adalah timestamp (nanodetik)
+    perubahan terakhir, sehingga sekaligus dapat dipakai sebagai Last-Modified.
+
+    Versi diperbarui setelah transaksi aktif di-commit, agar request lain tidak
+    membaca versi baru bersama data lama.
+
+    Args:
+        *tables: Nama tabel logis, misalnya 'albums' atau 'photos'.
+    """
+    keys = [_key(table) for table in tables]
+    if keys:
+        transaction.on_commit(lambda: _cache().set_many(dict.fromkeys(keys, time.time_ns()), None))
+
+
+def get_versions(tables):
+    """
+    Mengambil versi beberapa tabel dengan satu pembacaan cache.
+
+    Versi yang belum ada (cache baru atau entri dibuang oleh cull) diisi dengan
+    waktu saat ini, sehingga nilainya tidak pernah kembali ke versi lama.
+
+    Returns:
+        dict: Nama tabel -> versi (int, nanodetik).
+    """
+    cache = _cache()
+    keys = {_key(table): table for table in tables}
+    found = cache.get_many(list(keys))
+    versions = {}
+    for key, table in keys.items():
+        value = found.get(key)
+        if value is None:
+            now = time.time_ns()
+            cache.add(key, now, None)
+            value = cache.get(key) or now
+        versions[table] = value
+    return versions
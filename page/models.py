@@ -5,6 +5,9 @@ from django.utils.text import slugify
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .utils import rename_page_folder, create_page_folder, delete_page_folder
+from dashboard import counters
+from gallery import versions
+from gallery.ordering import SequenceOrdering
 
 
 class Page(models.Model):
@@ -28,6 +31,8 @@ class Page(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     sequence_number = models.PositiveIntegerField(blank=True, null=True)
 
+    sequence_order = SequenceOrdering(version_table='pages')  # Urutan halaman (lihat gallery.ordering)
+
     def save(self, *args, **kwargs):
         """
         Override method save untuk mengatur slug dan mengelola folder halaman.
@@ -99,27 +104,31 @@ def set_sequence_number(sender, instance, **kwargs):
         None
     """
     if not instance.pk:  # Hanya untuk instance baru
-        last_sequence = Page.objects.aggregate(models.Max('sequence_number'))['sequence_number__max']
-        instance.sequence_number = (last_sequence or 0) + 1
+        Page.sequence_order.assign(instance)
+
+
+# Signal untuk memperbarui counter dashboard (total dan active/inactive)
+@receiver(pre_save, sender=Page)
+def remember_page_active(sender, instance, update_fields=None, **kwargs):
+    """
+    Menyimpan status is_active halaman sebelum disimpan untuk mendeteksi perubahan status.
+    """
+    counters.remember_previous(instance, 'is_active', update_fields)
+
+
+@receiver(post_save, sender=Page)
+def count_page_saved(sender, instance, created, **kwargs):
+    """
+    Memperbarui counter dashboard setelah halaman dibuat atau status aktifnya berubah.
+    """
+    counters.count_saved('pages', instance, created, 'is_active', counters.ACTIVE_BUCKETS)
+    versions.bump('pages')
 
 
-# Signal untuk mengatur ulang sequence_number setelah menghapus halaman
 @receiver(post_delete, sender=Page)
-def reorder_sequence_numbers(sender, instance, **kwargs):
+def count_page_deleted(sender, instance, **kwargs):
     """
-    Signal handler yang dipanggil setelah Page dihapus.
-    Mengatur ulang sequence_number untuk semua Page dalam urutan yang benar.
-    
-    Args:
-        sender (Model): Model yang mengirim signal.
-        instance (Page): Instance Page yang telah dihapus.
-        **kwargs: Argumen kata kunci tambahan.
-    
-    Returns:
-        None
+    Memperbarui counter dashboard setelah halaman dihapus.
     """
-    pages = Page.objects.order_by('sequence_number')  # Ambil semua halaman terurut berdasarkan sequence_number
-    for index, page in enumerate(pages):
-        if page.sequence_number != index + 1:
-            page.sequence_number = index + 1  # Perbarui sequence_number agar berurutan
-            page.save(update_fields=['sequence_number'])  # Simpan perubahan pada sequence_number
+    counters.count_deleted('pages', instance, 'is_active', counters.ACTIVE_BUCKETS)
+    versions.bump('pages')
@@ -2,7 +2,7 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PageViewSet, PublicPageView, PublicPageDetailView
+from .views import PageViewSet, PublicPageView, PublicPageDetailView, PageMoveView
 
 # Inisialisasi router DefaultRouter dari Django REST Framework
 router = DefaultRouter()
@@ -17,6 +17,9 @@ urlpatterns = [
     # Endpoint untuk mendapatkan detail halaman publik berdasarkan slug
     path('public/<str:slug>/', PublicPageDetailView.as_view(), name='public-page-detail'),
     
+    # Endpoint untuk memindahkan urutan beberapa halaman sekaligus (sebelum router agar tidak dianggap pk)
+    path('move/', PageMoveView.as_view(), name='page-move'),
+    
     # Menyertakan semua URL yang didefinisikan oleh router untuk PageViewSet
     path('', include(router.urls)),
 ]
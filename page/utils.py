@@ -1,34 +1,39 @@
 # page/utils.py
 
-import os
-import shutil
-from django.conf import settings
+from gallery.media import get_media_store
+
+
+def page_prefix(slug):
+    """
+    Prefix folder halaman di storage media (lihat `gallery.media`).
+    """
+    return f'pages/{slug}/'
 
 
 def create_page_folder(slug):
     """
     Membuat folder untuk halaman berdasarkan slug yang diberikan.
 
-    Fungsi ini membuat direktori untuk halaman di dalam direktori 'pages' pada MEDIA_ROOT.
-    Jika direktori sudah ada, tidak ada tindakan yang diambil.
+    Fungsi ini menyiapkan folder halaman di dalam 'pages' pada storage media.
+    Jika folder sudah ada (atau storage tidak mengenal folder), tidak ada tindakan yang diambil.
 
     Args:
         slug (str): Slug dari halaman yang akan dibuat foldernya.
 
     Returns:
-        str: Path lengkap dari folder yang dibuat.
+        str: Prefix relatif folder halaman.
     """
-    folder_path = os.path.join(settings.MEDIA_ROOT, 'pages', slug)
-    os.makedirs(folder_path, exist_ok=True)
-    return folder_path
+    prefix = page_prefix(slug)
+    get_media_store().ensure_prefix(prefix)
+    return prefix
 
 
 def rename_page_folder(old_slug, new_slug):
     """
     Mengganti nama folder halaman saat slug halaman berubah.
 
-    Fungsi ini mengganti nama direktori halaman dari `old_slug` ke `new_slug`.
-    Jika direktori lama tidak ada, tidak ada tindakan yang diambil.
+    Fungsi ini memindahkan seluruh file halaman dari `old_slug` ke `new_slug` lewat MediaStore.
+    Jika folder lama tidak ada, tidak ada tindakan yang diambil.
 
     Args:
         old_slug (str): Slug lama dari halaman.
@@ -37,18 +42,15 @@ def rename_page_folder(old_slug, new_slug):
     Returns:
         None
     """
-    old_folder_path = os.path.join(settings.MEDIA_ROOT, 'pages', old_slug)
-    new_folder_path = os.path.join(settings.MEDIA_ROOT, 'pages', new_slug)
-    if os.path.exists(old_folder_path):
-        os.rename(old_folder_path, new_folder_path)
+    get_media_store().move_prefix(page_prefix(old_slug), page_prefix(new_slug))
 
 
 def delete_page_folder(slug):
     """
     Menghapus folder halaman beserta seluruh isinya berdasarkan slug yang diberikan.
 
-    Fungsi ini menghapus direktori halaman dari MEDIA_ROOT jika direktori tersebut ada.
-    Menggunakan `shutil.rmtree` untuk menghapus folder dan semua isinya secara rekursif.
+    Fungsi ini menghapus seluruh file di folder halaman dari storage media
+    (satu `rmtree` untuk storage lokal, penghapusan batch untuk object storage).
 
     Args:
         slug (str): Slug dari halaman yang akan dihapus foldernya.
@@ -56,7 +58,6 @@ def delete_page_folder(slug):
     Returns:
         None
     """
-    folder_path = os.path.join(settings.MEDIA_ROOT, 'pages', slug)
-    if os.path.exists(folder_path):
+    if slug:
         # Menghapus folder beserta seluruh isinya
-        shutil.rmtree(folder_path)  # Menghapus folder dan semua isinya
+        get_media_store().delete_prefix(page_prefix(slug))
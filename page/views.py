@@ -8,9 +8,12 @@ from .serializers import PageSerializer
 from .utils import create_page_folder, delete_page_folder, rename_page_folder
 from django.utils.text import slugify
 from gallery.throttles import AdminRateThrottle
+from gallery.conditional import ConditionalGetMixin
+from gallery.ordering_views import SequenceMoveView
+from gallery.response_cache import CachedResponseMixin
 
 
-class PublicPageView(generics.ListAPIView):
+class PublicPageView(ConditionalGetMixin, CachedResponseMixin, generics.ListAPIView):
     """
     View untuk menampilkan daftar semua halaman yang bersifat publik.
 
@@ -22,6 +25,7 @@ class PublicPageView(generics.ListAPIView):
     queryset = Page.objects.filter(is_active=True)
     serializer_class = PageSerializer
     permission_classes = [AllowAny]
+    version_tables = ('pages',)
 
     def list(self, request, *args, **kwargs):
         """
@@ -284,3 +288,15 @@ class PublicPageDetailView(generics.RetrieveAPIView):
                 "message": "Page not found",
                 "data": None
             }, status=status.HTTP_404_NOT_FOUND)
+
+
+class PageMoveView(SequenceMoveView):
+    """
+    View untuk memindahkan urutan beberapa halaman sekaligus.
+
+    Body: `{"ids": [...], "after": id}` atau `{"ids": [...], "before": id}`
+    (lihat `gallery.ordering_views.SequenceMoveView`).
+    """
+    queryset = Page.objects.all()
+    permission_classes = [IsAdmin]
+    throttle_classes = [AdminRateThrottle]
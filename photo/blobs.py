@@ -0,0 +1,168 @@
+# photo/blobs.py - Jumlah referensi dan garbage collection blob foto
+
+import logging
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, When
+
+from gallery.media import get_media_store
+
+from .models import PhotoBlob
+from .renditions import delete_renditions
+from .storage import blob_sha256, is_blob_name
+
+logger = logging.getLogger(__name__)
+
+
+def _blob_counts(names):
+    return Counter(name for name in names if is_blob_name(name))
+
+
+def _apply_delta(counts, sign):
+    if not counts:
+        return
+    PhotoBlob.objects.filter(name__in=counts).update(
+        ref_count=F('ref_count') + Case(
+            *[When(name=name, then=sign * count) for name, count in counts.items()],
+            default=0,
+            output_field=IntegerField(),
+        )
+    )
+
+
+def register(names):
+    """
+    Memastikan setiap blob memiliki baris `PhotoBlob` (ref_count 0 untuk blob
+    baru) dengan satu query. Blob yang terdaftar tetapi tidak pernah dipakai
+    akan dihapus oleh `collect_garbage`.
+    """
+    counts = _blob_counts(names)
+    if counts:
+        PhotoBlob.objects.bulk_create(
+            [PhotoBlob(name=name) for name in counts],
+            ignore_conflicts=True,
+        )
+    return counts
+
+
+def _lock_rows(names):
+    # Urutan nama tetap agar dua transaksi tidak saling menunggu (deadlock)
+    list(
+        PhotoBlob.objects.select_for_update()
+        .filter(name__in=names)
+        .order_by('name')
+        .values_list('pk', flat=True)
+    )
+
+
+@contextmanager
+def lock_blob(name):
+    """
+    Mengunci baris `PhotoBlob` sebuah blob (dibuat dengan ref_count 0 jika
+    belum ada) selama blok berjalan.
+
+    Dipakai saat file blob ditulis (`ContentAddressedStorage.place`), sehingga
+    penulisan tidak dapat terjadi di antara pemeriksaan dan penghapusan blob
+    oleh `collect_garbage`.
+    """
+    with transaction.atomic():
+        register([name])
+        _lock_rows([name])
+        yield
+
+
+def acquire(names):
+    """
+    Menambah jumlah referensi blob. Nama yang sama boleh muncul beberapa kali
+    (beberapa foto dengan gambar identik). Path non-blob (foto lama di
+    `albums/<slug>/`) diabaikan.
+
+    Baris blob dikunci lebih dulu, sehingga acquire menunggu `collect_garbage`
+    yang sedang menghapus blob yang sama (dan sebaliknya).
+    """
+    counts = _blob_counts(names)
+    if not counts:
+        return
+    with transaction.atomic():
+        register(counts)
+        _lock_rows(counts)
+        _apply_delta(counts, 1)
+
+
+def release(names):
+    """
+    Mengurangi jumlah referensi blob. File blob tidak langsung dihapus.
+    """
+    _apply_delta(_blob_counts(name for name in names if name), -1)
+
+
+def discard_photo_file(photo):
+    """
+    Menghapus file milik foto yang akan dihapus atau diganti.
+
+    File lama di folder album (bukan blob) langsung dihapus beserta variannya.
+    Blob dapat dipakai foto lain, sehingga hanya dilepas lewat jumlah
+    referensi (signal Photo) dan dihapus oleh `collect_garbage`.
+    """
+    if not photo.photo or is_blob_name(photo.photo.name):
+        return
+    get_media_store().delete_many([photo.photo.name])
+    delete_renditions(photo)
+
+
+def _older_than(store, name, cutoff):
+    try:
+        return store.get_modified_time(name).timestamp() < cutoff
+    except (FileNotFoundError, OSError):
+        return True
+
+
+def collect_garbage(grace_seconds=3600, dry_run=False):
+    """
+    Menghapus blob yang tidak lagi dipakai foto mana pun.
+
+    Blob hanya dihapus jika `ref_count` <= 0 dan file-nya tidak diubah selama
+    `grace_seconds`. Upload yang menulis ulang blob yang sama memperbarui mtime
+    file, sehingga blob yang baru dipakai lagi tidak ikut terhapus. File
+    sementara MediaStore yang lebih tua dari grace period (upload yang
+    terputus) juga dihapus.
+
+    Returns:
+        dict: Jumlah blob dan file sementara yang dihapus.
+    """
+    store = get_media_store()
+    cutoff = time.time() - grace_seconds
+    removed = 0
+    candidates = PhotoBlob.objects.filter(ref_count__lte=0).values_list('pk', 'name')
+    for pk, name in candidates.iterator():
+        if not _older_than(store, name, cutoff):
+            continue
+        if dry_run:
+            removed += 1
+            continue
+        # Baris dikunci dan diperiksa ulang sebelum file dihapus. Upload blob
+        # yang sama (`lock_blob`) dan `acquire` menunggu kunci ini, sehingga
+        # blob yang baru ditulis ulang atau dipakai lagi tidak ikut terhapus.
+        with transaction.atomic():
+            locked = PhotoBlob.objects.select_for_update().filter(pk=pk, ref_count__lte=0)
+            if not list(locked.values_list('pk', flat=True)) or not _older_than(store, name, cutoff):
+                continue
+            variants = store.list_prefix(f'{os.path.dirname(name)}/{blob_sha256(name)}_')
+            locked.delete()
+            store.delete_many([name, *variants])
+        removed += 1
+
+    incoming_removed = 0
+    if os.path.isdir(store.scratch_dir):
+        for entry in os.scandir(store.scratch_dir):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                if not dry_run:
+                    os.remove(entry.path)
+                incoming_removed += 1
+
+    logger.info(f"Blob garbage collection removed {removed} blobs and {incoming_removed} incoming files")
+    return {'blobs': removed, 'incoming': incoming_removed}
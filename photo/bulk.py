@@ -0,0 +1,111 @@
+# photo/bulk.py - Penyimpanan banyak foto sekaligus dengan jumlah query konstan
+
+import logging
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+
+from album.models import Album
+from dashboard import counters
+from gallery import versions
+from gallery.ordering import MAX_SEQUENCE
+
+from . import blobs
+from .models import Photo
+from .renditions import schedule_renditions
+
+logger = logging.getLogger(__name__)
+
+
+def reserve_sequence_range(album, count):
+    """
+    Mengunci baris album dan memesan `count` kunci urutan di akhir album untuk
+    foto baru dalam satu query (SELECT ... FOR UPDATE dengan subquery MAX dan
+    COUNT). Kunci berjarak `Photo.sequence_order.gap` (lihat `gallery.ordering`).
+
+    Harus dipanggil di dalam transaksi; upload lain ke album yang sama akan
+    menunggu sampai transaksi selesai sehingga rentang kunci tidak bertabrakan.
+
+    Returns:
+        tuple: (album yang terkunci, daftar kunci urutan, jumlah foto yang sudah ada)
+    """
+    last_sequence = Subquery(
+        Photo.objects.filter(album=OuterRef('pk'), sequence_number__isnull=False)
+        .order_by('-sequence_number')
+        .values('sequence_number')[:1]
+    )
+    photo_count = Subquery(
+        Photo.objects.filter(album=OuterRef('pk'))
+        .order_by()
+        .values('album')
+        .annotate(count=Count('pk'))
+        .values('count')
+    )
+    locked = (
+        Album.objects.select_for_update(of=('self',))
+        .annotate(last_sequence=last_sequence, photo_count=photo_count)
+        .only('id', 'title', 'cover_photo_id')
+        .get(pk=album.pk)
+    )
+    ordering = Photo.sequence_order
+    first = (locked.last_sequence or 0) + ordering.gap
+    if first + ordering.gap * (count - 1) > MAX_SEQUENCE:
+        keys = ordering.reserve({'album_id': locked.pk}, count)
+    else:
+        keys = [first + ordering.gap * index for index in range(count)]
+    return locked, keys, locked.photo_count or 0
+
+
+def bulk_create_photos(album, uploaded_by, entries):
+    """
+    Menyimpan banyak foto ke satu album dengan jumlah query yang konstan.
+
+    - Kunci urutan dipesan sekaligus (`reserve_sequence_range`).
+    - Semua baris disimpan dengan satu `bulk_create`.
+    - Cover album diatur sekali dengan UPDATE jika album belum memiliki cover
+      (tanpa `album.save()` sehingga signal path album tidak berjalan).
+    - Hook setelah upload (counter dashboard, pembuatan varian ukuran)
+      dijalankan sekali per batch setelah transaksi di-commit.
+
+    `bulk_create` tidak mengirim signal post_save, sehingga hook di atas
+    menggantikan `set_album_cover` dan `count_photo_saved` (termasuk versi
+    tabel untuk ETag), dan jumlah
+    referensi blob ditambah sekali untuk seluruh batch (`blobs.acquire`).
+
+    Args:
+        album (Album): Album tujuan.
+        uploaded_by (User): Pengguna yang mengunggah.
+        entries (list): Dictionary berisi `photo` (path relatif atau file),
+            serta `title` dan `description` opsional.
+
+    Returns:
+        list: Instance Photo yang dibuat, sesuai urutan `entries`.
+    """
+    if not entries:
+        return []
+
+    with transaction.atomic():
+        album, sequence_keys, existing = reserve_sequence_range(album, len(entries))
+
+        photos = []
+        for offset, (entry, sequence_number) in enumerate(zip(entries, sequence_keys)):
+            photos.append(Photo(
+                title=entry.get('title') or f"Photo {existing + offset + 1}",
+                description=entry.get('description') or "No description provided",
+                photo=entry['photo'],
+                album=album,
+                uploaded_by=uploaded_by,
+                sequence_number=sequence_number,
+            ))
+        photos = Photo.objects.bulk_create(photos)
+        blobs.acquire([photo.photo.name for photo in photos])
+
+        if album.cover_photo_id is None:
+            Album.objects.filter(pk=album.pk, cover_photo__isnull=True).update(cover_photo=photos[0])
+
+        counters.schedule_deltas({'photos.total': len(photos)})
+        versions.bump('photos', 'albums')
+        schedule_renditions(photos)
+
+    logger.info(f"Bulk created {len(photos)} photos in album {album.pk}")
+    return photos
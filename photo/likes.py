@@ -0,0 +1,300 @@
+# photo/likes.py - Counter like foto tanpa row lock
+
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from gallery import versions
+
+from .models import Photo, PhotoLikeShard
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIKE_SETTINGS = {
+    'BACKEND': 'photo.likes.BufferedLikeCounter',
+    'FLUSH_INTERVAL_MS': 1000,
+    'SHARDS': 0,
+    'HOT_THRESHOLD': 20,
+    'FOLD_INTERVAL_MS': 60000,
+}
+
+
+def apply_like_delta(photo_id, delta):
+    """
+    Menerapkan perubahan like langsung pada baris Photo dengan UPDATE atomik
+    (likes = MAX(likes + delta, 0)) tanpa membaca baris lebih dulu.
+    """
+    if delta:
+        Photo.objects.filter(pk=photo_id).update(likes=Greatest(F('likes') + delta, Value(0)))
+
+
+def apply_shard_delta(photo_id, delta, shards):
+    """
+    Menerapkan perubahan like pada salah satu shard acak milik foto.
+    """
+    shard = random.randrange(shards)
+    updated = PhotoLikeShard.objects.filter(photo_id=photo_id, shard=shard).update(count=F('count') + delta)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            PhotoLikeShard.objects.create(photo_id=photo_id, shard=shard, count=delta)
+    except IntegrityError:
+        # Shard dibuat oleh worker lain di antara UPDATE dan INSERT
+        PhotoLikeShard.objects.filter(photo_id=photo_id, shard=shard).update(count=F('count') + delta)
+
+
+def fold_like_shards():
+    """
+    Memindahkan total seluruh shard ke `Photo.likes` lalu menghapus shard.
+
+    Returns:
+        int: Jumlah foto yang diperbarui.
+    """
+    with transaction.atomic():
+        shards = list(PhotoLikeShard.objects.select_for_update().values_list('pk', 'photo_id', 'count'))
+        if not shards:
+            return 0
+        totals = defaultdict(int)
+        for _, photo_id, count in shards:
+            totals[photo_id] += count
+        PhotoLikeShard.objects.filter(pk__in=[pk for pk, _, _ in shards]).delete()
+        for photo_id, delta in totals.items():
+            apply_like_delta(photo_id, delta)
+        versions.bump('photos')
+    return len(totals)
+
+
+class DirectLikeCounter:
+    """
+    Counter yang langsung menjalankan UPDATE atomik untuk setiap like/unlike.
+    """
+    def __init__(self, **options):
+        self.shards = int(options.get('shards', 0))
+
+    def add(self, photo_id, delta):
+        apply_like_delta(photo_id, delta)
+        versions.bump('photos')
+
+    def pending(self, photo_id):
+        return 0
+
+    def get_count(self, photo_id):
+        """
+        Jumlah like foto: nilai di database, total shard dan perubahan yang
+        belum di-flush. Nilainya eventually consistent.
+
+        Returns:
+            int | None: Jumlah like, atau None jika foto tidak ditemukan.
+        """
+        queryset = Photo.objects.filter(pk=photo_id)
+        if self.shards:
+            row = (
+                queryset.annotate(shard_total=Coalesce(Sum('like_shards__count'), 0))
+                .values_list('likes', 'shard_total').first()
+            )
+        else:
+            row = queryset.values_list('likes').first()
+        if row is None:
+            return None
+        return max(0, sum(row) + self.pending(photo_id))
+
+    def flush(self):
+        return 0
+
+    def shutdown(self):
+        pass
+
+    def stats(self):
+        return {'backend': type(self).__name__, 'pending_photos': 0, 'flushed': 0, 'failed': 0}
+
+
+class BufferedLikeCounter(DirectLikeCounter):
+    """
+    Counter yang menggabungkan like/unlike di buffer dalam proses dan
+    menuliskannya dari thread flusher setiap `FLUSH_INTERVAL_MS` milidetik.
+
+    Lonjakan like pada satu foto menjadi satu UPDATE per interval per worker.
+    Perubahan yang gagal ditulis (misalnya error database sementara) kembali
+    ke buffer dan dicoba lagi pada flush berikutnya.
+    Jika `SHARDS` > 0, foto yang perubahannya dalam satu interval mencapai
+    `HOT_THRESHOLD` ditulis ke tabel shard (`PhotoLikeShard`) sehingga worker
+    tidak saling menunggu pada baris Photo yang sama; shard dipindahkan ke
+    `Photo.likes` setiap `FOLD_INTERVAL_MS` milidetik.
+    """
+    def __init__(self, flush_interval_ms=1000, shards=0, hot_threshold=20, fold_interval_ms=60000):
+        super().__init__(shards=shards)
+        self.flush_interval = max(1, int(flush_interval_ms)) / 1000.0
+        self.hot_threshold = max(1, int(hot_threshold))
+        self.fold_interval = max(1, int(fold_interval_ms)) / 1000.0
+
+        self.flushed = 0
+        self.failed = 0
+
+        self._reset_process_state()
+        atexit.register(self.shutdown)
+
+    def _reset_process_state(self):
+        """
+        Menyiapkan state per proses. Dipanggil ulang setelah fork karena thread
+        dan lock dari proses induk tidak ikut berjalan di proses anak.
+        """
+        self._pid = os.getpid()
+        self._pending = defaultdict(int)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._worker = None
+        self._last_fold = time.monotonic()
+
+    def _ensure_worker(self):
+        if self._pid != os.getpid():
+            self._reset_process_state()
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._stopping.clear()
+                    self._worker = threading.Thread(
+                        target=self._run,
+                        name='photo-likes-flusher',
+                        daemon=True,
+                    )
+                    self._worker.start()
+
+    def add(self, photo_id, delta):
+        """
+        Menambahkan perubahan like ke buffer tanpa menyentuh database.
+        """
+        self._ensure_worker()
+        with self._lock:
+            self._pending[photo_id] += delta
+
+    def pending(self, photo_id):
+        with self._lock:
+            return self._pending.get(photo_id, 0)
+
+    def flush(self):
+        """
+        Menuliskan seluruh perubahan yang tertampung ke database.
+
+        Returns:
+            int: Jumlah foto yang diperbarui.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, defaultdict(int)
+
+            flushed = 0
+            close_old_connections()
+            try:
+                for photo_id, delta in batch.items():
+                    if not delta:
+                        continue
+                    try:
+                        if self.shards and abs(delta) >= self.hot_threshold:
+                            apply_shard_delta(photo_id, delta, self.shards)
+                        else:
+                            apply_like_delta(photo_id, delta)
+                        flushed += 1
+                    except Exception as e:
+                        # Perubahan dikembalikan ke buffer dan dicoba lagi pada flush berikutnya
+                        with self._lock:
+                            self._pending[photo_id] += delta
+                            self.failed += 1
+                        logger.error(f"Error flushing likes for photo {photo_id}: {str(e)}", exc_info=True)
+
+                if flushed:
+                    # Satu perubahan versi per flush, bukan per foto
+                    versions.bump('photos')
+
+                if self.shards and time.monotonic() - self._last_fold >= self.fold_interval:
+                    self._last_fold = time.monotonic()
+                    fold_like_shards()
+            finally:
+                close_old_connections()
+
+        with self._lock:
+            self.flushed += flushed
+        return flushed
+
+    def _run(self):
+        while not self._stopping.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def shutdown(self, timeout=5.0):
+        """
+        Menghentikan thread flusher dan menuliskan sisa buffer.
+        """
+        if self._pid != os.getpid():
+            return
+        self._stopping.set()
+        worker = self._worker
+        if worker is not None and worker.is_alive() and worker is not threading.current_thread():
+            worker.join(timeout)
+        if self._pending:
+            self.flush()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': type(self).__name__,
+                'pending_photos': len(self._pending),
+                'flushed': self.flushed,
+                'failed': self.failed,
+            }
+
+
+_counter = None
+_counter_lock = threading.Lock()
+
+
+def get_like_counter():
+    """
+    Mengembalikan instance counter like sesuai `settings.PHOTO_LIKES`.
+
+    Returns:
+        DirectLikeCounter | BufferedLikeCounter: Counter aktif.
+    """
+    global _counter
+    if _counter is None:
+        with _counter_lock:
+            if _counter is None:
+                options = {**DEFAULT_LIKE_SETTINGS, **getattr(settings, 'PHOTO_LIKES', {})}
+                counter_class = import_string(options['BACKEND'])
+                _counter = counter_class(
+                    flush_interval_ms=options['FLUSH_INTERVAL_MS'],
+                    shards=options['SHARDS'],
+                    hot_threshold=options['HOT_THRESHOLD'],
+                    fold_interval_ms=options['FOLD_INTERVAL_MS'],
+                )
+    return _counter
+
+
+def reset_like_counter():
+    """
+    Flush dan buang counter aktif agar dibuat ulang dari settings terbaru.
+    """
+    global _counter
+    with _counter_lock:
+        if _counter is not None:
+            _counter.shutdown()
+        _counter = None
+
+
+@receiver(setting_changed)
+def reset_counter_on_setting_change(sender, setting, **kwargs):
+    if setting == 'PHOTO_LIKES':
+        reset_like_counter()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from photo.blobs import collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Delete content-addressed photo blobs that are no longer referenced by any photo'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            default=60,
+            help='Only delete blobs and incoming files untouched for at least this many minutes'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only report what would be deleted'
+        )
+
+    def handle(self, *args, **options):
+        result = collect_garbage(options['grace_minutes'] * 60, dry_run=options['dry_run'])
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {result['blobs']} unreferenced blobs and {result['incoming']} stale incoming files"
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from photo.models import Photo
+from photo.renditions import render_photo
+
+
+class Command(BaseCommand):
+    help = 'Generate thumbnail and responsive renditions for existing photos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerate renditions for every photo, not only photos without renditions'
+        )
+        parser.add_argument(
+            '--album',
+            type=int,
+            help='Only process photos in this album ID'
+        )
+
+    def handle(self, *args, **options):
+        photos = Photo.objects.order_by('pk')
+        if not options['all']:
+            photos = photos.filter(renditions={})
+        if options['album']:
+            photos = photos.filter(album_id=options['album'])
+
+        generated = failed = 0
+        for photo_id in photos.values_list('pk', flat=True).iterator():
+            if render_photo(photo_id, force=options['all']) is None:
+                failed += 1
+            else:
+                generated += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Generated renditions for {generated} photos'))
+        if failed:
+            self.stdout.write(self.style.WARNING(f'Failed for {failed} photos (see log)'))
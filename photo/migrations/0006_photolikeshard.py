@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-18 14:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photo', '0005_photo_likes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PhotoLikeShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('shard', models.PositiveSmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('photo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='like_shards', to='photo.photo')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('photo', 'shard'), name='photo_like_shard_unique')],
+            },
+        ),
+    ]
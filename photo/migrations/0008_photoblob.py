@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-18 15:05
+
+import photo.models
+import photo.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('photo', '0007_photo_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PhotoBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='photo',
+            name='photo',
+            field=models.ImageField(storage=photo.storage.get_photo_storage, upload_to=photo.models.get_album_upload_path),
+        ),
+    ]
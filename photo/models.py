@@ -1,16 +1,18 @@
 # photo/models.py
 
 import os
-import shutil
 from django.db import models
 from album.models import Album
 from users.models import User
 from django.utils.text import slugify
-from django.conf import settings
 from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from photo.utils import refresh_photo_paths, hash_filename
-from django.db.models import Max
+from photo import paths
+from photo.storage import get_photo_storage
+from gallery.media import get_media_store
+from dashboard import counters
+from gallery import versions
+from gallery.ordering import SequenceOrdering
 
 
 # Fungsi untuk mendapatkan path penyimpanan foto berdasarkan album
@@ -36,39 +38,51 @@ class Photo(models.Model):
         uploaded_by (ForeignKey): Relasi ke model User yang mengupload foto.
         sequence_number (PositiveIntegerField): Nomor urut foto dalam album.
         likes (PositiveIntegerField): Jumlah likes yang diterima foto.
+        renditions (JSONField): Nama file varian ukuran foto per ukuran dan format.
     """
     title = models.CharField(max_length=255)
     description = models.TextField()
-    photo = models.ImageField(upload_to=get_album_upload_path)  # Menentukan folder tempat menyimpan foto
+    photo = models.ImageField(upload_to=get_album_upload_path, storage=get_photo_storage)  # Disimpan berdasarkan hash isi, lihat photo.storage
     album = models.ForeignKey(Album, on_delete=models.CASCADE, related_name='photos')
     uploaded_at = models.DateTimeField(auto_now_add=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     sequence_number = models.PositiveIntegerField(blank=True, null=True)
     likes = models.PositiveIntegerField(default=0) 
+    renditions = models.JSONField(default=dict, blank=True)  # Varian ukuran, lihat photo.renditions
+
+    sequence_order = SequenceOrdering(scope=('album',), version_table='photos')  # Urutan foto per album
     
     class Meta:
         ordering = ['sequence_number']  # Mengatur urutan berdasarkan sequence_number
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Menyimpan nama file foto saat dimuat dari database, agar perubahan file
+        dapat dideteksi saat save tanpa query tambahan.
+        """
+        instance = super().from_db(db, field_names, values)
+        if 'photo' in field_names:
+            instance._loaded_photo_name = values[field_names.index('photo')]
+        return instance
+
     def save(self, *args, **kwargs):
         """
         Override method save untuk mengatur sequence_number sebelum menyimpan.
         
-        Jika sequence_number belum diatur, akan diatur ke nilai maksimal sequence_number yang ada + 1.
+        Jika sequence_number belum diatur, foto diletakkan di akhir album (lihat `gallery.ordering`).
         """
-        if self.sequence_number is None:
-            max_sequence = Photo.objects.filter(album=self.album).aggregate(Max('sequence_number'))['sequence_number__max']
-            self.sequence_number = (max_sequence or 0) + 1
+        Photo.sequence_order.assign(self)
         super().save(*args, **kwargs)  # Menyimpan instance
 
     def delete(self, *args, **kwargs):
         """
         Override method delete untuk menangani penghapusan foto.
         
-        Termasuk pengaturan ulang cover_photo pada album jika foto yang dihapus adalah cover,
-        serta mengatur ulang sequence_number foto lainnya dalam album.
+        Termasuk pengaturan ulang cover_photo pada album jika foto yang dihapus adalah cover.
+        sequence_number foto lain tidak diubah; urutan tetap benar dengan kunci berjarak.
         """
         album = self.album
-        sequence_number = self.sequence_number
         
         # Cek apakah foto ini adalah cover album
         is_cover = album.cover_photo == self
@@ -81,13 +95,7 @@ class Photo(models.Model):
             next_photo = Photo.objects.filter(album=album).first()
             if next_photo:
                 album.cover_photo = next_photo
-                album.save()
-        
-        # Sesuaikan urutan foto lain dalam album yang sama
-        Photo.objects.filter(
-            album=album, 
-            sequence_number__gt=sequence_number
-        ).update(sequence_number=models.F('sequence_number') - 1)
+                album.save(update_fields=['cover_photo'])
                           
     def __str__(self):
         """
@@ -98,23 +106,6 @@ class Photo(models.Model):
         """
         return self.title
     
-    @staticmethod
-    def reset_sequence_numbers(album):
-        """
-        Metode statis untuk mengatur ulang sequence_number semua foto dalam album.
-        
-        Args:
-            album (Album): Album yang sequence_number fotonya akan diatur ulang.
-        
-        Returns:
-            None
-        """
-        photos = Photo.objects.filter(album=album).order_by('sequence_number')
-        for index, photo in enumerate(photos, start=1):
-            if photo.sequence_number != index:
-                photo.sequence_number = index
-                photo.save()
-
     @property
     def slug(self):
         """
@@ -123,48 +114,70 @@ class Photo(models.Model):
         return slugify(self.title)
 
 
+class PhotoLikeShard(models.Model):
+    """
+    Counter like tambahan untuk foto yang sangat populer.
+
+    Perubahan like foto "panas" disebar ke beberapa baris shard agar UPDATE
+    dari banyak worker tidak antre pada satu baris Photo. Total shard secara
+    berkala dipindahkan ke `Photo.likes` (lihat `photo.likes.fold_like_shards`).
+
+    Fields:
+        photo (ForeignKey): Foto pemilik counter.
+        shard (PositiveSmallIntegerField): Nomor shard.
+        count (IntegerField): Perubahan like yang belum dipindahkan (bisa negatif).
+    """
+    photo = models.ForeignKey(Photo, on_delete=models.CASCADE, related_name='like_shards')
+    shard = models.PositiveSmallIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['photo', 'shard'], name='photo_like_shard_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.photo_id}#{self.shard}: {self.count}"
+
+
+class PhotoBlob(models.Model):
+    """
+    Jumlah referensi untuk setiap file foto yang disimpan berdasarkan isi
+    (`blobs/ab/cd/<sha256>.<ext>`, lihat `photo.storage`).
+
+    Beberapa foto dengan gambar identik memakai blob yang sama. Blob dengan
+    `ref_count` 0 dihapus oleh garbage collector (`photo.blobs.collect_garbage`).
+
+    Fields:
+        name (CharField): Path relatif blob terhadap MEDIA_ROOT.
+        ref_count (IntegerField): Jumlah foto yang memakai blob ini.
+        updated_at (DateTimeField): Waktu terakhir jumlah referensi berubah.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    ref_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count})"
+
+
 # Signal untuk rename folder foto dan update path foto jika nama album berubah
 @receiver(pre_save, sender=Album)
-def rename_photo_folder(sender, instance, **kwargs):
+def remember_album_slug(sender, instance, update_fields=None, **kwargs):
     """
     Signal handler yang dipanggil sebelum Album disimpan.
-    Mengganti nama folder foto dan memperbarui path foto jika nama album berubah.
+    Menyimpan slug judul album sebelum disimpan untuk mendeteksi perubahan nama.
     
     Args:
         sender (Model): Model yang mengirim signal.
         instance (Album): Instance Album yang akan disimpan.
+        update_fields (frozenset): Argumen update_fields dari save(), jika ada.
         **kwargs: Argumen kata kunci tambahan.
     
     Returns:
         None
     """
-    if instance.pk:
-        try:
-            old_instance = Album.objects.get(pk=instance.pk)
-            old_folder = os.path.join(settings.MEDIA_ROOT, 'albums', slugify(old_instance.title))
-            new_folder = os.path.join(settings.MEDIA_ROOT, 'albums', slugify(instance.title))
-
-            if old_folder != new_folder and os.path.exists(old_folder):
-                os.rename(old_folder, new_folder)  # Rename folder lama ke nama baru
-                
-                # Update path foto-foto di album ini
-                photos = Photo.objects.filter(album=instance)
-                for photo in photos:
-                    # Buat path baru untuk foto
-                    old_photo_path = os.path.join(old_folder, os.path.basename(photo.photo.name))
-                    new_photo_path = os.path.join(new_folder, os.path.basename(photo.photo.name))
-                    
-                    # Jika file foto ada, pindahkan ke folder baru
-                    if os.path.exists(old_photo_path):
-                        os.rename(old_photo_path, new_photo_path)
-
-                    # Update path di database
-                    relative_new_photo_path = os.path.join('albums', slugify(instance.title), os.path.basename(photo.photo.name))
-                    photo.photo.name = relative_new_photo_path  # Simpan path baru di database
-                    photo.save()
-
-        except Album.DoesNotExist:
-            pass
+    paths.remember_album_slug(instance, update_fields)
 
 
 # Signal untuk hapus folder jika album dihapus
@@ -182,17 +195,16 @@ def delete_album_folder(sender, instance, **kwargs):
     Returns:
         None
     """
-    album_folder = os.path.join(settings.MEDIA_ROOT, 'albums', slugify(instance.title))
-    if os.path.exists(album_folder):
-        shutil.rmtree(album_folder)  # Menghapus folder dan semua file di dalamnya
+    get_media_store().delete_prefix(paths.album_prefix(slugify(instance.title)))  # Menghapus folder dan semua file di dalamnya
 
 
-# Signal untuk memanggil refresh_photo_paths() setelah album diupdate
+# Signal untuk memindahkan folder dan path foto setelah judul album berubah
 @receiver(post_save, sender=Album)
 def update_photo_paths_on_album_save(sender, instance, **kwargs):
     """
     Signal handler yang dipanggil setelah Album disimpan.
-    Memanggil fungsi refresh_photo_paths untuk memperbarui path foto.
+    Jika slug judul album berubah, folder album dipindahkan dan path foto album
+    diperbarui dengan satu query (lihat `photo.paths.sync_album_paths`).
     
     Args:
         sender (Model): Model yang mengirim signal.
@@ -202,7 +214,7 @@ def update_photo_paths_on_album_save(sender, instance, **kwargs):
     Returns:
         None
     """
-    refresh_photo_paths()
+    paths.sync_album_paths(instance)
 
 
 # Signal untuk set cover photo jika foto baru diupload
@@ -226,5 +238,101 @@ def set_album_cover(sender, instance, created, **kwargs):
         # Jika album belum memiliki cover photo, gunakan foto ini
         if not album.cover_photo:
             album.cover_photo = instance
-            album.save()
+            album.save(update_fields=['cover_photo'])
+
+
+# Signal untuk memperbarui counter dashboard
+@receiver(post_save, sender=Photo)
+def count_photo_saved(sender, instance, created, **kwargs):
+    """
+    Memperbarui counter dashboard setelah foto dibuat.
+    """
+    counters.count_saved('photos', instance, created)
+    versions.bump('photos')
+
+
+@receiver(post_delete, sender=Photo)
+def count_photo_deleted(sender, instance, **kwargs):
+    """
+    Memperbarui counter dashboard setelah foto dihapus.
+    """
+    counters.count_deleted('photos', instance)
+    versions.bump('photos')
+
+
+# Signal untuk mencatat jumlah referensi blob foto
+@receiver(pre_save, sender=Photo)
+def remember_photo_blob(sender, instance, update_fields=None, **kwargs):
+    """
+    Signal handler yang dipanggil sebelum Photo disimpan.
+    Menyimpan nama file foto sebelum disimpan untuk mendeteksi penggantian file.
+    
+    Args:
+        sender (Model): Model yang mengirim signal.
+        instance (Photo): Instance Photo yang akan disimpan.
+        update_fields (frozenset): Argumen update_fields dari save(), jika ada.
+        **kwargs: Argumen kata kunci tambahan.
+    
+    Returns:
+        None
+    """
+    if update_fields is not None and 'photo' not in update_fields:
+        instance._blob_unchanged = True
+        return
+    instance._blob_unchanged = False
+    if instance._state.adding:
+        instance._previous_photo_name = None
+    elif hasattr(instance, '_loaded_photo_name'):
+        instance._previous_photo_name = instance._loaded_photo_name
+    else:
+        instance._previous_photo_name = (
+            Photo.objects.filter(pk=instance.pk).values_list('photo', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Photo)
+def count_photo_blob_saved(sender, instance, created, **kwargs):
+    """
+    Signal handler yang dipanggil setelah Photo disimpan.
+    Menambah referensi blob baru dan melepas blob lama jika file foto diganti
+    (lihat `photo.blobs`).
+    
+    Args:
+        sender (Model): Model yang mengirim signal.
+        instance (Photo): Instance Photo yang telah disimpan.
+        created (bool): Indikator apakah Photo baru dibuat.
+        **kwargs: Argumen kata kunci tambahan.
+    
+    Returns:
+        None
+    """
+    from photo import blobs
+
+    if getattr(instance, '_blob_unchanged', False):
+        return
+    previous = getattr(instance, '_previous_photo_name', None)
+    current = instance.photo.name
+    if created or previous != current:
+        blobs.acquire([current])
+        blobs.release([previous])
+    instance._loaded_photo_name = current
+
+
+@receiver(post_delete, sender=Photo)
+def count_photo_blob_deleted(sender, instance, **kwargs):
+    """
+    Signal handler yang dipanggil setelah Photo dihapus.
+    Melepas referensi blob foto; file blob dihapus oleh garbage collector
+    setelah tidak ada foto lain yang memakainya.
+    
+    Args:
+        sender (Model): Model yang mengirim signal.
+        instance (Photo): Instance Photo yang telah dihapus.
+        **kwargs: Argumen kata kunci tambahan.
+    
+    Returns:
+        None
+    """
+    from photo import blobs
 
+    blobs.release([instance.photo.name])
@@ -0,0 +1,70 @@
+# photo/paths.py - Pemeliharaan path file foto saat judul album berubah
+
+import logging
+
+from django.db.models import Value
+from django.db.models.functions import Replace
+from django.utils.text import slugify
+
+from gallery import versions
+from gallery.media import get_media_store
+
+logger = logging.getLogger(__name__)
+
+
+def album_prefix(slug):
+    """
+    Prefix path relatif (terhadap root storage media) untuk file di folder album.
+    """
+    return f'albums/{slug}/'
+
+
+def remember_album_slug(instance, update_fields=None):
+    """
+    Dipanggil dari handler pre_save Album untuk menyimpan slug lama album.
+
+    Tidak menjalankan query jika album baru atau jika `update_fields` tidak
+    menyertakan `title` (misalnya saat hanya cover photo yang diperbarui).
+    """
+    if instance._state.adding or instance.pk is None:
+        instance._previous_slug = None
+    elif update_fields is not None and 'title' not in update_fields:
+        instance._previous_slug = slugify(instance.title)
+    else:
+        old_title = type(instance).objects.filter(pk=instance.pk).values_list('title', flat=True).first()
+        instance._previous_slug = slugify(old_title) if old_title is not None else None
+
+
+def move_album_folder(old_slug, new_slug):
+    """
+    Memindahkan seluruh file folder album lewat MediaStore (satu rename untuk
+    storage lokal, copy di sisi server untuk object storage). Jika folder
+    tujuan sudah ada, isinya digabung.
+    """
+    get_media_store().move_prefix(album_prefix(old_slug), album_prefix(new_slug))
+
+
+def sync_album_paths(album):
+    """
+    Dipanggil dari handler post_save Album. Jika slug judul album berubah,
+    folder album dipindahkan dengan satu rename dan path seluruh foto album
+    diperbarui dengan satu query `UPDATE ... SET photo = REPLACE(...)`.
+
+    Returns:
+        int: Jumlah foto yang path-nya diperbarui (0 jika slug tidak berubah).
+    """
+    from .models import Photo
+
+    old_slug = getattr(album, '_previous_slug', None)
+    new_slug = slugify(album.title)
+    album._previous_slug = new_slug
+    if old_slug is None or old_slug == new_slug:
+        return 0
+
+    move_album_folder(old_slug, new_slug)
+    updated = Photo.objects.filter(album=album, photo__startswith=album_prefix(old_slug)).update(
+        photo=Replace('photo', Value(album_prefix(old_slug)), Value(album_prefix(new_slug)))
+    )
+    versions.bump('photos')
+    logger.info(f"Moved album {album.pk} from '{old_slug}' to '{new_slug}' ({updated} photos)")
+    return updated
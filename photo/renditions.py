@@ -0,0 +1,238 @@
+# photo/renditions.py - Pembuatan varian ukuran (thumbnail/responsive) foto
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from PIL import Image, ImageOps, features
+
+from gallery import versions
+from gallery.media import get_media_store
+
+from .models import Photo
+from .storage import is_blob_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RENDITION_SETTINGS = {
+    'SIZES': {'thumb': 320, 'medium': 960, 'large': 1920},
+    'FORMATS': ['jpeg', 'webp', 'avif'],
+    'QUALITY': {'jpeg': 82, 'webp': 80, 'avif': 60},
+    'WORKERS': 2,
+    'ASYNC': True,
+}
+
+FORMAT_EXTENSIONS = {
+    'jpeg': '.jpg',
+    'webp': '.webp',
+    'avif': '.avif',
+}
+
+
+def get_rendition_settings():
+    return {**DEFAULT_RENDITION_SETTINGS, **getattr(settings, 'PHOTO_RENDITIONS', {})}
+
+
+def available_formats():
+    """
+    Format output yang didukung oleh instalasi Pillow saat ini.
+    """
+    return [
+        fmt for fmt in get_rendition_settings()['FORMATS']
+        if fmt == 'jpeg' or features.check(fmt)
+    ]
+
+
+def rendition_filename(photo_name, size_name, fmt):
+    """
+    Nama file varian, diletakkan di folder yang sama dengan file asli.
+
+    Contoh: `albums/event/abc123.jpg` -> `abc123_thumb.webp`.
+    """
+    stem = os.path.splitext(os.path.basename(photo_name))[0]
+    return f'{stem}_{size_name}{FORMAT_EXTENSIONS[fmt]}'
+
+
+def rendition_names(photo):
+    """
+    Daftar path relatif (terhadap MEDIA_ROOT) seluruh varian milik foto.
+    """
+    folder = os.path.dirname(photo.photo.name)
+    return [
+        os.path.join(folder, filename)
+        for variants in (photo.renditions or {}).values()
+        for key, filename in variants.items()
+        if key in FORMAT_EXTENSIONS
+    ]
+
+
+def rendition_urls(photo):
+    """
+    Map varian foto dengan URL lengkap, untuk ditampilkan oleh serializer.
+
+    Returns:
+        dict: Contoh `{'thumb': {'width': 320, 'height': 213, 'jpeg': url, 'webp': url}}`.
+    """
+    folder = os.path.dirname(photo.photo.name)
+    storage = photo.photo.storage
+    return {
+        size_name: {
+            key: storage.url(os.path.join(folder, value)) if key in FORMAT_EXTENSIONS else value
+            for key, value in variants.items()
+        }
+        for size_name, variants in (photo.renditions or {}).items()
+    }
+
+
+def _prepare_image(path):
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ('RGB', 'L'):
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            if image.mode in ('RGBA', 'LA', 'P'):
+                image = image.convert('RGBA')
+                background.paste(image, mask=image.getchannel('A'))
+            else:
+                background.paste(image.convert('RGB'))
+            image = background
+        return image.copy()
+
+
+def generate_renditions(photo, force=False):
+    """
+    Membuat varian ukuran untuk satu foto dan menyimpan daftarnya di
+    `Photo.renditions`.
+
+    Varian tidak pernah lebih besar dari gambar asli. Kolom `renditions`
+    berisi nama file (bukan path lengkap) sehingga tetap valid ketika folder
+    album di-rename. Varian blob (`<sha256>_<size>.<ext>`) dipakai bersama
+    oleh foto dengan gambar identik, sehingga file yang sudah ada tidak
+    dibuat ulang kecuali `force` bernilai True.
+
+    Args:
+        photo (Photo): Instance foto yang file aslinya sudah tersimpan.
+        force (bool): Tulis ulang file varian yang sudah ada.
+
+    Returns:
+        dict: Map ukuran -> {format: nama file, width, height}.
+    """
+    options = get_rendition_settings()
+    store = get_media_store()
+    folder = os.path.dirname(photo.photo.name)
+    with store.local_copy(photo.photo.name) as source_path:
+        original = _prepare_image(source_path)
+    formats = available_formats()
+    reuse = not force and is_blob_name(photo.photo.name)
+
+    renditions = {}
+    for size_name, max_edge in sorted(options['SIZES'].items(), key=lambda item: item[1]):
+        image = original.copy()
+        image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+        variants = {'width': image.width, 'height': image.height}
+        for fmt in formats:
+            filename = rendition_filename(photo.photo.name, size_name, fmt)
+            save_options = {'quality': options['QUALITY'].get(fmt, 80)}
+            if fmt == 'jpeg':
+                save_options.update(optimize=True, progressive=True)
+            name = f'{folder}/{filename}'
+            if not (reuse and store.exists(name)):
+                # Ditulis ke file sementara lalu dipindahkan, agar file varian
+                # tidak pernah terbaca setengah jadi
+                temp_path = store.temp_path(FORMAT_EXTENSIONS[fmt])
+                image.save(temp_path, fmt.upper(), **save_options)
+                store.put_file(temp_path, name)
+            variants[fmt] = filename
+        renditions[size_name] = variants
+
+    Photo.objects.filter(pk=photo.pk).update(renditions=renditions)
+    versions.bump('photos')
+    photo.renditions = renditions
+    return renditions
+
+
+def delete_renditions(photo):
+    """
+    Menghapus file varian milik foto dari disk. Varian blob dihapus oleh
+    garbage collector blob (`photo.blobs.collect_garbage`).
+    """
+    if is_blob_name(photo.photo.name):
+        return
+    get_media_store().delete_many(rendition_names(photo))
+
+
+def render_photo(photo_id, force=False):
+    """
+    Membuat varian untuk foto dengan ID tertentu. Error dicatat ke log dan
+    tidak dilempar ulang.
+
+    Returns:
+        dict | None: Map varian, atau None jika gagal/foto tidak ditemukan.
+    """
+    try:
+        photo = Photo.objects.filter(pk=photo_id).first()
+        if photo is None or not photo.photo:
+            return None
+        return generate_renditions(photo, force=force)
+    except Exception as e:
+        logger.error(f"Error generating renditions for photo {photo_id}: {str(e)}", exc_info=True)
+        return None
+
+
+def _render_in_worker(photo_id):
+    # Koneksi database milik thread worker tidak dipakai ulang
+    close_old_connections()
+    try:
+        return render_photo(photo_id)
+    finally:
+        close_old_connections()
+
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def get_rendition_executor():
+    """
+    Thread pool (`PHOTO_RENDITIONS['WORKERS']`) untuk pembuatan varian di luar
+    request. Dibuat ulang per proses setelah fork.
+    """
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        with _executor_lock:
+            if _executor is None or _executor_pid != os.getpid():
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_rendition_settings()['WORKERS'],
+                    thread_name_prefix='photo-renditions',
+                )
+                _executor_pid = os.getpid()
+    return _executor
+
+
+def schedule_renditions(photos):
+    """
+    Menjadwalkan pembuatan varian setelah transaksi aktif di-commit.
+
+    Jika `PHOTO_RENDITIONS['ASYNC']` bernilai False, varian dibuat langsung
+    (misalnya saat testing atau dari management command).
+
+    Args:
+        photos (list): Instance atau ID foto.
+    """
+    photo_ids = [getattr(photo, 'pk', photo) for photo in photos]
+    if not photo_ids:
+        return
+
+    def submit():
+        if get_rendition_settings()['ASYNC']:
+            executor = get_rendition_executor()
+            for photo_id in photo_ids:
+                executor.submit(_render_in_worker, photo_id)
+        else:
+            for photo_id in photo_ids:
+                render_photo(photo_id)
+
+    transaction.on_commit(submit)
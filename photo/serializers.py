@@ -2,6 +2,8 @@
 
 from rest_framework import serializers
 from .models import Photo
+from .renditions import rendition_urls
+from .bulk import bulk_create_photos
 from django.utils.text import slugify
 from django.conf import settings
 import os
@@ -10,11 +12,28 @@ import os
 class PhotoSerializer(serializers.ModelSerializer):
     # Menampilkan username pengguna yang mengupload foto sebagai read-only
     uploaded_by = serializers.CharField(source='uploaded_by.username', read_only=True)
+    # Varian ukuran foto (thumb/medium/large) beserta URL per format
+    renditions = serializers.SerializerMethodField()
     
     class Meta:
         model = Photo
-        fields = ['id', 'title', 'description', 'photo', 'album', 'uploaded_at', 'uploaded_by', 'sequence_number', 'likes']
-        read_only_fields = ['id', 'uploaded_at', 'uploaded_by', 'sequence_number', 'likes']
+        fields = ['id', 'title', 'description', 'photo', 'album', 'uploaded_at', 'uploaded_by', 'sequence_number', 'likes', 'renditions']
+        read_only_fields = ['id', 'uploaded_at', 'uploaded_by', 'sequence_number', 'likes', 'renditions']
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """
+        Menyiapkan queryset untuk daftar foto: uploader diambil lewat JOIN
+        (tanpa query tambahan per foto) dan hanya kolom yang diserialisasi
+        yang dibaca.
+        """
+        return queryset.select_related('uploaded_by').only(
+            'id', 'title', 'description', 'photo', 'album_id', 'uploaded_at',
+            'uploaded_by__username', 'sequence_number', 'likes', 'renditions'
+        )
+
+    def get_renditions(self, obj):
+        return rendition_urls(obj)
     
     def get_photo_url(self, obj):
         # Dapatkan folder album saat ini berdasarkan slug nama album
@@ -45,7 +64,12 @@ class MultiplePhotoSerializer(serializers.ListSerializer):
     def create(self, validated_data):
         # Mendapatkan pengguna dari konteks permintaan
         request = self.context.get('request')
-        # Membuat instance Photo untuk setiap data yang divalidasi
-        photos = [Photo(**item, uploaded_by=request.user) for item in validated_data]
-        # Menyimpan semua foto secara massal ke database
-        return Photo.objects.bulk_create(photos)
+        # Mengelompokkan foto per album, lalu menyimpan setiap kelompok secara massal
+        # (nomor urut, cover album dan hook setelah upload ditangani bulk_create_photos)
+        albums = {}
+        for item in validated_data:
+            albums.setdefault(item['album'].pk, (item['album'], []))[1].append(item)
+        photos = []
+        for album, items in albums.values():
+            photos.extend(bulk_create_photos(album, request.user, items))
+        return photos
@@ -0,0 +1,133 @@
+# photo/storage.py - Penyimpanan file foto berbasis isi (content-addressed)
+
+import hashlib
+import os
+
+from django.core.files.storage import Storage
+from django.utils.deconstruct import deconstructible
+
+from gallery.media import get_media_store
+
+# Folder blob di dalam storage media
+BLOB_ROOT = 'blobs'
+HASH_CHUNK_SIZE = 64 * 2 ** 10
+
+
+def blob_name(sha256, extension):
+    """
+    Path relatif blob dengan layout `blobs/ab/cd/<sha256><ext>`.
+    """
+    return f'{BLOB_ROOT}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension.lower()}'
+
+
+def is_blob_name(name):
+    return bool(name) and name.startswith(f'{BLOB_ROOT}/')
+
+
+def blob_sha256(name):
+    """
+    Mengambil hash SHA-256 dari path blob.
+    """
+    return os.path.splitext(os.path.basename(name))[0]
+
+
+def hash_file(path):
+    """
+    Menghitung SHA-256 isi file secara streaming (per chunk).
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """
+    Storage yang menyimpan setiap file berdasarkan hash SHA-256 isinya
+    (`blobs/ab/cd/<sha256>.<ext>`), sehingga gambar yang sama hanya disimpan
+    sekali. Nama yang diberikan oleh `upload_to` hanya dipakai untuk
+    menentukan ekstensi.
+
+    Operasi file diteruskan ke MediaStore aktif (`gallery.media`), sehingga
+    blob dapat disimpan di disk lokal maupun object storage. File yang isinya
+    sudah ada ditulis ulang dengan isi yang identik; ini memperbarui waktu
+    modifikasi blob sehingga garbage collector (`photo.blobs.collect_garbage`)
+    tidak menghapus blob yang baru dipakai lagi. Jumlah referensi blob dicatat
+    di model `PhotoBlob`.
+    """
+    @property
+    def store(self):
+        return get_media_store()
+
+    def get_available_name(self, name, max_length=None):
+        # Nama akhir ditentukan oleh isi file, bukan oleh nama yang tersedia
+        return name
+
+    def _open(self, name, mode='rb'):
+        return self.store.open(name, mode)
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1]
+        sha256 = getattr(content, 'sha256', None)
+        source_path = getattr(content, 'stored_path', None)
+
+        if sha256 and source_path:
+            # File sudah ditulis dan di-hash oleh StreamingPhotoUploadHandler
+            return self.place(source_path, sha256, extension)
+
+        incoming = self.store.temp_path()
+        digest = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        with open(incoming, 'xb') as f:
+            for chunk in content.chunks(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+                f.write(chunk)
+        return self.place(incoming, digest.hexdigest(), extension)
+
+    def place(self, source_path, sha256, extension):
+        """
+        Memindahkan file lokal yang sudah di-hash ke lokasi blob-nya.
+
+        File ditulis selama baris `PhotoBlob` blob tersebut dikunci (lihat
+        `photo.blobs.lock_blob`), agar tidak bersamaan dengan garbage
+        collector yang sedang menghapus blob yang sama.
+
+        Returns:
+            str: Path relatif blob.
+        """
+        from .blobs import lock_blob
+
+        name = blob_name(sha256, extension)
+        with lock_blob(name):
+            return self.store.put_file(source_path, name)
+
+    def delete(self, name):
+        self.store.delete_many([name])
+
+    def exists(self, name):
+        return self.store.exists(name)
+
+    def url(self, name):
+        return self.store.url(name)
+
+    def size(self, name):
+        return self.store.storage.size(name)
+
+    def path(self, name):
+        return self.store.storage.path(name)
+
+    def listdir(self, path):
+        return self.store.storage.listdir(path)
+
+    def get_modified_time(self, name):
+        return self.store.get_modified_time(name)
+
+
+photo_storage = ContentAddressedStorage()
+
+
+def get_photo_storage():
+    return photo_storage
@@ -1,3 +1,256 @@
-from django.test import TestCase
+import threading
+from unittest import mock
+
+from django.db import OperationalError, connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from album.models import Album
+from category.models import Category
+from gallery.ordering import MAX_SEQUENCE
+from users.models import User
+from .likes import BufferedLikeCounter, apply_like_delta
+from .models import Photo
 
 # Create your tests here.
+
+
+class PhotoOrderingTestCase(TestCase):
+    """
+    Test urutan foto per album (`Photo.sequence_order`, lihat gallery.ordering).
+    """
+    def setUp(self):
+        self.user = User.objects.create_user(username='petugas', password='secret', role='petugas')
+        category = Category.objects.create(name='Kegiatan')
+        self.album = Album.objects.create(title='Album A', category=category, created_by=self.user)
+        self.other_album = Album.objects.create(title='Album B', category=category, created_by=self.user)
+        self.ordering = Photo.sequence_order
+
+    def create_photos(self, album, keys):
+        """
+        Membuat foto dengan kunci urutan tertentu tanpa melewati save() dan
+        signal (tidak butuh file gambar).
+        """
+        photos = Photo.objects.bulk_create([
+            Photo(
+                title=f'Foto {index}',
+                description='',
+                photo=f'albums/test/{album.pk}-{index}.jpg',
+                album=album,
+                uploaded_by=self.user,
+                sequence_number=key,
+            )
+            for index, key in enumerate(keys)
+        ])
+        return [photo.pk for photo in photos]
+
+    def order(self, album):
+        return list(self.ordering._ordered(Photo.objects.filter(album=album)).values_list('pk', flat=True))
+
+    def keys(self, pks):
+        return dict(Photo.objects.filter(pk__in=pks).values_list('pk', 'sequence_number'))
+
+    def test_move_many_after(self):
+        a, b, c, d, e = self.create_photos(self.album, [1024, 2048, 3072, 4096, 5120])
+
+        moved = self.ordering.move_many([e, d], after=a)
+
+        self.assertEqual(self.order(self.album), [a, e, d, b, c])
+        self.assertEqual(set(moved), {e, d})
+        # Tetangga tidak ikut diubah
+        self.assertEqual(self.keys([a, b, c]), {a: 1024, b: 2048, c: 3072})
+
+    def test_move_many_before(self):
+        a, b, c, d = self.create_photos(self.album, [1024, 2048, 3072, 4096])
+
+        self.ordering.move_many([a, b], before=d)
+
+        self.assertEqual(self.order(self.album), [c, a, b, d])
+        self.assertEqual(self.keys([c, d]), {c: 3072, d: 4096})
+
+    def test_move_many_before_first(self):
+        a, b, c = self.create_photos(self.album, [1024, 2048, 3072])
+
+        self.ordering.move_many([c], before=a)
+
+        self.assertEqual(self.order(self.album), [c, a, b])
+
+    def test_move_many_to_end(self):
+        a, b, c = self.create_photos(self.album, [1024, 2048, 3072])
+
+        moved = self.ordering.move_many([b, a])
+
+        self.assertEqual(self.order(self.album), [c, b, a])
+        self.assertEqual(moved, {b: 3072 + 1024, a: 3072 + 2048})
+
+    def test_gap_exhaustion_renumbers_scope(self):
+        a, b, c = self.create_photos(self.album, [1, 2, 3])
+        (other,) = self.create_photos(self.other_album, [1])
+
+        moved = self.ordering.move_many([c], after=a)
+
+        self.assertEqual(self.order(self.album), [a, c, b])
+        self.assertEqual(self.keys([a, b, c]), {a: 1024, c: 2048, b: 3072})
+        self.assertEqual(moved, {c: 2048})
+        # Album lain tidak ikut dinomori ulang
+        self.assertEqual(self.keys([other]), {other: 1})
+
+    def test_next_key_renumbers_when_keys_run_out(self):
+        a, b = self.create_photos(self.album, [MAX_SEQUENCE - 2048, MAX_SEQUENCE - 1])
+
+        key = self.ordering.next_key({'album_id': self.album.pk})
+
+        self.assertEqual(self.keys([a, b]), {a: 1024, b: 2048})
+        self.assertEqual(key, 3072)
+
+    def test_null_legacy_keys_sort_first_and_are_renumbered(self):
+        legacy_1, legacy_2, keyed = self.create_photos(self.album, [None, None, 1024])
+        self.assertEqual(self.order(self.album), [legacy_1, legacy_2, keyed])
+
+        # Tetangga tanpa kunci: seluruh album dinomori ulang
+        self.ordering.move_many([keyed], before=legacy_2)
+
+        self.assertEqual(self.order(self.album), [legacy_1, keyed, legacy_2])
+        self.assertEqual(self.keys([legacy_1, keyed, legacy_2]), {legacy_1: 1024, keyed: 2048, legacy_2: 3072})
+
+    def test_null_legacy_keys_move_to_end(self):
+        legacy, keyed = self.create_photos(self.album, [None, 1024])
+
+        self.ordering.move_many([legacy])
+
+        self.assertEqual(self.order(self.album), [keyed, legacy])
+        self.assertEqual(self.keys([legacy]), {legacy: 2048})
+
+    def test_cross_scope_move_is_rejected(self):
+        a, b = self.create_photos(self.album, [1024, 2048])
+        (other,) = self.create_photos(self.other_album, [1024])
+
+        with self.assertRaisesMessage(ValueError, 'different scopes'):
+            self.ordering.move_many([b], after=other)
+        with self.assertRaisesMessage(ValueError, 'different scopes'):
+            self.ordering.move_many([a, other])
+
+        self.assertEqual(self.keys([a, b, other]), {a: 1024, b: 2048, other: 1024})
+
+    def test_invalid_moves_are_rejected(self):
+        a, b = self.create_photos(self.album, [1024, 2048])
+
+        with self.assertRaises(ValueError):
+            self.ordering.move_many([a], after=a)
+        with self.assertRaises(ValueError):
+            self.ordering.move_many([a, a])
+        with self.assertRaises(ValueError):
+            self.ordering.move_many([a], after=b, before=b)
+        with self.assertRaisesMessage(ValueError, 'not found'):
+            self.ordering.move_many([a], after=b + 1000)
+
+    def test_move_endpoint(self):
+        a, b, c = self.create_photos(self.album, [1024, 2048, 3072])
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(reverse('photo-move'), {'ids': [c], 'after': a}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], [{'id': c, 'sequence_number': 1536}])
+        self.assertEqual(self.order(self.album), [a, c, b])
+
+    def test_move_endpoint_rejects_cross_album_and_unknown_ids(self):
+        a, b = self.create_photos(self.album, [1024, 2048])
+        (other,) = self.create_photos(self.other_album, [1024])
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.post(reverse('photo-move'), {'ids': [a], 'after': other}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.post(reverse('photo-move'), {'ids': [a], 'before': other + 1000}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertEqual(self.order(self.album), [a, b])
+
+    def test_move_endpoint_requires_petugas(self):
+        (a,) = self.create_photos(self.album, [1024])
+
+        response = APIClient().post(reverse('photo-move'), {'ids': [a]}, format='json')
+
+        self.assertIn(response.status_code, (status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN))
+
+
+class BufferedLikeCounterTestCase(TransactionTestCase):
+    """
+    Test `photo.likes.BufferedLikeCounter`. Memakai TransactionTestCase karena
+    flush menutup koneksi lama (close_old_connections) seperti di thread flusher.
+    """
+    def setUp(self):
+        user = User.objects.create_user(username='petugas', password='secret', role='petugas')
+        category = Category.objects.create(name='Kegiatan')
+        album = Album.objects.create(title='Album A', category=category, created_by=user)
+        self.photos = [
+            photo.pk for photo in Photo.objects.bulk_create([
+                Photo(title=f'Foto {index}', description='', photo=f'albums/test/{index}.jpg',
+                      album=album, uploaded_by=user, likes=likes)
+                for index, likes in enumerate([0, 5])
+            ])
+        ]
+        # Interval panjang: flush hanya terjadi saat dipanggil langsung
+        self.counter = BufferedLikeCounter(flush_interval_ms=60000)
+        self.addCleanup(self.counter.shutdown)
+
+    def likes(self):
+        return dict(Photo.objects.filter(pk__in=self.photos).values_list('pk', 'likes'))
+
+    def test_concurrent_adds_flush_as_one_update_per_photo(self):
+        first, second = self.photos
+
+        def like_many():
+            for _ in range(50):
+                self.counter.add(first, 1)
+                self.counter.add(second, -1)
+
+        threads = [threading.Thread(target=like_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.counter.pending(first), 400)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.counter.flush(), 2)
+
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "photo_photo"')]
+        self.assertEqual(len(updates), 2)
+        for sql in updates:
+            # likes = MAX(likes + delta, 0) dalam satu UPDATE, tanpa SELECT lebih dulu
+            self.assertRegex(sql, r'"likes" = (MAX|GREATEST)\(')
+        self.assertFalse(any(query['sql'].startswith('SELECT') and 'photo_photo' in query['sql'] for query in queries))
+        # Tidak pernah di bawah nol
+        self.assertEqual(self.likes(), {first: 400, second: 0})
+        self.assertEqual(self.counter.stats()['pending_photos'], 0)
+
+    def test_failed_flush_is_retried(self):
+        first, second = self.photos
+        self.counter.add(first, 3)
+        self.counter.add(second, 1)
+
+        def fail_first(photo_id, delta):
+            if photo_id == first:
+                raise OperationalError('database is locked')
+            apply_like_delta(photo_id, delta)
+
+        with mock.patch('photo.likes.apply_like_delta', side_effect=fail_first):
+            self.assertEqual(self.counter.flush(), 1)
+
+        self.assertEqual(self.counter.pending(first), 3)
+        self.assertEqual(self.counter.stats()['failed'], 1)
+        self.assertEqual(self.likes(), {first: 0, second: 6})
+
+        # Like baru di antara dua flush digabung dengan perubahan yang gagal
+        self.counter.add(first, 1)
+        self.assertEqual(self.counter.flush(), 1)
+
+        self.assertEqual(self.counter.pending(first), 0)
+        self.assertEqual(self.likes(), {first: 4, second: 6})
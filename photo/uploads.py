@@ -0,0 +1,136 @@
+# photo/uploads.py - Upload foto secara streaming dengan hash isi file
+
+import hashlib
+import logging
+import os
+
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from PIL import Image
+
+from gallery.media import get_media_store
+
+from .storage import photo_storage
+
+logger = logging.getLogger(__name__)
+
+
+class StoredUploadedFile(UploadedFile):
+    """
+    File upload yang sudah ditulis ke folder sementara MediaStore oleh
+    `StreamingPhotoUploadHandler`. Isinya tidak pernah dimuat ke memori.
+
+    Attributes:
+        stored_path (str): Path lokal file sementara.
+        stored_name (str): Path blob di storage media setelah `place()`,
+            None sebelumnya.
+        sha256 (str): Hash SHA-256 isi file, dihitung saat file ditulis.
+    """
+    def __init__(self, stored_path, name, content_type, size, charset=None, content_type_extra=None, sha256=None):
+        super().__init__(None, name, content_type, size, charset, content_type_extra)
+        self.stored_path = stored_path
+        self.stored_name = None
+        self.sha256 = sha256
+
+    @property
+    def path(self):
+        return self.stored_path
+
+    def temporary_file_path(self):
+        return self.stored_path
+
+    def open(self, mode='rb'):
+        self.file = open(self.stored_path, mode)
+        return self
+
+    def place(self):
+        """
+        Memindahkan file sementara ke lokasi blob-nya
+        (`blobs/ab/cd/<sha256>.<ext>`). Untuk storage lokal cukup dengan
+        rename, tanpa menyalin isi.
+        """
+        extension = os.path.splitext(self.name)[1]
+        self.stored_name = photo_storage.place(self.stored_path, self.sha256, extension)
+        return self.stored_name
+
+    def discard(self):
+        """
+        Menghapus file sementara yang belum dipindahkan ke lokasi blob. Blob
+        tidak dihapus di sini karena dapat dipakai foto lain.
+        """
+        if os.path.exists(self.stored_path):
+            os.remove(self.stored_path)
+
+
+class StreamingPhotoUploadHandler(FileUploadHandler):
+    """
+    Upload handler yang menulis setiap chunk file langsung ke disk sambil
+    menghitung hash SHA-256 isinya, sehingga memori yang dipakai maksimal satu
+    chunk berapa pun jumlah dan ukuran file dalam satu request.
+
+    File ditulis ke folder sementara MediaStore (`MediaStore.temp_path`) lalu
+    dipindahkan ke lokasi blob setelah divalidasi (lihat
+    `StoredUploadedFile.place`).
+    """
+    chunk_size = 64 * 2 ** 10
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.stored_files = []
+        self._file = None
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.stored_path = get_media_store().temp_path()
+        self._file = open(self.stored_path, 'xb')
+        self._digest = hashlib.sha256()
+        self._size = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self._file.write(raw_data)
+        self._digest.update(raw_data)
+        self._size += len(raw_data)
+        # Chunk tidak diteruskan ke handler lain (memory/temporary file)
+        return None
+
+    def file_complete(self, file_size):
+        self._file.close()
+        self._file = None
+        stored = StoredUploadedFile(
+            stored_path=self.stored_path,
+            name=self.file_name,
+            content_type=self.content_type,
+            size=self._size,
+            charset=self.charset,
+            content_type_extra=self.content_type_extra,
+            sha256=self._digest.hexdigest(),
+        )
+        self.stored_files.append(stored)
+        return stored
+
+    def upload_interrupted(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self.stored_path)
+
+    def discard_all(self):
+        """
+        Menghapus seluruh file sementara yang sudah ditulis oleh handler ini.
+        """
+        for stored in self.stored_files:
+            stored.discard()
+
+
+def verify_image(path):
+    """
+    Memastikan file adalah gambar yang dapat dibaca Pillow.
+
+    Raises:
+        ValueError: Jika file bukan gambar yang valid.
+    """
+    try:
+        with Image.open(path) as image:
+            image.verify()
+    except Exception as e:
+        raise ValueError("Upload a valid image. The file you uploaded was either not an image or a corrupted image.") from e
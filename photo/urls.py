@@ -1,7 +1,7 @@
 # urls.py - Konfigurasi routing untuk view terkait foto
 
 from django.urls import path
-from .views import PhotoListCreateView, PhotoDetailView, PhotoByAlbumView, PhotoListPublic, like_photo, PublicPhotoDetailView
+from .views import PhotoListCreateView, PhotoDetailView, PhotoByAlbumView, PhotoListPublic, like_photo, PublicPhotoDetailView, PhotoMoveView
 
 # Daftar URL untuk aplikasi foto
 urlpatterns = [
@@ -22,4 +22,7 @@ urlpatterns = [
     
     # Endpoint untuk memberikan "like" pada foto tertentu berdasarkan ID foto
     path('photos/<int:photo_id>/like/', like_photo, name='photo-like'),
+    
+    # Endpoint untuk memindahkan urutan beberapa foto dalam satu album sekaligus
+    path('photos/move/', PhotoMoveView.as_view(), name='photo-move'),
 ]
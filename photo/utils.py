@@ -2,10 +2,11 @@
 
 import os
 from django.utils.text import slugify
-from django.conf import settings
-from album.models import Album
+from gallery import versions
+from gallery.media import get_media_store
 import hashlib
 import time
+import uuid
 
 def refresh_photo_paths():
     """
@@ -16,34 +17,37 @@ def refresh_photo_paths():
     berubah, path baru tersebut juga disimpan ke dalam database.
     
     Proses:
-    1. Ambil semua foto dari model `Photo`.
+    1. Ambil semua foto dari model `Photo` (blob berbasis isi dilewati karena tidak bergantung pada album).
     2. Tentukan path lama dan path baru berdasarkan struktur album.
-    3. Jika file ada di lokasi lama, pindahkan ke lokasi baru yang telah ditentukan.
-    4. Perbarui path file foto di database untuk menyimpan lokasi baru.
+    3. Pindahkan seluruh file yang path-nya berubah sekaligus lewat MediaStore (`move_many`).
+    4. Perbarui path file foto di database dengan satu `bulk_update`.
     
     Menggunakan:
     - `Photo`: Model untuk foto yang memiliki informasi album terkait.
-    - `settings.MEDIA_ROOT`: Root direktori media untuk file foto.
+    - `get_media_store`: Layanan operasi file media (lihat `gallery.media`).
     - `slugify`: Untuk membuat slug berdasarkan judul album sehingga path lebih konsisten.
     """
     
     from photo.models import Photo  # Mengimpor model Photo
-    photos = Photo.objects.all()  # Mengambil semua objek foto dari database
+    from photo.storage import is_blob_name
+    photos = Photo.objects.select_related('album').only('id', 'photo', 'album__title')  # Mengambil semua objek foto dari database
 
+    moves = []
+    changed = []
     for photo in photos:
-        album = photo.album
-        old_photo_path = os.path.join(settings.MEDIA_ROOT, photo.photo.name)  # Path lama yang disimpan di database
-        new_folder = os.path.join(settings.MEDIA_ROOT, 'albums', slugify(album.title))  # Path folder baru berdasarkan album
-        new_photo_path = os.path.join(new_folder, os.path.basename(photo.photo.name))  # Path file foto baru
+        if is_blob_name(photo.photo.name):
+            continue
+        # Path baru relatif berdasarkan album
+        new_photo_name = os.path.join('albums', slugify(photo.album.title), os.path.basename(photo.photo.name))
+        if new_photo_name != photo.photo.name:
+            moves.append((photo.photo.name, new_photo_name))
+            photo.photo.name = new_photo_name  # Menyimpan path baru di database
+            changed.append(photo)
 
-        # Pindahkan file dari path lama ke path baru jika ada
-        if os.path.exists(old_photo_path) and not os.path.exists(new_photo_path):
-            os.rename(old_photo_path, new_photo_path)
-
-        # Perbarui path di database ke path baru yang relatif
-        relative_new_photo_path = os.path.join('albums', slugify(album.title), os.path.basename(photo.photo.name))
-        photo.photo.name = relative_new_photo_path  # Menyimpan path baru di database
-        photo.save()
+    # Pindahkan file dari path lama ke path baru jika ada
+    get_media_store().move_many(moves)
+    Photo.objects.bulk_update(changed, ['photo'])
+    versions.bump('photos')
 
 def hash_filename(filename):
     """
@@ -54,7 +58,8 @@ def hash_filename(filename):
     
     Proses:
     1. Ekstraksi nama dan ekstensi file.
-    2. Membuat hash MD5 berdasarkan timestamp saat ini.
+    2. Membuat hash MD5 berdasarkan timestamp saat ini dan UUID acak
+       (agar file dalam satu batch upload tidak mendapat nama yang sama).
     3. Menggabungkan hash dengan ekstensi asli untuk menghasilkan nama file baru.
     
     Parameter:
@@ -69,8 +74,8 @@ def hash_filename(filename):
     
     # Mendapatkan ekstensi file
     name, ext = os.path.splitext(filename)
-    # Membuat hash dari timestamp saat ini
-    timestamp = str(time.time()).encode('utf-8')
+    # Membuat hash dari timestamp saat ini dan UUID acak
+    timestamp = f"{time.time()}-{uuid.uuid4().hex}".encode('utf-8')
     hashed = hashlib.md5(timestamp).hexdigest()
     # Mengembalikan nama file baru dengan hash dan ekstensi asli
     return f"{hashed}{ext}"
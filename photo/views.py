@@ -1,7 +1,6 @@
 # views.py - View untuk mengelola operasi terkait foto
 from django.views.decorators.http import require_POST
 from django.http import JsonResponse
-from django.db import transaction
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import Photo, Album
@@ -9,25 +8,38 @@ from .serializers import PhotoSerializer
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
-from django.db.models import Max
-import os
 import logging
 import json
 from users.permissions import AllowAny, IsPetugas
 from gallery.throttles import PetugasRateThrottle
+from gallery.pagination import CursorPaginatedListMixin
+from gallery.conditional import ConditionalGetMixin
+from gallery.ordering_views import SequenceMoveView
+from gallery.response_cache import CachedResponseMixin
+from .likes import get_like_counter
+from . import blobs
+from .renditions import schedule_renditions
+from .uploads import StreamingPhotoUploadHandler, verify_image
+from .bulk import bulk_create_photos
 
 
 logger = logging.getLogger(__name__)
 
+LIKE_ACTIONS = {
+    'like': (1, 'liked'),
+    'unlike': (-1, 'unliked'),
+}
+
 @require_POST
 @csrf_exempt
 def like_photo(request, photo_id):
     """
     Fungsi untuk toggle "like" pada foto dengan ID tertentu.
     
-    Jika foto belum dilike, tambahkan like dan set cookie.
-    Jika foto sudah dilike, kurangi like dan hapus cookie.
-    Menggunakan transaksi atomik untuk mencegah inkonsistensi data.
+    Perubahan like dicatat melalui counter like (`photo.likes`) yang
+    menggabungkan lonjakan like dan menuliskannya dengan UPDATE atomik
+    (`F('likes') + delta`) tanpa mengunci baris foto. Jumlah like yang
+    dikembalikan bersifat eventually consistent.
     
     Parameter:
     - `request`: Objek HTTP request.
@@ -36,68 +48,64 @@ def like_photo(request, photo_id):
     Mengembalikan:
     - `JsonResponse`: Status dan jumlah "like" terkini.
     """
-    try:
-        with transaction.atomic():
-            photo = Photo.objects.select_for_update().get(id=photo_id)
-            
-            # Parse the request body to get the action
-            body = json.loads(request.body.decode('utf-8'))
-            action = body.get('action')
-
-            if action == 'like':
-                photo.likes += 1
-                photo.save()
-                response_action = 'liked'
-            elif action == 'unlike':
-                photo.likes = max(0, photo.likes - 1)
-                photo.save()
-                response_action = 'unliked'
-            else:
-                return JsonResponse({'status': 'failed', 'message': 'Invalid action.'}, status=400)
-            
-            return JsonResponse({
-                'status': 'success',
-                'likes': photo.likes,
-                'action': response_action
-            })
-
-    except Photo.DoesNotExist:
+    counter = get_like_counter()
+    likes = counter.get_count(photo_id)
+    if likes is None:
         return JsonResponse({'status': 'failed', 'message': 'Photo not found.'}, status=404)
 
-class PhotoListPublic(generics.ListCreateAPIView): 
+    # Parse the request body to get the action
+    body = json.loads(request.body.decode('utf-8'))
+    action = body.get('action')
+    if action not in LIKE_ACTIONS:
+        return JsonResponse({'status': 'failed', 'message': 'Invalid action.'}, status=400)
+
+    delta, response_action = LIKE_ACTIONS[action]
+    counter.add(photo_id, delta)
+
+    return JsonResponse({
+        'status': 'success',
+        'likes': max(0, likes + delta),
+        'action': response_action
+    })
+
+class PhotoListPublic(ConditionalGetMixin, CachedResponseMixin, CursorPaginatedListMixin, generics.ListCreateAPIView): 
     """
     API untuk menampilkan daftar foto yang dapat diakses publik dan membuat foto baru.
     
     Menggunakan permission "AllowAny" sehingga bisa diakses tanpa autentikasi.
     """
-    queryset = Photo.objects.all().order_by('sequence_number')
+    queryset = PhotoSerializer.setup_eager_loading(Photo.objects.all()).order_by('sequence_number')
     serializer_class = PhotoSerializer
     permission_classes = [AllowAny]
+    version_tables = ('photos', 'users')
     
     def list(self, request, *args, **kwargs):
         """
-        Menampilkan daftar foto dalam format respons standar.
+        Menampilkan daftar foto dalam format respons standar, dipaginasi dengan cursor.
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
         return Response({
             "status": "success",
             "status_code": status.HTTP_200_OK,
-            "data": serializer.data
+            "data": serializer.data,
+            **self.page_cursors(page),
         }, status=status.HTTP_200_OK)
 
     def perform_create(self, serializer):
         """
         Override metode `perform_create` untuk menyimpan data user yang mengunggah.
         """
-        serializer.save(uploaded_by=self.request.user)
+        photo = serializer.save(uploaded_by=self.request.user)
+        schedule_renditions([photo])
 
-class PhotoListCreateView(generics.ListCreateAPIView):
+class PhotoListCreateView(CursorPaginatedListMixin, generics.ListCreateAPIView):
     """
     API untuk membuat dan menampilkan daftar semua foto dengan otorisasi pengguna.
     """
     parser_classes = [MultiPartParser, FormParser]  
-    queryset = Photo.objects.all().order_by('sequence_number')
+    queryset = PhotoSerializer.setup_eager_loading(Photo.objects.all()).order_by('sequence_number')
     serializer_class = PhotoSerializer
     permission_classes = [IsPetugas]
     throttle_classes = [PetugasRateThrottle]
@@ -106,64 +114,103 @@ class PhotoListCreateView(generics.ListCreateAPIView):
         """
         Menangani pengunggahan beberapa foto dan membuat entri untuk setiap foto dalam database.
         Setiap foto akan diberi nomor urut (sequence_number) berdasarkan urutan dalam album.
+
+        File di-stream ke disk dan di-hash oleh `StreamingPhotoUploadHandler`
+        (memori maksimal satu chunk) lalu divalidasi satu per satu. File yang
+        valid dipindahkan ke lokasi blob berdasarkan hash isinya (gambar yang
+        sama hanya disimpan sekali) dan disimpan sekaligus dengan
+        `bulk_create_photos`. Respons berisi foto yang berhasil dibuat (`data`)
+        dan hasil per file (`results`).
         """
+        handler = StreamingPhotoUploadHandler(request._request)
+        # Harus dipasang sebelum request.data/request.FILES diakses
+        request._request.upload_handlers = [handler]
+
         files = request.FILES.getlist('photos')
-        album_id = request.data.get('album')
-        album = Album.objects.get(pk=album_id)
-    
-        # Mendapatkan nomor urut maksimal untuk penentuan sequence berikutnya
-        max_sequence = Photo.objects.filter(album=album).aggregate(Max('sequence_number'))['sequence_number__max'] or 0
-
-        photos_data = []
-        for i, file in enumerate(files, start=1):
-            title = request.data.get('title', f"Photo {max_sequence + i}")
-            description = request.data.get('description', "No description provided")
-
-            logger.debug(f"Title: {title}, Description: {description}")
-
-            photo_data = {
-                'title': title,
-                'description': description,
-                'album': album.id,
-                'photo': file,
-                'uploaded_by': request.user.id,
-                'sequence_number': max_sequence + i
-            }
-            photos_data.append(photo_data)
-
-        serializer = self.get_serializer(data=photos_data, many=True)
-        if serializer.is_valid():
-            self.perform_create(serializer)
+        album = self.get_album(request.data.get('album', request.query_params.get('album')))
+
+        error = None
+        if album is None:
+            error = "Invalid album ID."
+        elif not files:
+            error = "No photos uploaded."
+        if error:
+            handler.discard_all()
             return Response({
-                "status": "success",
-                "status_code": status.HTTP_201_CREATED,
-                "data": serializer.data
-            }, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                "status": "failed",
+                "status_code": status.HTTP_400_BAD_REQUEST,
+                "message": error
+            }, status=status.HTTP_400_BAD_REQUEST)
+    
+        accepted = []
+        results = []
+        for file in files:
+            try:
+                verify_image(file.path)
+                file.place()
+            except Exception as e:
+                file.discard()
+                logger.warning(f"Rejected upload {file.name}: {str(e)}")
+                results.append({'file': file.name, 'status': 'failed', 'error': str(e)})
+                continue
+            accepted.append(file)
+            results.append({'file': file.name, 'status': 'created'})
+
+        # Semua foto valid disimpan sekaligus (jumlah query konstan)
+        try:
+            photos = bulk_create_photos(album, request.user, [
+                {
+                    'photo': file.stored_name,
+                    'title': request.data.get('title'),
+                    'description': request.data.get('description'),
+                }
+                for file in accepted
+            ])
+        except Exception:
+            # Blob tanpa referensi dihapus oleh garbage collector
+            blobs.register([file.stored_name for file in accepted])
+            raise
+
+        created = iter(photos)
+        for result in results:
+            if result['status'] == 'created':
+                result['id'] = next(created).id
+
+        if not photos:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif len(photos) < len(files):
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response({
+            "status": "success" if response_status == status.HTTP_201_CREATED else "partial" if photos else "failed",
+            "status_code": response_status,
+            "data": self.get_serializer(photos, many=True).data,
+            "results": results
+        }, status=response_status)
 
     def list(self, request, *args, **kwargs):
         """
-        Menampilkan daftar foto dengan format respons standar.
+        Menampilkan daftar foto dengan format respons standar, dipaginasi dengan cursor.
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
         return Response({
             "status": "success",
             "status_code": status.HTTP_200_OK,
-            "data": serializer.data
+            "data": serializer.data,
+            **self.page_cursors(page),
         }, status=status.HTTP_200_OK)
 
-    def perform_create(self, serializer):
+    @staticmethod
+    def get_album(album_id):
         """
-        Menyimpan foto yang diunggah serta album terkait.
+        Mengambil album berdasarkan ID dari request, atau None jika tidak valid.
         """
-        album_id = self.request.data.get('album')
-        try:
-            album = Album.objects.get(pk=album_id)
-        except Album.DoesNotExist:
-            raise serializer.ValidationError({"album": "Invalid album ID."})
-        
-        serializer.save(uploaded_by=self.request.user, album=album)
+        if album_id is None or not str(album_id).isdigit():
+            return None
+        return Album.objects.filter(pk=album_id).first()
 
 class PhotoDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
@@ -183,14 +230,17 @@ class PhotoDetailView(generics.RetrieveUpdateDestroyAPIView):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
 
-        # Menghapus gambar lama jika diganti dengan yang baru
+        # Menghapus gambar lama beserta variannya jika diganti dengan yang baru
+        # (blob yang dipakai bersama hanya dilepas referensinya)
         if 'photo' in request.FILES:
-            if instance.photo and os.path.exists(instance.photo.path):
-                os.remove(instance.photo.path)
+            blobs.discard_photo_file(instance)
+            instance.renditions = {}
 
         serializer = self.get_serializer(instance, data=request.data, partial=partial)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
+        if 'photo' in request.FILES:
+            schedule_renditions([instance])
 
         return Response({
             "status": "updated",
@@ -199,20 +249,17 @@ class PhotoDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     def destroy(self, request, *args, **kwargs):
         """
-        Menghapus foto dari database dan file sistem, serta mereset nomor urut (sequence number) dalam album.
+        Menghapus foto dari database dan file sistem.
         """
         instance = self.get_object()
-        album = instance.album
-        if instance.photo and os.path.exists(instance.photo.path):
-            os.remove(instance.photo.path)
+        blobs.discard_photo_file(instance)
         self.perform_destroy(instance)
-        Photo.reset_sequence_numbers(album)  # Reset nomor urut setelah penghapusan
         return Response({
             "status": "deleted",
             "data": f"Photo dengan id {kwargs['pk']} telah dihapus."
         }, status=status.HTTP_204_NO_CONTENT)
 
-class PhotoByAlbumView(generics.ListAPIView):
+class PhotoByAlbumView(ConditionalGetMixin, CachedResponseMixin, CursorPaginatedListMixin, generics.ListAPIView):
     """
     API untuk menampilkan foto dalam album tertentu.
     
@@ -221,26 +268,29 @@ class PhotoByAlbumView(generics.ListAPIView):
     queryset = Photo.objects.all()
     serializer_class = PhotoSerializer
     permission_classes = [AllowAny]
+    version_tables = ('photos', 'users')
 
     def get_queryset(self):
         """
         Mendapatkan queryset untuk foto berdasarkan ID album dari URL.
         """
         album_id = self.kwargs['album_id']
-        return Photo.objects.filter(album__id=album_id)
+        return PhotoSerializer.setup_eager_loading(Photo.objects.filter(album__id=album_id))
 
     def list(self, request, *args, **kwargs):
         """
-        Menampilkan foto dalam album dalam format respons yang diinginkan.
+        Menampilkan foto dalam album dalam format respons yang diinginkan, dipaginasi dengan cursor.
         """
         queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
         
         # Membungkus data dalam format respons standar
         response_data = {
             "status": "success",
             "status_code": status.HTTP_200_OK,
             "data": serializer.data,
+            **self.page_cursors(page),
         }
         
         return Response(response_data)
@@ -271,4 +321,16 @@ class PublicPhotoDetailView(generics.RetrieveAPIView):
                 "status": "error",
                 "status_code": status.HTTP_404_NOT_FOUND,
                 "message": "Foto tidak ditemukan"
-            }, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            }, status=status.HTTP_404_NOT_FOUND)
+
+
+class PhotoMoveView(SequenceMoveView):
+    """
+    API untuk memindahkan urutan beberapa foto dalam satu album sekaligus.
+
+    Body: `{"ids": [...], "after": id}` atau `{"ids": [...], "before": id}`
+    (lihat `gallery.ordering_views.SequenceMoveView`).
+    """
+    queryset = Photo.objects.all()
+    permission_classes = [IsPetugas]
+    throttle_classes = [PetugasRateThrottle]
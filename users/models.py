@@ -1,5 +1,9 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 from django.db import models
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from dashboard import counters
+from gallery import versions
 
 class UserManager(BaseUserManager):
     """
@@ -91,3 +95,32 @@ class User(AbstractBaseUser, PermissionsMixin):
         Mengembalikan representasi string dari user sebagai username.
         """
         return self.username
+
+
+# Signal untuk memperbarui counter dashboard (total dan per role)
+@receiver(pre_save, sender=User)
+def remember_user_role(sender, instance, update_fields=None, **kwargs):
+    """
+    Menyimpan role user sebelum disimpan untuk mendeteksi perubahan role.
+    """
+    counters.remember_previous(instance, 'role', update_fields)
+
+
+@receiver(post_save, sender=User)
+def count_user_saved(sender, instance, created, **kwargs):
+    """
+    Memperbarui counter dashboard setelah user dibuat atau role-nya berubah.
+    """
+    counters.count_saved('users', instance, created, 'role', counters.ROLE_BUCKETS)
+    # Username ditampilkan di endpoint publik; login saja tidak mengubah isinya
+    if kwargs.get('update_fields') != frozenset({'last_login'}):
+        versions.bump('users')
+
+
+@receiver(post_delete, sender=User)
+def count_user_deleted(sender, instance, **kwargs):
+    """
+    Memperbarui counter dashboard setelah user dihapus.
+    """
+    counters.count_deleted('users', instance, 'role', counters.ROLE_BUCKETS)
+    versions.bump('users')